@@ -1,15 +1,28 @@
+import os
 import time
 import logging
 import asyncio
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Optional, List
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
-from rank_bm25 import BM25Okapi
 
 from ingest import get_vector_store
+from episode_index import (ChunkView, get_episode_chunks, get_lexical_index, get_term_index, get_vector_index,
+                           schedule_warmup)
+from rank_fusion import chunk_key, reciprocal_rank_fusion
+from diversity import diversify
+from context_packer import CONTEXT_TOKEN_BUDGET, RETRY_CONTEXT_TOKEN_BUDGET, pack_context
+from retrieval_cache import retrieval_cache
+from retrieval_router import (STRATEGY_FOLLOW_UP, STRATEGY_HYBRID, STRATEGY_OVERVIEW, STRATEGY_PAPER,
+                              STRATEGY_TIME, RetrievalRoute, route_question)
+from time_index import chunk_interval, time_hint
+from fts_index import search_chunk_ids
+from followup import query_delta, retrieves_delta_only
+from negative_cache import REASON_GROUNDING, REASON_GUARDRAIL, negative_cache
 from prompts import PROMPT_TEMPLATES
 from behavior import classify_question, get_policy
 from llm_client import get_llm_client
@@ -27,6 +40,37 @@ class RetrievalInsufficient(Exception):
 # Strict insufficient context message - enforced in post-processing
 INSUFFICIENT_MSG = "This episode excerpt does not give enough detail to answer that."
 
+# Critic "issues" that mean the critic itself failed, not that the answer was ungrounded
+CRITIC_FAILURE_ISSUES = {"critic_failed", "parse_error"}
+
+def _is_generation_fallback(answer: str) -> bool:
+    """True for the canned answer _generate_with_timeout returns on timeout or error."""
+    return "I apologize" in answer or "I'm having trouble" in answer
+
+def _critic_judged(critique: dict) -> bool:
+    """True if the critic actually ran and returned a parsed verdict."""
+    return not CRITIC_FAILURE_ISSUES.intersection(critique.get("issues") or [])
+
+# Per-retriever time budgets (seconds, measured from dispatch). Whatever has
+# finished when its budget runs out is fused; the rest is dropped.
+VECTOR_SEARCH_TIMEOUT_S = float(os.getenv("VECTOR_SEARCH_TIMEOUT_S", "4.0"))
+LEXICAL_SEARCH_TIMEOUT_S = float(os.getenv("LEXICAL_SEARCH_TIMEOUT_S", "2.0"))
+
+# Chunks in the first answer's context, and in the wider critic-retry context
+# (MMR-diversified, so a small k still covers several papers)
+CONTEXT_K = int(os.getenv("CONTEXT_K", "5"))
+RETRY_CONTEXT_K = int(os.getenv("RETRY_CONTEXT_K", "10"))
+
+# Per-retriever weights for rank fusion
+VECTOR_RRF_WEIGHT = float(os.getenv("VECTOR_RRF_WEIGHT", "1.0"))
+LEXICAL_RRF_WEIGHT = float(os.getenv("LEXICAL_RRF_WEIGHT", "1.0"))
+
+# Shared pool so the vector and lexical retrievers run side by side
+_retrieval_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("RETRIEVAL_POOL_SIZE", "16")),
+    thread_name_prefix="retrieval",
+)
+
 class EpisodeCompanionAgent:
     def __init__(self, backend: str = "ollama", model_name: Optional[str] = None):
         """Initialize agent with abstracted LLM client.
@@ -49,74 +93,238 @@ class EpisodeCompanionAgent:
     # Retrieval & Fusion
     # ---------------------------------------------------------------------
     def _reciprocal_rank_fusion(self,
-                                vector_results: List[tuple[float, Document]],
+                                vector_results: List[tuple[Document, float]],
                                 bm25_results: List[Document],
                                 k: int = 60) -> List[Document]:
         """Fuse results from Vector and BM25 using Reciprocal Rank Fusion (RRF)."""
-        fused_scores = {}
-        # Vector results
-        for rank, (doc, _score) in enumerate(vector_results):
-            doc_id = doc.metadata.get("chunk_index") or doc.page_content[:50]
-            fused_scores.setdefault(doc_id, {"doc": doc, "score": 0.0})
-            rrf_score = 1 / (rank + k)
-            boost = doc.metadata.get("priority", 1) * 0.005
-            fused_scores[doc_id]["score"] += rrf_score + boost
-        # BM25 results
-        for rank, doc in enumerate(bm25_results):
-            doc_id = doc.metadata.get("chunk_index") or doc.page_content[:50]
-            fused_scores.setdefault(doc_id, {"doc": doc, "score": 0.0})
-            rrf_score = 1 / (rank + k)
-            boost = doc.metadata.get("priority", 1) * 0.005
-            fused_scores[doc_id]["score"] += rrf_score + boost
-        reranked = sorted(fused_scores.values(), key=lambda x: x["score"], reverse=True)
-        return [item["doc"] for item in reranked]
-
-    def _retrieve_gpk(self, episode_id: str, question: str, k: int = 8) -> List[Document]:
-        """Hybrid retrieval (Vector + BM25) with RRF and header injection for citations."""
+        return reciprocal_rank_fusion(
+            [[doc for doc, _score in vector_results], bm25_results],
+            weights=[VECTOR_RRF_WEIGHT, LEXICAL_RRF_WEIGHT],
+            k=k,
+        )
+
+    def warm_up(self, episode_id: str):
+        """Preload the episode's chunks and retrieval indexes in the background."""
+        return schedule_warmup(self.vector_store, episode_id)
+
+    def _vector_search(self, episode_id: str, question: str, n: int,
+                       paper_title: Optional[str] = None) -> List[tuple[ChunkView, float]]:
+        """Dense retrieval over the episode's chunks (one embedding round trip).
+
+        Small episodes are searched in-process against their cached embedding
+        matrix; larger ones go through Chroma's filtered search. With
+        `paper_title`, only that paper's chunks are searched. If the snapshot
+        cannot be read, the search goes to Chroma and hits keep their own text.
+        """
         try:
-            # PRO FIX: Use simple similarity search to avoid unpacking issues
-            # Then wrap in tuples to match _reciprocal_rank_fusion signature
-            raw_docs = self.vector_store.similarity_search(
-                question or "episode overview",
-                k=k * 3,
-                filter={"episode_id": episode_id},
-            )
-            vector_candidates = [(doc, 1.0) for doc in raw_docs]
+            vector_index = get_vector_index(self.vector_store, episode_id)
+        except Exception as e:
+            logger.warning(f"Loading the vector index of episode {episode_id} failed, searching Chroma: {e}")
+            vector_index = None
+        if vector_index is not None:
+            keys = None
+            if paper_title is not None:
+                paper_chunks = get_episode_chunks(self.vector_store, episode_id).by_paper.get(paper_title, [])
+                keys = [chunk_key(doc) for doc in paper_chunks]
+            query_vector = self.vector_store.embeddings.embed_query(question or "episode overview")
+            return vector_index.search(query_vector, n, keys=keys)
+
+        metadata_filter = {"episode_id": episode_id}
+        if paper_title is not None:
+            metadata_filter = {"$and": [{"episode_id": episode_id}, {"paper_title": paper_title}]}
+        # PRO FIX: Use simple similarity search to avoid unpacking issues
+        # Then wrap in tuples to match _reciprocal_rank_fusion signature
+        raw_docs = self.vector_store.similarity_search(
+            question or "episode overview",
+            k=n,
+            filter=metadata_filter,
+        )
+        # Resolve hits to the snapshot's shared views (header already attached)
+        try:
+            by_id = get_episode_chunks(self.vector_store, episode_id).by_id
         except Exception as e:
-            logger.error(f"Vector search failed: {e}")
-            vector_candidates = []
+            logger.warning(f"Loading episode {episode_id} failed, using Chroma hits as they are: {e}")
+            by_id = {}
+        return [(by_id.get(chunk_key(doc)) or ChunkView.from_document(doc), 1.0) for doc in raw_docs]
+
+    def _lexical_search(self, episode_id: str, question: str, n: int,
+                        paper_title: Optional[str] = None) -> List[ChunkView]:
+        """BM25 retrieval (corpus and index are loaded once per episode ingest and cached).
 
-        # BM25 retrieval
+        Episodes in the shared FTS5 index are ranked by SQLite's bm25() and
+        need no in-process index; others fall back to bm25.SparseBM25. With
+        `paper_title`, the BM25 corpus is only that paper's chunks.
+        """
         try:
-            all_episode_docs = self.vector_store.similarity_search(
-                " ",
-                k=200,
-                filter={"episode_id": episode_id},
-            )
-            if not all_episode_docs:
-                logger.warning(f"No docs found for episode {episode_id} for BM25.")
-                bm25_results = []
-            else:
-                tokenized_corpus = [doc.page_content.split() for doc in all_episode_docs]
-                bm25 = BM25Okapi(tokenized_corpus)
-                tokenized_query = question.split()
-                bm25_results = bm25.get_top_n(tokenized_query, all_episode_docs, n=k * 3)
+            chunk_ids = search_chunk_ids(question, episode_id, n, paper_title)
         except Exception as e:
-            logger.warning(f"BM25 retrieval failed: {e}, using only vector results")
-            bm25_results = []
-
-        fused_docs = self._reciprocal_rank_fusion(vector_candidates, bm25_results)
-        # Inject header for citation if missing
-        for doc in fused_docs:
-            title = doc.metadata.get("paper_title")
-            if not title or str(title).lower() == "none":
-                title = "Episode Overview"
-            
-            header = f"[{title}] (source)\n"
-            # Check if header is already present to avoid duplication
-            if not doc.page_content.strip().startswith(f"[{title}]"):
-                doc.page_content = header + doc.page_content
-        return fused_docs[:k]
+            logger.warning(f"FTS lexical search failed for episode {episode_id}, using in-process BM25: {e}")
+            chunk_ids = None
+        if chunk_ids is not None:
+            by_id = get_episode_chunks(self.vector_store, episode_id).by_id
+            return [by_id[chunk_id] for chunk_id in chunk_ids if chunk_id in by_id]
+
+        lexical_index = get_lexical_index(self.vector_store, episode_id, paper_title)
+        if lexical_index is None:
+            logger.warning(f"No docs found for episode {episode_id} for BM25.")
+            return []
+        return lexical_index.top_n(question, n=n)
+
+    @staticmethod
+    def _await_retriever(future: Future, deadline: float, name: str) -> list:
+        """Wait for a retriever until its own deadline; on timeout or error return []."""
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            logger.warning(f"{name} exceeded its time budget, fusing without it")
+        except Exception as e:
+            logger.warning(f"{name} failed: {e}")
+        return []
+
+    def _rank_candidates(self, episode_id: str, question: str, n: int,
+                         paper_title: Optional[str] = None) -> List[ChunkView]:
+        """Hybrid retrieval (Vector + BM25) fused with RRF, best first.
+
+        Both retrievers are dispatched at once, each with its own time budget,
+        so a slow embedding round trip no longer holds up the lexical results.
+        `paper_title` scopes both retrievers to one paper's chunks.
+        """
+        dispatched = time.monotonic()
+        vector_future = _retrieval_pool.submit(self._vector_search, episode_id, question, n, paper_title)
+        lexical_future = _retrieval_pool.submit(self._lexical_search, episode_id, question, n, paper_title)
+
+        vector_candidates = self._await_retriever(
+            vector_future, dispatched + VECTOR_SEARCH_TIMEOUT_S, "Vector search"
+        )
+        bm25_results = self._await_retriever(
+            lexical_future, dispatched + LEXICAL_SEARCH_TIMEOUT_S, "BM25 retrieval"
+        )
+
+        return self._reciprocal_rank_fusion(vector_candidates, bm25_results)
+
+    def _retrieve_gpk(self, episode_id: str, question: str, k: int = 8) -> List[ChunkView]:
+        """Hybrid retrieval (Vector + BM25) with RRF.
+
+        Results are shared read-only views whose page_content already carries
+        the citation header.
+        """
+        return self._rank_candidates(episode_id, question, k * 3)[:k]
+
+    def _retrieve_candidates(self, episode_id: str, question: str,
+                             depth: int = RETRY_CONTEXT_K) -> tuple[List[ChunkView], bool]:
+        """Ranked candidate list, served from the retrieval cache when possible.
+
+        The list is fetched once, `depth` deep, so the first answer and the
+        critic retry take different-sized prefixes of the same ranking instead
+        of running retrieval twice. The fused ranking is re-ordered with MMR
+        over the cached chunk embeddings so near-duplicates do not crowd out
+        other papers. Returns (candidates, cache_hit). Cached
+        chunk IDs are resolved through the episode snapshot; if any of them is
+        gone the entry counts as a miss.
+        """
+        cached_ids = retrieval_cache.get(episode_id, question, depth)
+        if cached_ids is not None:
+            try:
+                by_id = get_episode_chunks(self.vector_store, episode_id).by_id
+            except Exception as e:
+                logger.warning(f"Loading episode {episode_id} failed, treating cached retrieval as a miss: {e}")
+                by_id = {}
+            if all(chunk_id in by_id for chunk_id in cached_ids):
+                return [by_id[chunk_id] for chunk_id in cached_ids], True
+
+        # Over-fetch, then let MMR pick `depth` chunks that cover distinct content
+        fused = self._rank_candidates(episode_id, question, depth * 3)
+        try:
+            vector_index = get_vector_index(self.vector_store, episode_id)
+        except Exception as e:
+            logger.warning(f"Loading the vector index of episode {episode_id} failed, skipping MMR: {e}")
+            vector_index = None
+        ranked = diversify(fused, vector_index, depth)
+        if ranked:
+            retrieval_cache.put(episode_id, question, depth, [chunk_key(doc) for doc in ranked])
+        return ranked, False
+
+    def _paper_candidates(self, episode_id: str, question: str, paper_title: str,
+                          depth: int = RETRY_CONTEXT_K) -> List[ChunkView]:
+        """Chunks of one paper, for questions that name it.
+
+        Papers that fit in the first answer's context are returned whole, in
+        reading order, without any search. Longer papers are ranked with
+        hybrid retrieval scoped to the paper (paper_title-filtered vector
+        search, BM25 over the paper's chunks only).
+        """
+        chunks = get_episode_chunks(self.vector_store, episode_id).by_paper.get(paper_title, [])
+        if len(chunks) <= CONTEXT_K:
+            return list(chunks)
+        return self._rank_candidates(episode_id, question, depth, paper_title)[:depth]
+
+    def _retrieve_routed(self, route: RetrievalRoute, episode_id: str, question: str,
+                         depth: int = RETRY_CONTEXT_K) -> tuple[List[ChunkView], bool, str]:
+        """Candidates for a routed question. Returns (candidates, cache_hit, strategy used).
+
+        Overview, paper and time routes are served from the episode snapshot;
+        when they come up empty (e.g. a paper without section text, or no chunk
+        at that time) or the snapshot cannot be loaded, the question falls back
+        to hybrid retrieval.
+        """
+        try:
+            if route.strategy == STRATEGY_OVERVIEW:
+                candidates = get_episode_chunks(self.vector_store, episode_id).overview[:depth]
+                if candidates:
+                    return candidates, False, STRATEGY_OVERVIEW
+            elif route.strategy == STRATEGY_TIME:
+                time_index = get_episode_chunks(self.vector_store, episode_id).time_index
+                candidates = time_index.overlapping(route.timestamp)[:depth]
+                if candidates:
+                    return candidates, False, STRATEGY_TIME
+            elif route.strategy == STRATEGY_PAPER:
+                candidates = self._paper_candidates(episode_id, question, route.paper_title, depth)
+                if candidates:
+                    return candidates, False, STRATEGY_PAPER
+        except Exception as e:
+            logger.warning(f"{route.strategy} retrieval failed for episode {episode_id}, using hybrid: {e}")
+
+        candidates, cache_hit = self._retrieve_candidates(episode_id, question, depth)
+        return candidates, cache_hit, STRATEGY_HYBRID
+
+    def _retrieve_follow_up(self, episode_id: str, question: str, previous_retrieval: Optional[dict],
+                            depth: int = RETRY_CONTEXT_K) -> Optional[tuple[List[ChunkView], bool, str]]:
+        """Reuse the previous turn's chunks as a warm pool for a follow-up question.
+
+        Retrieval only runs for the terms the question adds over the previous
+        turn's query; those results are fused with the warm pool. Returns
+        (candidates, cache_hit, retrieval query), or None when there is no
+        usable warm pool, the question starts a new topic, or it is tied to the
+        previous turn too loosely to skip full retrieval (see followup).
+
+        The retrieval query is this turn's question, or the previous query for
+        a question with no terms of its own ("why?"), so it does not grow over
+        a conversation.
+        """
+        if not previous_retrieval:
+            return None
+        try:
+            by_id = get_episode_chunks(self.vector_store, episode_id).by_id
+        except Exception as e:
+            logger.warning(f"Loading episode {episode_id} failed, skipping the warm pool: {e}")
+            return None
+        # IDs from an older ingest no longer resolve and simply drop out
+        warm = [by_id[chunk_id] for chunk_id in previous_retrieval.get("chunk_ids") or [] if chunk_id in by_id]
+        if not warm:
+            return None
+
+        previous_query = previous_retrieval.get("query") or ""
+        delta, follow_up = query_delta(previous_query, question)
+        if not follow_up or not retrieves_delta_only(previous_query, question):
+            return None
+        if not delta:
+            # The retrieval cache was not consulted; retrieval_strategy="follow_up" covers this
+            return warm[:depth], False, previous_query
+
+        delta_query = " ".join(delta)
+        fresh, cache_hit = self._retrieve_candidates(episode_id, delta_query, depth)
+        fused = reciprocal_rank_fusion([fresh, warm])
+        return fused[:depth], cache_hit, question
 
     def _expand_query(self, query: str, episode_id: str, conversation_history: str = "") -> str:
         """Expand query for better retrieval."""
@@ -198,7 +406,9 @@ class EpisodeCompanionAgent:
         else:
             structure_guidance = f"The answer must follow the required structure for mode `{mode}`."
         
-        critic_template = f"""
+        # A template (not an f-string): the JSON braces are escaped for the prompt,
+        # and context/answer text with braces in it is passed as data
+        critic_template = """
 You are a strict but fair reviewer.
 You receive:
 - Context (episode chunks)
@@ -226,7 +436,12 @@ Answer:
 """
         chain = ChatPromptTemplate.from_template(critic_template) | self.llm | StrOutputParser()
         try:
-            raw = chain.invoke({})
+            raw = chain.invoke({
+                "structure_guidance": structure_guidance,
+                "context": context,
+                "question": question,
+                "answer": answer,
+            })
         except Exception as e:
             logger.error(f"Critic generation failed: {e}")
             return {"grounded": False, "structure_ok": False, "has_citation": False, "issues": ["critic_failed"]}
@@ -243,33 +458,43 @@ Answer:
 
     def _compute_time_hint_gpk(self, docs):
         """Compute a simple [min, max] timestamp window from retrieved chunks."""
-        starts = []
-        ends = []
-        for d in docs:
-            md = d.metadata or {}
-            if "timestamp_start" in md and "timestamp_end" in md:
-                try:
-                    starts.append(float(md["timestamp_start"]))
-                    ends.append(float(md["timestamp_end"]))
-                except (ValueError, TypeError):
-                    continue
-        
-        if not starts or not ends:
+        intervals = [interval for d in docs if (interval := chunk_interval(d)) is not None]
+        if not intervals:
             return None  # no timing info
+        return time_hint(min(start for start, _ in intervals), max(end for _, end in intervals))
 
-        start_s = int(min(starts))
-        end_s = int(max(ends))
-
-        def _fmt(sec: int) -> str:
-            m = sec // 60
-            s = sec % 60
-            return f"{m}:{s:02d}"
-
+    def _refusal_response(self, episode_id: str, mode: str, trace_id: str, start_time: float,
+                          expanded_query: str, question_type: str, quality_checks: dict,
+                          source_papers: list, negative_cache_hit: bool = False) -> dict:
+        """INSUFFICIENT_MSG response for questions answered without retrieval or generation."""
         return {
-            "start_seconds": start_s,
-            "end_seconds": end_s,
-            "start_human": _fmt(start_s),
-            "end_human": _fmt(end_s),
+            "episode_id": episode_id,
+            "mode": mode,
+            "answer": INSUFFICIENT_MSG,
+            "metadata": {
+                "trace_id": trace_id,
+                "latency_ms": round((time.time() - start_time) * 1000, 2),
+                "stage_latency": {
+                    "retrieval": 0.0,
+                    "llm": 0.0,
+                    "critic": 0.0,
+                    "retrieval_cache_hit": 0.0,
+                    "negative_cache_hit": float(negative_cache_hit),
+                },
+                "used_chunks": 0,
+                "expanded_query": expanded_query,
+                "quality_checks": quality_checks,
+                "source_papers": list(source_papers),
+                "tokens_in": 0,
+                "tokens_out": 0,
+                "model": self.model_name,
+                "question_type": question_type,
+                "debug": None,
+                "suggested_followups": [
+                    "What are the main papers in this episode?",
+                    "Explain one of the actual papers in this episode.",
+                ],
+            },
         }
 
     def _safe_llm_call_gpk(self, prompt: str) -> str:
@@ -422,8 +647,14 @@ Score: X/10
                    user_id: Optional[str] = None,
                    conversation_history: str = "",
                    debug: bool = False,
-                   user_profile: Optional[dict] = None) -> dict:
-        """Synchronous wrapper that runs async generation with optional critic retry."""
+                   user_profile: Optional[dict] = None,
+                   previous_retrieval: Optional[dict] = None) -> dict:
+        """Synchronous wrapper that runs async generation with optional critic retry.
+
+        `previous_retrieval` ({"chunk_ids", "query"} from the previous turn, see
+        ConversationManager.get_last_retrieval) lets follow-up questions reuse
+        that turn's chunks instead of retrieving from scratch.
+        """
         try:
             trace_id = str(uuid.uuid4())
             start_time = time.time()
@@ -466,84 +697,89 @@ Score: X/10
             prompt_template = PROMPT_TEMPLATES[mode]
 
             expanded_query = self._expand_query(query, episode_id, conversation_history)
-            
+
+            # Repeats of a question this episode already could not answer. Follow-ups
+            # depend on the previous turn, so they are neither served nor cached here.
+            may_be_follow_up = bool(previous_retrieval) and query_delta(
+                previous_retrieval.get("query") or "", expanded_query
+            )[1]
+            refusal = None if may_be_follow_up else negative_cache.get(episode_id, query, mode)
+            if refusal is not None:
+                logger.info(f"Trace={trace_id} | Negative cache hit ({refusal['reason']}) → returning insufficient context.")
+                return self._refusal_response(episode_id, mode, trace_id, start_time, expanded_query, question_type,
+                                              {**refusal["quality_checks"], "negative_cache_hit": True},
+                                              refusal["source_papers"], negative_cache_hit=True)
+
+            # Hallucination guardrail, before retrieval: guarded terms the query
+            # mentions must occur somewhere in the episode (set lookups). If the
+            # store cannot be read, the guardrail is skipped (the critic still runs)
+            try:
+                term_index = get_term_index(self.vector_store, episode_id)
+            except Exception as e:
+                logger.warning(f"Trace={trace_id} | Term index unavailable, skipping guardrail: {e}")
+                term_index = None
+            missing_terms = term_index.missing_guarded_terms(query) if term_index is not None else []
+            if missing_terms:
+                term = missing_terms[0]
+                logger.info(
+                    f"Trace={trace_id} | Guardrail: '{term}' not in episode content → returning insufficient context."
+                )
+                quality_checks = {
+                    "grounded": False,
+                    "reason": f"'{term}' not in episode content",
+                    "hallucination_guardrail_triggered": True,
+                }
+                source_papers = sorted(title.lower() for title in term_index.titles)
+                negative_cache.put(episode_id, query, REASON_GUARDRAIL, quality_checks, source_papers)
+                return self._refusal_response(episode_id, mode, trace_id, start_time, expanded_query,
+                                              question_type, quality_checks, source_papers)
+
             # Retrieval
             retrieval_start = time.time()
-            docs = self._retrieve_gpk(episode_id, expanded_query, k=5)
+            # Summaries and paper questions skip hybrid retrieval; one over-fetched
+            # ranking serves both the first answer and the critic retry
+            route = route_question(question_type, query, term_index.titles if term_index is not None else ())
+            follow_up = None
+            if route.strategy == STRATEGY_HYBRID:
+                follow_up = self._retrieve_follow_up(episode_id, expanded_query, previous_retrieval)
+            if follow_up is not None:
+                candidates, retrieval_cache_hit, retrieval_query = follow_up
+                retrieval_strategy = STRATEGY_FOLLOW_UP
+            else:
+                candidates, retrieval_cache_hit, retrieval_strategy = self._retrieve_routed(
+                    route, episode_id, expanded_query
+                )
+                retrieval_query = expanded_query
+            # Stored with the turn so the next question can start from these chunks
+            retrieved_chunk_ids = [chunk_key(doc) for doc in candidates]
+            # Time-anchored questions report the window around the anchor (O(log n))
+            anchored_time_hint = None
+            if retrieval_strategy == STRATEGY_TIME:
+                anchored_time_hint = get_episode_chunks(self.vector_store, episode_id).time_index.window(
+                    route.timestamp
+                )
             retrieval_ms = (time.time() - retrieval_start) * 1000
-            
-            logger.info(f"Trace={trace_id} | Retrieved {len(docs)} chunks in {retrieval_ms:.2f}ms")
 
-            # Create context text first (needed for guardrail check)
-            context_text = "\n\n---\n\n".join([doc.page_content for doc in docs])
+            # Create context text first (needed for guardrail check): neighbours
+            # merged, duplicated report text dropped, packed to a token budget
+            packed = pack_context(candidates[:CONTEXT_K], CONTEXT_TOKEN_BUDGET)
+            docs = packed.chunks
+            context_text = packed.text
+
+            logger.info(
+                f"Trace={trace_id} | Retrieved {len(docs)} chunks in {retrieval_ms:.2f}ms "
+                f"({retrieval_strategy}, cache {'hit' if retrieval_cache_hit else 'miss'}), packed into "
+                f"{len(packed.blocks)} blocks / {packed.tokens} tokens "
+                f"({packed.duplicates_dropped} duplicate, {packed.over_budget_dropped} over budget dropped)"
+            )
             logger.info(f"Trace={trace_id} | Context Preview: {context_text[:200]}...")
 
-            # Heuristic check for missing papers to prevent hallucinations
+            # Paper titles of the retrieved chunks (reported as source_papers)
             paper_titles = {
                 (doc.metadata.get("paper_title") or "").lower()
                 for doc in docs if doc.metadata
             }
             
-            lower_q = query.lower()
-            lower_context = context_text.lower()
-            
-            # Terms that MUST be present in the episode to answer safely.
-            # If user asks about them and they are nowhere in the episode,
-            # we return the strict insufficient-context message.
-            special_terms = [
-                "kandinsky 5.0",
-                "kandinsky5",
-                "sdxl",
-                "gpt-4o",
-                "java virtual machine",
-                "jvm",
-                "python's garbage collector",
-                "python garbage collector",
-                "garbage collector",
-                "garbage collection",
-            ]
-            
-            for term in special_terms:
-                if term in lower_q:
-                    in_titles = any(term in title for title in paper_titles)
-                    in_context = term in lower_context
-                    if not in_titles and not in_context:
-                        logger.info(
-                            f"Trace={trace_id} | Guardrail: '{term}' not in episode content → returning insufficient context."
-                        )
-                        return {
-                            "episode_id": episode_id,
-                            "mode": mode,
-                            "answer": INSUFFICIENT_MSG,
-                            "metadata": {
-                                "trace_id": trace_id,
-                                "latency_ms": 0.0,
-                                "stage_latency": {
-                                    "retrieval": retrieval_ms,
-                                    "llm": 0.0,
-                                    "critic": 0.0,
-                                },
-                                "used_chunks": len(docs),
-                                "expanded_query": expanded_query,
-                                "quality_checks": {
-                                    "grounded": False,
-                                    "reason": f"'{term}' not in episode content",
-                                    "hallucination_guardrail_triggered": True,
-                                },
-                            "source_papers": list(paper_titles),
-                            "tokens_in": 0,
-                            "tokens_out": 0,
-                            "model": self.model_name,
-                            "question_type": question_type,
-                            "debug": None,
-                            "suggested_followups": [
-                                "What are the main papers in this episode?",
-                                "Explain one of the actual papers in this episode.",
-                            ],
-                        },
-                    }
-
-
             # NEW: handle learning modes BEFORE normal generation
             if question_type == "quiz_me":
                 quiz = self._generate_quiz_questions_gpk(context_text, topic_hint=query)
@@ -566,8 +802,12 @@ Score: X/10
                             "retrieval": round(retrieval_ms, 2),
                             "llm": 0.0,
                             "critic": 0.0,
+                            "retrieval_cache_hit": float(retrieval_cache_hit),
                         },
                         "used_chunks": len(docs),
+                        "retrieval_strategy": retrieval_strategy,
+                        "retrieved_chunk_ids": retrieved_chunk_ids,
+                        "retrieval_query": retrieval_query,
                         "expanded_query": expanded_query,
                         "quality_checks": {"learning_mode": "quiz"},
                         "source_papers": list(paper_titles),
@@ -577,7 +817,7 @@ Score: X/10
                         "question_type": question_type,
                         "debug": None,
                         "suggested_followups": [],
-                        "episode_time_hint": self._compute_time_hint_gpk(docs),
+                        "episode_time_hint": anchored_time_hint or self._compute_time_hint_gpk(docs),
                     },
                 }
 
@@ -603,8 +843,12 @@ Score: X/10
                                 "retrieval": round(retrieval_ms, 2),
                                 "llm": 0.0,
                                 "critic": 0.0,
+                                "retrieval_cache_hit": float(retrieval_cache_hit),
                             },
                             "used_chunks": len(docs),
+                            "retrieval_strategy": retrieval_strategy,
+                            "retrieved_chunk_ids": retrieved_chunk_ids,
+                            "retrieval_query": retrieval_query,
                             "expanded_query": expanded_query,
                             "quality_checks": {"learning_mode": "critique_prompt_missing"},
                             "source_papers": list(paper_titles),
@@ -614,7 +858,7 @@ Score: X/10
                             "question_type": question_type,
                             "debug": None,
                             "suggested_followups": [],
-                            "episode_time_hint": self._compute_time_hint_gpk(docs),
+                            "episode_time_hint": anchored_time_hint or self._compute_time_hint_gpk(docs),
                         },
                     }
 
@@ -641,8 +885,12 @@ Score: X/10
                             "retrieval": round(retrieval_ms, 2),
                             "llm": 0.0,
                             "critic": 0.0,
+                            "retrieval_cache_hit": float(retrieval_cache_hit),
                         },
                         "used_chunks": len(docs),
+                        "retrieval_strategy": retrieval_strategy,
+                        "retrieved_chunk_ids": retrieved_chunk_ids,
+                        "retrieval_query": retrieval_query,
                         "expanded_query": expanded_query,
                         "quality_checks": {"learning_mode": "critique"},
                         "source_papers": list(paper_titles),
@@ -652,7 +900,7 @@ Score: X/10
                         "question_type": question_type,
                         "debug": None,
                         "suggested_followups": [],
-                        "episode_time_hint": self._compute_time_hint_gpk(docs),
+                        "episode_time_hint": anchored_time_hint or self._compute_time_hint_gpk(docs),
                     },
                 }
 
@@ -750,9 +998,10 @@ Score: X/10
             
             if needs_retry:
                 logger.info(f"Trace={trace_id} | Critic failed: {critique.get('issues')}. Retrying...")
+                first_answer_failed = _is_generation_fallback(answer)
                 
-                more_docs = self._retrieve_gpk(episode_id, expanded_query, k=10)
-                more_context = "\n\n---\n\n".join([doc.page_content for doc in more_docs])
+                # Widen the context window from the same ranking (no second retrieval)
+                more_context = pack_context(candidates[:RETRY_CONTEXT_K], RETRY_CONTEXT_TOKEN_BUDGET).text
                 gen_inputs["context"] = more_context
                 
                 
@@ -773,6 +1022,14 @@ Score: X/10
                         "reason": "Answer not grounded in episode content after retry",
                         "critic_issues": critique2.get("issues", [])
                     }
+                    # Only a real verdict on real answers is cached: an LLM outage
+                    # (critic errors, generation fallbacks) must not refuse for an hour
+                    genuine_failure = (
+                        _critic_judged(critique) and _critic_judged(critique2)
+                        and not first_answer_failed and not _is_generation_fallback(answer)
+                    )
+                    if retrieval_strategy != STRATEGY_FOLLOW_UP and genuine_failure:
+                        negative_cache.put(episode_id, query, REASON_GROUNDING, quality_checks, mode=mode)
 
 
             # Post-processing: Enforce strict insufficient context message
@@ -785,7 +1042,7 @@ Score: X/10
                     answer = INSUFFICIENT_MSG
 
             # Final quality checks
-            if "I apologize" in answer or "I'm having trouble" in answer:
+            if _is_generation_fallback(answer):
                 quality_checks = {"error": "Timeout or generation error, returned fallback"}
             else:
                 quality_checks = self._validate_answer(answer, context_text, query, mode, question_type)
@@ -803,6 +1060,11 @@ Score: X/10
             expanded_query = query
             context_text = ""
             retrieval_ms = 0
+            retrieval_cache_hit = False
+            retrieval_strategy = None
+            retrieved_chunk_ids = []
+            retrieval_query = ""
+            anchored_time_hint = None
             llm_ms = 0
             critic_ms = 0
 
@@ -858,9 +1120,13 @@ Score: X/10
                 "stage_latency": {
                     "retrieval": round(retrieval_ms, 2),
                     "llm": round(llm_ms, 2),
-                    "critic": round(critic_ms, 2)
+                    "critic": round(critic_ms, 2),
+                    "retrieval_cache_hit": float(retrieval_cache_hit),
                 },
                 "used_chunks": len(docs),
+                "retrieval_strategy": retrieval_strategy,
+                "retrieved_chunk_ids": retrieved_chunk_ids,
+                "retrieval_query": retrieval_query,
                 "expanded_query": expanded_query,
                 "quality_checks": quality_checks,
                 "source_papers": source_papers,
@@ -870,7 +1136,7 @@ Score: X/10
                 "question_type": question_type,
                 "debug": debug_payload,
                 "suggested_followups": suggested_followups,
-                "episode_time_hint": self._compute_time_hint_gpk(docs),
+                "episode_time_hint": anchored_time_hint or self._compute_time_hint_gpk(docs),
             },
         }
 
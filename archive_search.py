@@ -0,0 +1,277 @@
+"""
+Cross-episode search over the whole archive.
+
+The timeline path only looks at the latest few reports. search_archive ranks
+chunks from every ingested episode, then rolls them up into ranked episodes
+and papers:
+
+- lexical: one sparse BM25 index (bm25.SparseBM25) over every chunk in the
+  collection, cached per archive version (the sum of the shared ingest
+  versions in ingest_versions, so an ingest by any process invalidates it;
+  ARCHIVE_INDEX_TTL_S also bounds its age).
+  The last query word is treated as a prefix, so partial words match while
+  the user is still typing
+- semantic: Chroma similarity search, restricted to the episodes in the date
+  range; typeahead callers can skip it (semantic=False) to avoid the
+  embedding call
+- both rankings are fused with RRF; the full fused ranking is cached per
+  (query, filters) so paging through results and repeated keystrokes are
+  cache hits
+"""
+
+import logging
+import os
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bm25 import SparseBM25, tokenize
+from cache import LRUCache
+from episode_index import ChunkView
+from ingest_versions import get_archive_version
+from rank_fusion import chunk_key, fuse_with_scores
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_INDEX_TTL_S = float(os.getenv("ARCHIVE_INDEX_TTL_S", "300"))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+SEARCH_CACHE_TTL_S = float(os.getenv("SEARCH_CACHE_TTL_S", "120"))
+
+# Candidates taken from each retriever before fusion
+SEARCH_LEXICAL_K = int(os.getenv("SEARCH_LEXICAL_K", "100"))
+SEARCH_VECTOR_K = int(os.getenv("SEARCH_VECTOR_K", "50"))
+# Completions tried for an unfinished last word (most common terms first)
+PREFIX_EXPANSIONS = int(os.getenv("PREFIX_EXPANSIONS", "5"))
+SNIPPET_CHARS = 240
+
+_EPISODE_DATE = re.compile(r"(\d{4}-\d{2}-\d{2})$")
+
+
+def episode_date(episode_id: str) -> str:
+    """Date an episode ID ends with ("ai-research-daily-2025-11-19"), or ""."""
+    match = _EPISODE_DATE.search(episode_id or "")
+    return match.group(1) if match else ""
+
+
+class ArchiveIndex:
+    """BM25 over every chunk of every episode, with a sorted vocabulary for prefixes."""
+
+    def __init__(self, version: int, docs: List[ChunkView]):
+        self.version = version
+        self.docs = docs
+        self.by_id = {chunk_key(doc): doc for doc in docs}
+        self.episode_ids = np.array([doc.metadata.get("episode_id") or "" for doc in docs], dtype=object)
+        self._bm25 = SparseBM25([tokenize(doc.text) for doc in docs])
+        self.vocabulary = sorted(self._bm25.vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """Vocabulary terms starting with `prefix`, most common first."""
+        start = bisect_left(self.vocabulary, prefix)
+        matches = []
+        for term in self.vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        matches.sort(key=lambda term: -self._bm25.document_frequency[self._bm25.vocabulary[term]])
+        return matches[:PREFIX_EXPANSIONS]
+
+    def query_terms(self, query: str) -> List[str]:
+        """Tokens of the query; an unfinished last word is expanded to completions."""
+        tokens = tokenize(query)
+        if not tokens:
+            return tokens
+        if query[-1:].isspace() or tokens[-1] in self._bm25:
+            return tokens
+        return tokens[:-1] + (self.expand_prefix(tokens[-1]) or tokens[-1:])
+
+    def top_n(self, query: str, n: int, episode_ids: Optional[set] = None) -> List[ChunkView]:
+        """Best-scoring chunks with a positive score, optionally within some episodes."""
+        terms = self.query_terms(query)
+        if not terms:
+            return []
+        mask = None
+        if episode_ids is not None:
+            mask = np.isin(self.episode_ids, list(episode_ids))
+        return [self.docs[i] for i in self._bm25.top_k(terms, n, mask)]
+
+
+_archive_indexes = LRUCache(maxsize=1, ttl_seconds=ARCHIVE_INDEX_TTL_S)
+_search_results = LRUCache(maxsize=SEARCH_CACHE_SIZE, ttl_seconds=SEARCH_CACHE_TTL_S)
+
+
+def get_archive_index(vector_store) -> ArchiveIndex:
+    """Return the cached archive-wide lexical index, building it on first use."""
+    version = get_archive_version()
+    index = _archive_indexes.get(version)
+    if index is not None:
+        return index
+
+    result = vector_store.get(include=["documents", "metadatas"])
+    docs = [
+        ChunkView.create(chunk_id, text, metadata)
+        for chunk_id, text, metadata in zip(
+            result.get("ids") or [],
+            result.get("documents") or [],
+            result.get("metadatas") or [],
+        )
+    ]
+    index = ArchiveIndex(version, docs)
+    _archive_indexes.put(version, index)
+    logger.info(f"Built archive index (v{version}, {len(index)} chunks, {len(index.vocabulary)} terms)")
+    return index
+
+
+def clear_search_caches() -> None:
+    _archive_indexes.clear()
+    _search_results.clear()
+
+
+@dataclass
+class SearchResults:
+    """One page of chunks, episodes and papers, plus the totals for each."""
+    query: str
+    offset: int
+    limit: int
+    chunks: List[dict] = field(default_factory=list)
+    episodes: List[dict] = field(default_factory=list)
+    papers: List[dict] = field(default_factory=list)
+    total_chunks: int = 0
+    total_episodes: int = 0
+    total_papers: int = 0
+    cache_hit: bool = False
+
+
+def _episodes_in_range(episode_ids: Sequence[str], dates: Mapping[str, str],
+                       date_from: Optional[str], date_to: Optional[str]) -> Optional[set]:
+    """Episodes whose date falls in [date_from, date_to]; None when unfiltered."""
+    if not date_from and not date_to:
+        return None
+    allowed = set()
+    for episode_id in episode_ids:
+        date = dates.get(episode_id) or episode_date(episode_id)
+        if not date:
+            continue
+        if date_from and date < date_from:
+            continue
+        if date_to and date > date_to:
+            continue
+        allowed.add(episode_id)
+    return allowed
+
+
+def _vector_hits(vector_store, query: str, n: int, episode_ids: Optional[set],
+                 by_id: Dict[str, ChunkView]) -> List[ChunkView]:
+    search_filter = None
+    if episode_ids is not None:
+        search_filter = {"episode_id": {"$in": sorted(episode_ids)}}
+    try:
+        docs = vector_store.similarity_search(query, k=n, filter=search_filter)
+    except Exception as e:
+        # Lexical results still come back when the embedding call fails
+        logger.warning(f"Archive vector search failed, using lexical results only: {e}")
+        return []
+    return [by_id.get(chunk_key(doc)) or ChunkView.from_document(doc) for doc in docs]
+
+
+def _rank(vector_store, query: str, dates: Mapping[str, str], date_from: Optional[str],
+          date_to: Optional[str], semantic: bool) -> List[Tuple[ChunkView, float]]:
+    if not tokenize(query):
+        return []
+    index = get_archive_index(vector_store)
+    scope = _episodes_in_range(sorted(set(index.episode_ids)), dates, date_from, date_to)
+    if scope is not None and not scope:
+        return []
+
+    ranked_lists = [index.top_n(query, SEARCH_LEXICAL_K, scope)]
+    if semantic:
+        ranked_lists.insert(0, _vector_hits(vector_store, query, SEARCH_VECTOR_K, scope, index.by_id))
+    return fuse_with_scores(ranked_lists, boost=None)
+
+
+def _roll_up(fused: List[Tuple[ChunkView, float]], key) -> List[Tuple[object, dict]]:
+    """Sum fused chunk scores per group key; (key, group) pairs, best group first."""
+    groups: Dict[tuple, dict] = {}
+    for doc, score in fused:
+        group_key = key(doc)
+        if group_key is None:
+            continue
+        group = groups.setdefault(group_key, {"score": 0.0, "matches": 0, "top_chunk_id": chunk_key(doc)})
+        group["score"] += score
+        group["matches"] += 1
+    ordered = sorted(groups.items(), key=lambda item: item[1]["score"], reverse=True)
+    return [(group_key, group) for group_key, group in ordered]
+
+
+def _paper_key(doc: ChunkView):
+    title = doc.metadata.get("paper_title")
+    if not title or title == "None":
+        return None
+    return (doc.metadata.get("episode_id"), title)
+
+
+def search_archive(vector_store, query: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                   offset: int = 0, limit: int = 10, semantic: bool = True,
+                   episode_dates: Optional[Mapping[str, str]] = None) -> SearchResults:
+    """Search every episode for `query`.
+
+    Args:
+        vector_store: The Chroma store holding all episodes.
+        query: Search text; the last word may be incomplete.
+        date_from, date_to: Inclusive "YYYY-MM-DD" bounds on the episode date.
+        offset, limit: The page of each result list to return.
+        semantic: Include vector search (one embedding call per new query).
+        episode_dates: episode_id -> date (from the Episode table); episodes
+            missing here are dated by the date their ID ends with.
+    """
+    dates = episode_dates or {}
+    query = " ".join(query.split()) + (" " if query[-1:].isspace() else "")
+    cache_key = (get_archive_version(), query.lower(), date_from, date_to, semantic)
+    fused = _search_results.get(cache_key)
+    cache_hit = fused is not None
+    if not cache_hit:
+        fused = _rank(vector_store, query, dates, date_from, date_to, semantic)
+        _search_results.put(cache_key, fused)
+
+    def date_of(episode_id):
+        return dates.get(episode_id) or episode_date(episode_id)
+
+    episodes = _roll_up(fused, lambda doc: doc.metadata.get("episode_id"))
+    papers = _roll_up(fused, _paper_key)
+    page = slice(offset, offset + limit)
+    return SearchResults(
+        query=query.strip(),
+        offset=offset,
+        limit=limit,
+        chunks=[
+            {
+                "chunk_id": chunk_key(doc),
+                "episode_id": doc.metadata.get("episode_id"),
+                "date": date_of(doc.metadata.get("episode_id")),
+                "paper_title": _paper_key(doc)[1] if _paper_key(doc) else None,
+                "source_type": doc.metadata.get("source_type"),
+                "snippet": doc.text[:SNIPPET_CHARS],
+                "score": round(score, 6),
+            }
+            for doc, score in fused[page]
+        ],
+        episodes=[
+            {"episode_id": episode_id, "date": date_of(episode_id), "score": round(group["score"], 6),
+             "matches": group["matches"], "top_chunk_id": group["top_chunk_id"]}
+            for episode_id, group in episodes[page]
+        ],
+        papers=[
+            {"episode_id": episode_id, "date": date_of(episode_id), "paper_title": title,
+             "score": round(group["score"], 6), "matches": group["matches"], "top_chunk_id": group["top_chunk_id"]}
+            for (episode_id, title), group in papers[page]
+        ],
+        total_chunks=len(fused),
+        total_episodes=len(episodes),
+        total_papers=len(papers),
+        cache_hit=cache_hit,
+    )
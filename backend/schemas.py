@@ -43,6 +43,9 @@ class CompanionAnswerMetadata(BaseModel):
     model: str
     question_type: str
 
+    # Retrieval strategy the question was routed to ("overview", "paper", "time", "hybrid" or "follow_up")
+    retrieval_strategy: Optional[str] = None
+
     # Optional debug fields; we keep them flexible
     debug: Optional[Dict[str, Any]] = None
 
@@ -62,3 +65,48 @@ class CompanionQueryResponse(BaseModel):
     mode: str
     answer: str
     metadata: CompanionAnswerMetadata
+
+
+class SearchChunkHit(BaseModel):
+    chunk_id: str
+    episode_id: Optional[str] = None
+    date: str = ""
+    paper_title: Optional[str] = None
+    source_type: Optional[str] = None
+    snippet: str
+    score: float
+
+
+class SearchEpisodeHit(BaseModel):
+    episode_id: str
+    date: str = ""
+    score: float
+    matches: int
+    top_chunk_id: str
+
+
+class SearchPaperHit(BaseModel):
+    episode_id: Optional[str] = None
+    date: str = ""
+    paper_title: str
+    score: float
+    matches: int
+    top_chunk_id: str
+
+
+class SearchResponse(BaseModel):
+    """
+    One page of cross-episode search results. `offset`/`limit` apply to each
+    list; the totals say how many results each list has in all.
+    """
+    query: str
+    offset: int
+    limit: int
+    total_chunks: int
+    total_episodes: int
+    total_papers: int
+    chunks: List[SearchChunkHit]
+    episodes: List[SearchEpisodeHit]
+    papers: List[SearchPaperHit]
+    latency_ms: float
+    cache_hit: bool = False
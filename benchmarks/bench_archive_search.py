@@ -0,0 +1,94 @@
+"""
+Benchmark: cross-episode /search latency on a synthetic archive.
+
+Builds archives of 30 / 90 / 365 daily episodes, 60 chunks each, of ~150
+words drawn from a Zipf-distributed vocabulary (plus a few model names per
+episode), and reports for the lexical (typeahead, semantic=False) path:
+
+- the one-time archive index build
+- a new query, typed one character at a time (every prefix is a new query;
+  the last word is prefix-matched)
+- the same keystrokes again (result cache hits), and paging through a query
+
+Semantic search adds one embedding call plus a Chroma query on a cache miss;
+it is not measured here.
+
+Run from the repo root (importing archive_search loads ingest, which builds the
+embeddings client; no API calls are made, any key value works):
+    GOOGLE_API_KEY=... python benchmarks/bench_archive_search.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import archive_search
+
+CHUNKS_PER_EPISODE = 60
+WORDS_PER_CHUNK = 150
+VOCABULARY = 20000
+SIZES = [30, 90, 365]
+QUERIES = ["video diffusion transformer", "kandinsky scaling", "vision reasoning benchmark"]
+
+
+class ArchiveStore:
+    def __init__(self, ids, documents, metadatas):
+        self.result = {"ids": ids, "documents": documents, "metadatas": metadatas}
+
+    def get(self, include=None, **_kwargs):
+        return self.result
+
+
+def _archive(rng, episodes):
+    words = np.array([f"w{i}" for i in range(VOCABULARY)] + ["video", "diffusion", "transformer",
+                                                              "kandinsky", "scaling", "vision",
+                                                              "reasoning", "benchmark"])
+    ids, documents, metadatas = [], [], []
+    for e in range(episodes):
+        episode_id = f"ai-research-daily-{2025 - e // 365}-{(e // 28) % 12 + 1:02d}-{e % 28 + 1:02d}"
+        for c in range(CHUNKS_PER_EPISODE):
+            picks = np.minimum(rng.zipf(1.2, WORDS_PER_CHUNK) - 1, len(words) - 1)
+            ids.append(f"{episode_id}-{c}")
+            documents.append(" ".join(words[picks]))
+            metadatas.append({"episode_id": episode_id, "paper_title": f"Paper {c % 7}"})
+    return ArchiveStore(ids, documents, metadatas)
+
+
+def _keystrokes(store, query):
+    started = time.perf_counter()
+    for end in range(1, len(query) + 1):
+        archive_search.search_archive(store, query[:end], semantic=False)
+    return (time.perf_counter() - started) / len(query) * 1000
+
+
+def main():
+    rng = np.random.default_rng(7)
+    print(f"{'episodes':>8} | {'chunks':>6} | {'build ms':>8} | {'keystroke ms':>12} | "
+          f"{'cached ms':>9} | {'page ms':>7}")
+    print("-" * 66)
+    for episodes in SIZES:
+        store = _archive(rng, episodes)
+        archive_search.clear_search_caches()
+
+        started = time.perf_counter()
+        index = archive_search.get_archive_index(store)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        cold = np.mean([_keystrokes(store, query) for query in QUERIES])
+        warm = np.mean([_keystrokes(store, query) for query in QUERIES])
+
+        started = time.perf_counter()
+        for page in range(10):
+            archive_search.search_archive(store, QUERIES[0], offset=page * 10, limit=10, semantic=False)
+        page_ms = (time.perf_counter() - started) / 10 * 1000
+
+        print(f"{episodes:>8} | {len(index):>6} | {build_ms:>8.0f} | {cold:>12.2f} | "
+              f"{warm:>9.3f} | {page_ms:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
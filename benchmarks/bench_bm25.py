@@ -0,0 +1,72 @@
+"""
+Benchmark: bm25.SparseBM25 vs rank_bm25.BM25Okapi.
+
+Synthetic corpora from a single episode (60 chunks) up to a year of the
+archive (21900 chunks), ~150 words per chunk drawn from a Zipf-distributed
+vocabulary. Both engines index the same tokens (bm25.tokenize). Reports:
+
+- build time
+- per-query top-k time (BM25Okapi.get_top_n vs SparseBM25.top_k), for
+  4-word queries mixing common and rare terms
+- the largest score difference between the two engines (same IDF variant,
+  so this should be float32 rounding only)
+
+Run from the repo root:
+    python benchmarks/bench_bm25.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from bm25 import SparseBM25
+
+K = 30
+QUERIES = 50
+WORDS_PER_CHUNK = 150
+VOCABULARY = 20000
+SIZES = [60, 500, 5000, 21900]
+
+
+def _corpus(rng, size):
+    picks = np.minimum(rng.zipf(1.2, (size, WORDS_PER_CHUNK)) - 1, VOCABULARY - 1)
+    return [[f"w{i}" for i in row] for row in picks]
+
+
+def _timed(fn, repeat=1):
+    started = time.perf_counter()
+    for i in range(repeat):
+        result = fn(i)
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    rng = np.random.default_rng(7)
+    print(f"{'chunks':>6} | {'okapi build':>11} | {'sparse build':>12} | {'okapi q ms':>10} | "
+          f"{'sparse q ms':>11} | {'speedup':>7} | {'max diff':>8}")
+    print("-" * 84)
+    for size in SIZES:
+        corpus = _corpus(rng, size)
+        docs = list(range(size))
+        queries = [[f"w{i}" for i in rng.zipf(1.5, 4) - 1] for _ in range(QUERIES)]
+
+        okapi_build, okapi = _timed(lambda _i: BM25Okapi(corpus))
+        sparse_build, sparse = _timed(lambda _i: SparseBM25(corpus))
+        sparse.top_k(queries[0], K)  # first-call NumPy overhead
+        okapi_ms, _ = _timed(lambda i: okapi.get_top_n(queries[i], docs, n=K), QUERIES)
+        sparse_ms, _ = _timed(lambda i: sparse.top_k(queries[i], K), QUERIES)
+
+        diff = max(
+            float(np.max(np.abs(okapi.get_scores(q) - sparse.get_scores(q)))) for q in queries[:10]
+        )
+        print(f"{size:>6} | {okapi_build:>9.0f}ms | {sparse_build:>10.0f}ms | {okapi_ms:>10.3f} | "
+              f"{sparse_ms:>11.3f} | {okapi_ms / sparse_ms:>6.1f}x | {diff:>8.1e}")
+
+
+if __name__ == "__main__":
+    main()
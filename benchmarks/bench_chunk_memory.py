@@ -0,0 +1,90 @@
+"""
+Benchmark: memory per cached episode snapshot, legacy vs compact ChunkView.
+
+Ingests the episode reports in data/ and ingest_rich.RICH_CONTENT the same way
+as bench_context_packer (recording store, no embeddings), then rebuilds each
+episode's snapshot from a JSON round trip of the stored chunks, which, like a
+Chroma get, hands back fresh string objects for every metadata value. Memory
+is measured with tracemalloc after the decoded payload has been dropped, i.e.
+what the snapshot cache keeps alive:
+
+- legacy: the previous ChunkView, a frozen dataclass with a per-instance
+  __dict__ and both `text` and `page_content` (header + text) stored
+- compact: the current ChunkView (__slots__, interned metadata strings and
+  citation headers, page_content joined on access)
+
+Run from the repo root (importing ingest builds the embeddings client; no API
+calls are made, any key value works):
+    GOOGLE_API_KEY=... python benchmarks/bench_chunk_memory.py
+"""
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_context_packer import ingest_report, load_reports
+from episode_index import ChunkView
+from ingest import citation_header
+
+
+@dataclass(frozen=True)
+class LegacyChunkView:
+    id: Optional[str]
+    text: str
+    page_content: str
+    metadata: Mapping[str, Any]
+
+    @classmethod
+    def create(cls, chunk_id, text, metadata):
+        metadata = dict(metadata or {})
+        text = text or ""
+        header = metadata.get("citation") or citation_header(metadata.get("paper_title"))
+        title_tag = header.partition(" (source)")[0]
+        page_content = text if text.lstrip().startswith(title_tag) else header + text
+        return cls(id=chunk_id, text=text, page_content=page_content, metadata=MappingProxyType(metadata))
+
+
+def snapshot_bytes(view_cls, payload: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = json.loads(payload)
+    views = [view_cls.create(i, t, m) for i, t, m in zip(result["ids"], result["documents"], result["metadatas"])]
+    del result
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert views
+    return size
+
+
+def main():
+    print(f"{'episode':<28} | {'chunks':>6} | {'legacy KiB':>10} | {'compact KiB':>11} | {'saved':>6}")
+    print("-" * 74)
+    totals = [0, 0]
+    for episode_id, report_text in load_reports():
+        _, chunks = ingest_report(episode_id, report_text)
+        payload = json.dumps({
+            "ids": [c.id for c in chunks],
+            "documents": [c.text for c in chunks],
+            "metadatas": [dict(c.metadata) for c in chunks],
+        })
+        legacy = snapshot_bytes(LegacyChunkView, payload)
+        compact = snapshot_bytes(ChunkView, payload)
+        totals[0] += legacy
+        totals[1] += compact
+        print(f"{episode_id[:28]:<28} | {len(chunks):>6} | {legacy / 1024:>10.1f} | "
+              f"{compact / 1024:>11.1f} | {1 - compact / legacy:>5.0%}")
+    print("-" * 74)
+    print(f"{'total':<28} | {'':>6} | {totals[0] / 1024:>10.1f} | {totals[1] / 1024:>11.1f} | "
+          f"{1 - totals[1] / totals[0]:>5.0%}")
+
+
+if __name__ == "__main__":
+    main()
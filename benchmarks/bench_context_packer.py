@@ -0,0 +1,131 @@
+"""
+Benchmark: prompt context size before/after the context packer.
+
+Ingests the episode reports in data/ and ingest_rich.RICH_CONTENT through
+ingest_bundle_gpk (with a recording store in place of Chroma, so no embeddings
+are computed). The data/ reports predate the Kochi section markers the parser
+keys on, so "Top Papers Today:" is rewritten to the marked form; otherwise no
+paper chunks would be stored. The benchmark then ranks the
+chunks with the episode's BM25 index for every paper title plus a few generic
+questions, and compares, for the first-answer (CONTEXT_K) and critic-retry
+(RETRY_CONTEXT_K) contexts:
+
+- the legacy context: ranked chunks joined verbatim
+- the packed context: neighbours merged, duplicated report text dropped,
+  packed to the token budget
+
+Token counts use the same len // 4 estimate as metadata.tokens_in.
+
+Run from the repo root (importing ingest builds the embeddings client; no API
+calls are made, any key value works):
+    GOOGLE_API_KEY=... python benchmarks/bench_context_packer.py
+"""
+
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ingest
+import ingest_rich
+from agent import CONTEXT_K, RETRY_CONTEXT_K
+from context_packer import (CONTEXT_SEPARATOR, CONTEXT_TOKEN_BUDGET, RETRY_CONTEXT_TOKEN_BUDGET,
+                            estimate_tokens, pack_context)
+from episode_index import ChunkView, LexicalIndex
+
+GENERIC_QUESTIONS = [
+    "What is this episode about?",
+    "Summarize the main ideas of the episode",
+    "Which papers discuss video generation?",
+    "What are the key results on reasoning benchmarks?",
+]
+
+
+class RecordingStore:
+    """Stands in for Chroma during ingest and keeps what would have been stored."""
+
+    def __init__(self):
+        self.chunks = []
+        # ingest diffs against the stored chunks; this store starts empty, so
+        # every chunk is new and nothing is re-labelled or deleted
+        self._collection = self
+
+    def get(self, where=None, include=None):
+        return {"ids": [], "metadatas": []}
+
+    def add_texts(self, texts, metadatas=None, ids=None):
+        self.chunks.extend(ChunkView.create(i, t, m) for t, m, i in zip(texts, metadatas, ids))
+        return ids
+
+    def update(self, ids=None, metadatas=None):
+        pass
+
+    def delete(self, ids=None):
+        pass
+
+
+def with_kochi_markers(report_text):
+    if "🌟 Top Papers Today" not in report_text:
+        report_text = report_text.replace("Top Papers Today:", "🌟 Top Papers Today")
+    if "📊 Report Metadata" not in report_text:
+        report_text += "\n\n📊 Report Metadata\n"
+    return report_text
+
+
+def load_reports():
+    for path in sorted(glob.glob(os.path.join("data", "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            yield os.path.splitext(os.path.basename(path))[0], f.read()
+    yield "ingest_rich", ingest_rich.RICH_CONTENT
+
+
+def ingest_report(episode_id, report_text):
+    store = RecordingStore()
+    bundle = ingest.parse_daily_report_gpk(episode_id, with_kochi_markers(report_text))
+    original_store, original_fts = ingest.get_vector_store, ingest._index_fts
+    ingest.get_vector_store = lambda: store
+    ingest._index_fts = lambda *args: None  # keep benchmark chunks out of the app's FTS table
+    try:
+        ingest.ingest_bundle_gpk(bundle)
+    finally:
+        ingest.get_vector_store, ingest._index_fts = original_store, original_fts
+    return bundle, store.chunks
+
+
+def main():
+    rows = {"first answer": ([], [], []), "critic retry": ([], [], [])}
+    for episode_id, report_text in load_reports():
+        bundle, chunks = ingest_report(episode_id, report_text)
+        index = LexicalIndex(bundle.episode_id, 0, chunks)
+        questions = [f"Explain {paper.title}" for paper in bundle.papers] + GENERIC_QUESTIONS
+        print(f"{episode_id}: {len(chunks)} chunks, {len(bundle.papers)} papers, {len(questions)} questions")
+
+        for question in questions:
+            ranked = index.top_n(question, RETRY_CONTEXT_K)
+            for label, k, budget in (("first answer", CONTEXT_K, CONTEXT_TOKEN_BUDGET),
+                                     ("critic retry", RETRY_CONTEXT_K, RETRY_CONTEXT_TOKEN_BUDGET)):
+                legacy = CONTEXT_SEPARATOR.join(doc.page_content for doc in ranked[:k])
+                started = time.perf_counter()
+                packed = pack_context(ranked[:k], budget)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                before, after, timings = rows[label]
+                before.append(estimate_tokens(legacy))
+                after.append(packed.tokens)
+                timings.append(elapsed_ms)
+
+    print()
+    print(f"{'context':<13} | {'tokens before':>13} | {'tokens after':>12} | {'reduction':>9} | {'max after':>9} | {'pack ms':>7}")
+    print("-" * 78)
+    for label, (before, after, timings) in rows.items():
+        if not before:
+            continue
+        reduction = 1 - sum(after) / sum(before)
+        print(f"{label:<13} | {statistics.mean(before):>13.0f} | {statistics.mean(after):>12.0f} | "
+              f"{reduction:>8.0%} | {max(after):>9} | {statistics.mean(timings):>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
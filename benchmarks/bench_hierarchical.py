@@ -0,0 +1,88 @@
+"""
+Benchmark: coarse-to-fine (section centroids, then chunks) vs flat vector search.
+
+Builds synthetic long-transcript episodes of 300 / 1000 / 2000 / 5000 audio
+chunks (768 dims). Consecutive chunks share a topic: each window of
+SECTION_WINDOW chunks is a topic vector plus per-chunk noise, like a
+transcript that talks about one paper for a few minutes. Queries are a
+random chunk's vector plus noise. Reports per query:
+
+- flat VectorIndex.top_k over every chunk
+- SectionIndex.top_k (HIERARCHICAL_TOP_SECTIONS best sections, then chunks)
+- recall@k of the hierarchical result against the flat result
+- how often the chunk a query was drawn from is in the top k, for both
+
+Run from the repo root (importing episode_index loads ingest, which builds the
+embeddings client; no API calls are made, any key value works):
+    GOOGLE_API_KEY=... python benchmarks/bench_hierarchical.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from episode_index import HIERARCHICAL_TOP_SECTIONS, SECTION_WINDOW, ChunkView, VectorIndex
+
+DIM = 768
+K = 15  # CONTEXT_K * 3, the depth agent.py asks each retriever for
+QUERIES = 200
+SIZES = [300, 1000, 2000, 5000]
+CHUNK_NOISE = 0.8
+QUERY_NOISE = 3.0
+
+
+def _normalize(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _episode(rng, size):
+    topics = _normalize(rng.normal(size=(size // SECTION_WINDOW + 1, DIM)))
+    rows = np.arange(size) // SECTION_WINDOW
+    noise = rng.normal(size=(size, DIM)) * CHUNK_NOISE / np.sqrt(DIM)
+    matrix = _normalize(topics[rows] + noise).astype(np.float32)
+    docs = [
+        ChunkView.create(f"audio-{i}", f"chunk {i}",
+                         {"source_type": "audio", "section": "audio_transcript", "chunk_index": i})
+        for i in range(size)
+    ]
+    return VectorIndex(f"ep-{size}", 0, docs, matrix)
+
+
+def _timed(fn, repeat):
+    results = []
+    started = time.perf_counter()
+    for i in range(repeat):
+        results.append(fn(i))
+    return (time.perf_counter() - started) / repeat * 1000, results
+
+
+def main():
+    rng = np.random.default_rng(7)
+    print(f"{'chunks':>7} | {'sections':>8} | {'flat ms':>8} | {'c2f ms':>7} | {'speedup':>7} | "
+          f"{'recall@k':>8} | {'flat hit':>8} | {'c2f hit':>7}")
+    print("-" * 80)
+    for size in SIZES:
+        index = _episode(rng, size)
+        sections = index.sections  # built once per (episode, version), like the index itself
+        targets = rng.integers(0, size, QUERIES)
+        noise = rng.normal(size=(QUERIES, DIM)) * QUERY_NOISE / np.sqrt(DIM)
+        queries = _normalize(index.matrix[targets] + noise).astype(np.float32)
+
+        flat_ms, flat = _timed(lambda i: [doc.id for doc, _ in index.top_k(queries[i], K)], QUERIES)
+        c2f_ms, c2f = _timed(
+            lambda i: [doc.id for doc, _ in sections.top_k(queries[i], K, HIERARCHICAL_TOP_SECTIONS)], QUERIES
+        )
+
+        recall = np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(c2f, flat)])
+        flat_hit = np.mean([f"audio-{t}" in ids for t, ids in zip(targets, flat)])
+        c2f_hit = np.mean([f"audio-{t}" in ids for t, ids in zip(targets, c2f)])
+        print(f"{size:>7} | {len(sections):>8} | {flat_ms:>8.3f} | {c2f_ms:>7.3f} | "
+              f"{flat_ms / c2f_ms:>6.1f}x | {recall:>8.3f} | {flat_hit:>8.3f} | {c2f_hit:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
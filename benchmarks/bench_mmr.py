@@ -0,0 +1,92 @@
+"""
+Benchmark: paper coverage of the top-k context with and without MMR.
+
+Synthetic episodes mirror what ingest stores: each of 7 papers has its own
+section chunks plus near-identical copies inside the full report (cosine
+~0.97 to the paper chunk), and papers sit in the same research area
+(cosine ~0.4 between papers). Fused rankings are simulated by scoring every chunk
+against a query that touches 2-4 papers, plus rank noise, then keeping the
+top 30 (depth * 3, as agent.py does).
+
+Reports, for k = 3..6, the average number of distinct papers in the top-k
+of the plain fused ranking vs the MMR re-ranking, and the cost per
+diversify() call.
+
+Run from the repo root:
+    python benchmarks/bench_mmr.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from langchain_core.documents import Document
+
+from diversity import MMR_LAMBDA, diversify
+from episode_index import VectorIndex
+
+DIM = 768
+PAPERS = 7
+SECTION_CHUNKS = 2
+REPORT_COPIES = 2
+EPISODES = 200
+FUSED_DEPTH = 30
+
+
+def build_episode(rng):
+    domain = rng.normal(size=DIM)
+    docs, vectors = [], []
+    for p in range(PAPERS):
+        center = 0.8 * domain + rng.normal(size=DIM)
+        for c in range(SECTION_CHUNKS):
+            chunk = center + 0.3 * rng.normal(size=DIM)
+            docs.append(Document(id=f"p{p}-s{c}", page_content="", metadata={"paper_title": f"paper {p}"}))
+            vectors.append(chunk)
+            for r in range(REPORT_COPIES):
+                docs.append(Document(id=f"p{p}-s{c}-r{r}", page_content="", metadata={"paper_title": f"paper {p}"}))
+                vectors.append(chunk + 0.35 * rng.normal(size=DIM))
+    return docs, np.asarray(vectors, dtype=np.float32)
+
+
+def fused_ranking(rng, index):
+    topic_papers = rng.choice(PAPERS, size=rng.integers(2, 5), replace=False)
+    query = sum(index.matrix[index.row_of[f"p{p}-s0"]] for p in topic_papers)
+    scores = index.scores(query) + rng.normal(scale=0.05, size=len(index))
+    order = np.argsort(-scores)[:FUSED_DEPTH]
+    return [index.docs[i] for i in order]
+
+
+def papers(docs):
+    return len({doc.metadata["paper_title"] for doc in docs})
+
+
+def main():
+    rng = np.random.default_rng(11)
+    ks = [3, 4, 5, 6]
+    plain = {k: [] for k in ks}
+    mmr = {k: [] for k in ks}
+    timings = []
+    for _ in range(EPISODES):
+        docs, vectors = build_episode(rng)
+        index = VectorIndex("ep", 0, docs, vectors)
+        ranked = fused_ranking(rng, index)
+        started = time.perf_counter()
+        diverse = diversify(ranked, index, max(ks))
+        timings.append((time.perf_counter() - started) * 1000)
+        for k in ks:
+            plain[k].append(papers(ranked[:k]))
+            mmr[k].append(papers(diverse[:k]))
+
+    print(f"MMR lambda={MMR_LAMBDA}, {EPISODES} episodes, {FUSED_DEPTH} fused candidates each")
+    print(f"{'k':>3} | {'papers (fused)':>14} | {'papers (MMR)':>12}")
+    print("-" * 36)
+    for k in ks:
+        print(f"{k:>3} | {np.mean(plain[k]):>14.2f} | {np.mean(mmr[k]):>12.2f}")
+    print(f"\ndiversify() over {FUSED_DEPTH} candidates: {np.mean(timings):.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
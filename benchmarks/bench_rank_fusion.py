@@ -0,0 +1,104 @@
+"""
+Benchmark: legacy two-list RRF vs the N-way weighted fusion engine.
+
+Builds synthetic episodes whose chunks span report, audio and paper sections
+(so chunk_index values collide exactly as they do after ingest), fuses a
+shuffled "vector" and "BM25" ranking of them, and reports:
+
+- time per fusion call at growing candidate counts
+- how many distinct chunks survive fusion (legacy keyed on chunk_index
+  overwrites colliding chunks)
+- whether the fused order matches a brute-force reference keyed by true
+  chunk identity
+
+Run from the repo root:
+    python benchmarks/bench_rank_fusion.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+
+from rank_fusion import reciprocal_rank_fusion
+
+SECTIONS = [("report", 1), ("audio", 3), ("paper_section", 4)]
+
+
+def legacy_rrf(vector_results, bm25_results, k=60):
+    """Verbatim copy of the pre-fusion-module EpisodeCompanionAgent._reciprocal_rank_fusion."""
+    fused_scores = {}
+    for rank, (doc, _score) in enumerate(vector_results):
+        doc_id = doc.metadata.get("chunk_index") or doc.page_content[:50]
+        fused_scores.setdefault(doc_id, {"doc": doc, "score": 0.0})
+        rrf_score = 1 / (rank + k)
+        boost = doc.metadata.get("priority", 1) * 0.005
+        fused_scores[doc_id]["score"] += rrf_score + boost
+    for rank, doc in enumerate(bm25_results):
+        doc_id = doc.metadata.get("chunk_index") or doc.page_content[:50]
+        fused_scores.setdefault(doc_id, {"doc": doc, "score": 0.0})
+        rrf_score = 1 / (rank + k)
+        boost = doc.metadata.get("priority", 1) * 0.005
+        fused_scores[doc_id]["score"] += rrf_score + boost
+    reranked = sorted(fused_scores.values(), key=lambda x: x["score"], reverse=True)
+    return [item["doc"] for item in reranked]
+
+
+def reference_scores(ranked_lists, k=60):
+    """Brute-force RRF keyed by object identity (ground truth)."""
+    scores = {}
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked):
+            scores[id(doc)] = scores.get(id(doc), 0.0) + 1 / (rank + k) + doc.metadata.get("priority", 1) * 0.005
+    return scores
+
+
+def make_candidates(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    docs = []
+    per_section = max(1, n // len(SECTIONS))
+    for source_type, priority in SECTIONS:
+        for i in range(per_section):
+            docs.append(Document(
+                page_content=f"Shared boilerplate prefix for every chunk in this episode ... {source_type} {i} {rng.random()}",
+                metadata={"source_type": source_type, "priority": priority, "chunk_index": i,
+                          "chunk_id": f"{source_type}-{i}"},
+            ))
+    vector = docs[:]
+    bm25 = docs[:]
+    rng.shuffle(vector)
+    rng.shuffle(bm25)
+    return docs, vector, bm25
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+
+def main():
+    print(f"{'candidates':>10} | {'legacy ms':>10} | {'engine ms':>10} | {'legacy kept':>11} | {'engine kept':>11} | {'engine == reference':>19}")
+    print("-" * 86)
+    for n in (15, 30, 150, 1500, 15000):
+        docs, vector, bm25 = make_candidates(n)
+        repeats = max(3, 3000 // n)
+        legacy_ms, legacy_out = timed(lambda: legacy_rrf([(d, 1.0) for d in vector], bm25), repeats)
+        engine_ms, engine_out = timed(lambda: reciprocal_rank_fusion([vector, bm25]), repeats)
+
+        truth = reference_scores([vector, bm25])
+        engine_scores = [truth[id(d)] for d in engine_out]
+        matches_reference = (
+            len(engine_out) == len(docs)
+            and all(a >= b for a, b in zip(engine_scores, engine_scores[1:]))
+        )
+        print(f"{len(docs):>10} | {legacy_ms:>10.3f} | {engine_ms:>10.3f} | {len(legacy_out):>11} | {len(engine_out):>11} | {str(matches_reference):>19}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: in-process NumPy vector index vs Chroma filtered search.
+
+Builds synthetic episodes of 50 / 500 / 5000 chunks with random unit vectors
+(768 dims, the size of text-embedding-004), stores them in an in-memory Chroma
+collection next to other episodes, and reports per query:
+
+- Chroma `query` with a `where={"episode_id": ...}` filter (HNSW + filter)
+- VectorIndex.top_k (one matrix-vector product + argpartition)
+- the one-time cost of loading the episode's embedding matrix from Chroma
+- recall@k of Chroma's approximate search against the exact NumPy result
+
+Run from the repo root (importing episode_index loads ingest, which builds the
+embeddings client; no API calls are made, any key value works):
+    GOOGLE_API_KEY=... python benchmarks/bench_vector_index.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+import numpy as np
+from langchain_core.documents import Document
+
+from episode_index import VectorIndex
+
+DIM = 768
+K = 30  # RETRY_CONTEXT_K * 3, the depth agent.py asks each retriever for
+QUERIES = 50
+SIZES = [50, 500, 5000]
+OTHER_EPISODE_CHUNKS = 2000  # background episodes sharing the collection
+
+
+def _unit_vectors(rng, n):
+    vectors = rng.normal(size=(n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _add(collection, episode_id, vectors):
+    ids = [f"{episode_id}-{i}" for i in range(len(vectors))]
+    for start in range(0, len(ids), 1000):
+        collection.add(
+            ids=ids[start:start + 1000],
+            embeddings=vectors[start:start + 1000].tolist(),
+            documents=[f"chunk {i}" for i in range(start, min(start + 1000, len(ids)))],
+            metadatas=[{"episode_id": episode_id}] * len(ids[start:start + 1000]),
+        )
+    return ids
+
+
+def _timed(fn, repeat):
+    started = time.perf_counter()
+    for i in range(repeat):
+        result = fn(i)
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    rng = np.random.default_rng(7)
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection("bench_vector_index", metadata={"hnsw:space": "cosine"})
+    _add(collection, "background", _unit_vectors(rng, OTHER_EPISODE_CHUNKS))
+
+    print(f"{'chunks':>7} | {'chroma ms':>9} | {'numpy ms':>8} | {'load ms':>8} | {'speedup':>7} | {'chroma recall@k':>15}")
+    print("-" * 72)
+    for size in SIZES:
+        episode_id = f"ep-{size}"
+        _add(collection, episode_id, _unit_vectors(rng, size))
+        queries = _unit_vectors(rng, QUERIES)
+
+        def load(_i):
+            result = collection.get(where={"episode_id": episode_id}, include=["embeddings"])
+            docs = [Document(id=chunk_id, page_content="") for chunk_id in result["ids"]]
+            return VectorIndex(episode_id, 0, docs, np.asarray(result["embeddings"], dtype=np.float32))
+
+        load_ms, index = _timed(load, 3)
+
+        chroma_results = []
+
+        def chroma_query(i):
+            res = collection.query(
+                query_embeddings=[queries[i].tolist()],
+                n_results=min(K, size),
+                where={"episode_id": episode_id},
+                include=[],
+            )
+            chroma_results.append(res["ids"][0])
+
+        numpy_results = []
+
+        def numpy_query(i):
+            numpy_results.append([doc.id for doc, _ in index.top_k(queries[i], K)])
+
+        chroma_ms, _ = _timed(chroma_query, QUERIES)
+        numpy_ms, _ = _timed(numpy_query, QUERIES)
+
+        recall = np.mean([
+            len(set(approx) & set(exact)) / len(exact)
+            for approx, exact in zip(chroma_results, numpy_results)
+        ])
+        print(f"{size:>7} | {chroma_ms:>9.2f} | {numpy_ms:>8.3f} | {load_ms:>8.1f} | "
+              f"{chroma_ms / numpy_ms:>6.0f}x | {recall:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
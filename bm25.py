@@ -0,0 +1,116 @@
+"""
+Vectorized BM25 over a precomputed sparse term-document matrix.
+
+rank_bm25.BM25Okapi keeps one dict of term counts per document and scores a
+query with a Python loop over every document for every query token;
+get_top_n then sorts the whole corpus. SparseBM25 does the work once, at
+build time:
+
+- documents are tokenized (lowercased words, model names like "gpt-4o" and
+  "5.0" kept whole, stopwords dropped)
+- the term-document matrix is stored in CSR form by term: for term t,
+  `doc_ids[indptr[t]:indptr[t + 1]]` are the documents containing it
+- each posting stores its final BM25 weight, idf(t) * tf * (k1 + 1) /
+  (tf + k1 * norm(d)), with the document-length normalization
+  norm(d) = 1 - b + b * len(d) / avgdl already applied
+
+A query is then a concatenation of its terms' posting slices and one
+np.bincount; top-k is argpartition over the matching documents only. IDF is
+the same ATIRE variant with an epsilon floor as BM25Okapi, so scores agree
+with it on the same tokens. (SciPy is not a dependency; the CSR arrays are
+plain NumPy.)
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from followup import STOPWORDS
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[\-\.][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords."""
+    return [token for token in _TOKEN.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class SparseBM25:
+    """BM25 index over pre-tokenized documents."""
+
+    def __init__(self, corpus: Sequence[Sequence[str]], k1: float = 1.5, b: float = 0.75,
+                 epsilon: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.corpus_size = len(corpus)
+
+        self.vocabulary: Dict[str, int] = {}
+        term_ids, doc_ids, term_freqs = [], [], []
+        doc_len = np.zeros(self.corpus_size, dtype=np.float32)
+        for doc_id, tokens in enumerate(corpus):
+            doc_len[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                doc_ids.append(doc_id)
+                term_freqs.append(tf)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind="stable")
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)[order]
+        tf = np.asarray(term_freqs, dtype=np.float32)[order]
+        term_ids = term_ids[order]
+
+        df = np.bincount(term_ids, minlength=len(self.vocabulary)).astype(np.float32)
+        self.indptr = np.concatenate([[0], np.cumsum(df, dtype=np.int64)])
+        self.document_frequency = df
+
+        # ATIRE idf with a floor of epsilon * average idf for very common terms
+        idf = np.log(self.corpus_size - df + 0.5) - np.log(df + 0.5)
+        if len(idf):
+            idf[idf < 0] = epsilon * idf.mean()
+        self.idf = idf.astype(np.float32)
+
+        avgdl = doc_len.mean() if self.corpus_size else 0.0
+        self.doc_len_norm = 1 - b + b * doc_len / avgdl if avgdl else np.ones_like(doc_len)
+        self.weights = self.idf[term_ids] * tf * (k1 + 1) / (tf + k1 * self.doc_len_norm[self.doc_ids])
+
+    def __len__(self) -> int:
+        return self.corpus_size
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.vocabulary
+
+    def _postings(self, query: Iterable[str]):
+        slices = [
+            slice(self.indptr[t], self.indptr[t + 1])
+            for t in (self.vocabulary.get(term) for term in query) if t is not None
+        ]
+        if not slices:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        return (np.concatenate([self.doc_ids[s] for s in slices]),
+                np.concatenate([self.weights[s] for s in slices]))
+
+    def get_scores(self, query: Sequence[str]) -> np.ndarray:
+        """BM25 score of every document for the query tokens (repeats count)."""
+        doc_ids, weights = self._postings(query)
+        return np.bincount(doc_ids, weights=weights, minlength=self.corpus_size)
+
+    def top_k(self, query: Sequence[str], k: int, mask: np.ndarray = None) -> List[int]:
+        """Indices of the best `k` documents that match at least one query token.
+
+        `mask` (boolean, one per document) restricts the candidates.
+        """
+        doc_ids, weights = self._postings(query)
+        if not len(doc_ids) or k <= 0:
+            return []
+        scores = np.bincount(doc_ids, weights=weights, minlength=self.corpus_size)
+        matched = np.zeros(self.corpus_size, dtype=bool)
+        matched[doc_ids] = True
+        if mask is not None:
+            matched &= mask
+        candidates = np.flatnonzero(matched)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        return candidates[np.argsort(-scores[candidates], kind="stable")].tolist()
@@ -1,4 +1,5 @@
 import chromadb
+from collections import Counter
 from pathlib import Path
 
 # Connect to ChromaDB
@@ -12,21 +13,22 @@ print(f"Collections: {[c.name for c in collections]}")
 if collections:
     collection = client.get_collection("episode_scripts")
     
-    # Get all data
-    data = collection.get()
+    # Metadata only: documents and embeddings are not needed for counting
+    data = collection.get(include=["metadatas"])
     
     print(f"\nTotal documents: {collection.count()}")
     
-    if data and 'metadatas' in data:
-        # Get unique episode IDs
-        episode_ids = set()
-        for metadata in data['metadatas']:
-            if metadata and 'episode_id' in metadata:
-                episode_ids.add(metadata['episode_id'])
+    if data and data.get('metadatas'):
+        # Chunk count per episode ID
+        chunk_counts = Counter(
+            metadata['episode_id']
+            for metadata in data['metadatas']
+            if metadata and 'episode_id' in metadata
+        )
         
         print(f"\nEpisode IDs in ChromaDB:")
-        for eid in sorted(episode_ids):
-            print(f"  - {eid}")
+        for eid in sorted(chunk_counts):
+            print(f"  - {eid} ({chunk_counts[eid]} chunks)")
     else:
         print("No metadata found")
 else:
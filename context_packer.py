@@ -0,0 +1,204 @@
+"""
+Context assembly: turn ranked chunks into the prompt's context block.
+
+Joining the top-k chunks verbatim repeats a lot of text: report chunks overlap
+their neighbours by up to 200 characters, and every paper section is stored
+both inside the full report and on its own. pack_context:
+
+1. merges chunks that are chunk_index neighbours in the same section and
+   strips the overlapping text between them
+2. drops report text (whole blocks, else single lines) already covered by
+   the selected paper blocks
+3. packs the remaining blocks, best-ranked first, into a token budget
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+# Token budgets (len // 4 estimate, same as metadata.tokens_in)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+RETRY_CONTEXT_TOKEN_BUDGET = int(os.getenv("RETRY_CONTEXT_TOKEN_BUDGET", "3000"))
+
+# Overlap search window and minimum match when merging neighbours (characters)
+MAX_OVERLAP_CHARS = 400
+MIN_OVERLAP_CHARS = 20
+
+# A report block is a duplicate when this share of its word shingles appears in paper blocks
+DUPLICATE_COVERAGE = 0.8
+SHINGLE_SIZE = 5
+
+PAPER_SOURCE_TYPES = {"paper_section"}
+REPORT_SOURCE_TYPES = {"report"}
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def strip_overlap(left: str, right: str) -> str:
+    """Return `right` without the prefix it shares with the end of `left`.
+
+    The text splitter's overlap means the start of a chunk repeats the end of
+    its predecessor; anything shorter than MIN_OVERLAP_CHARS is left alone.
+    """
+    probe = right[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return right
+    start = max(0, len(left) - MAX_OVERLAP_CHARS)
+    idx = left.find(probe, start)
+    while idx != -1:
+        if right.startswith(left[idx:]):
+            return right[len(left) - idx:]
+        idx = left.find(probe, idx + 1)
+    return right
+
+
+@dataclass
+class ContextBlock:
+    """One or more adjacent chunks of a section, merged into a single passage."""
+    citation: str
+    text: str
+    rank: int
+    chunks: List = field(default_factory=list)
+
+    @property
+    def page_content(self) -> str:
+        return self.citation + self.text
+
+    @property
+    def source_type(self) -> str:
+        return self.chunks[0].metadata.get("source_type", "")
+
+
+@dataclass
+class PackedContext:
+    text: str
+    blocks: List[ContextBlock]
+    tokens: int
+    duplicates_dropped: int = 0
+    over_budget_dropped: int = 0
+
+    @property
+    def chunks(self) -> list:
+        """Every chunk that made it into the context, in block order."""
+        return [chunk for block in self.blocks for chunk in block.chunks]
+
+
+def _section_key(chunk) -> Tuple:
+    md = chunk.metadata
+    return (md.get("source_type"), md.get("section"), md.get("paper_title"))
+
+
+def _chunk_text(chunk) -> str:
+    # ChunkViews keep the raw text; plain Documents only have page_content
+    return getattr(chunk, "text", chunk.page_content)
+
+
+def _citation(chunk) -> str:
+    citation = getattr(chunk, "citation", None)
+    if citation is not None:
+        return citation
+    return chunk.page_content[: len(chunk.page_content) - len(_chunk_text(chunk))]
+
+
+def merge_neighbours(ranked: Sequence) -> List[ContextBlock]:
+    """Merge consecutive chunk_index runs of the same section into blocks.
+
+    Blocks are returned in ranking order (a block ranks as its best chunk).
+    """
+    groups: Dict[Tuple, List[Tuple[int, int, object]]] = {}
+    blocks: List[ContextBlock] = []
+    for rank, chunk in enumerate(ranked):
+        index = chunk.metadata.get("chunk_index")
+        if isinstance(index, int):
+            groups.setdefault(_section_key(chunk), []).append((index, rank, chunk))
+        else:
+            blocks.append(ContextBlock(_citation(chunk), _chunk_text(chunk), rank, [chunk]))
+
+    for members in groups.values():
+        members.sort(key=lambda m: m[0])
+        block = None
+        previous_index = None
+        for index, rank, chunk in members:
+            if block is not None and index == previous_index + 1:
+                block.text += strip_overlap(block.text, _chunk_text(chunk))
+                block.rank = min(block.rank, rank)
+                block.chunks.append(chunk)
+            else:
+                block = ContextBlock(_citation(chunk), _chunk_text(chunk), rank, [chunk])
+                blocks.append(block)
+            previous_index = index
+
+    blocks.sort(key=lambda b: b.rank)
+    return blocks
+
+
+def _shingles(text: str) -> set:
+    words = text.lower().split()
+    if len(words) < SHINGLE_SIZE:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def _covered(shingles: set, paper_shingles: set) -> bool:
+    return bool(shingles) and len(shingles & paper_shingles) / len(shingles) >= DUPLICATE_COVERAGE
+
+
+def drop_duplicate_report_blocks(blocks: List[ContextBlock]) -> Tuple[List[ContextBlock], int]:
+    """Remove report text that is already covered by selected paper blocks.
+
+    A report block that duplicates the papers as a whole is dropped. One that
+    spans several report sections keeps only its lines the papers do not cover.
+    Returns the kept blocks and the number of blocks dropped.
+    """
+    paper_shingles = set()
+    for block in blocks:
+        if block.source_type in PAPER_SOURCE_TYPES:
+            paper_shingles |= _shingles(block.text)
+    if not paper_shingles:
+        return blocks, 0
+
+    kept = []
+    for block in blocks:
+        if block.source_type in REPORT_SOURCE_TYPES:
+            if _covered(_shingles(block.text), paper_shingles):
+                continue
+            lines = [line for line in block.text.split("\n")
+                     if not _covered(_shingles(line), paper_shingles)]
+            block.text = "\n".join(lines).strip()
+            if not block.text:
+                continue
+        kept.append(block)
+    return kept, len(blocks) - len(kept)
+
+
+def pack_context(ranked: Sequence, token_budget: int = CONTEXT_TOKEN_BUDGET) -> PackedContext:
+    """Build the context text for the ranked chunks within `token_budget`.
+
+    Blocks are added best-ranked first; one that does not fit is skipped so a
+    smaller, lower-ranked block can still use the remaining budget. The best
+    block is always kept, even if it alone exceeds the budget.
+    """
+    blocks, duplicates = drop_duplicate_report_blocks(merge_neighbours(ranked))
+
+    packed: List[ContextBlock] = []
+    used = 0
+    separator_tokens = estimate_tokens(CONTEXT_SEPARATOR)
+    for block in blocks:
+        cost = estimate_tokens(block.page_content) + (separator_tokens if packed else 0)
+        if packed and used + cost > token_budget:
+            continue
+        packed.append(block)
+        used += cost
+
+    text = CONTEXT_SEPARATOR.join(block.page_content for block in packed)
+    return PackedContext(
+        text=text,
+        blocks=packed,
+        tokens=estimate_tokens(text),
+        duplicates_dropped=duplicates,
+        over_budget_dropped=len(blocks) - len(packed),
+    )
@@ -119,6 +119,22 @@ class ConversationManager:
         
         return context
 
+    def get_last_retrieval(self, user_id: str, episode_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Chunks retrieved for the previous turn of this user's episode conversation.
+        Returns {"chunk_ids": [...], "query": str} or None if there is nothing to reuse.
+        """
+        conv = self.conv_repo.find_by_user_and_episode(user_id, episode_id)
+        if not conv:
+            return None
+
+        msg = self.msg_repo.get_last_assistant_message(conv.id)
+        meta = (msg.meta_data or {}) if msg else {}
+        chunk_ids = meta.get("retrieved_chunk_ids")
+        if not chunk_ids:
+            return None
+        return {"chunk_ids": list(chunk_ids), "query": meta.get("retrieval_query") or ""}
+
     def submit_feedback(
         self,
         message_id: int,
@@ -0,0 +1,71 @@
+"""
+Maximal marginal relevance (MMR) re-ranking of fused retrieval results.
+
+The report stores every paper section twice (inside the full report and on
+its own), and overlapping neighbours are near-identical, so the top of the
+fused ranking often spends several slots on the same paper. MMR picks each
+next chunk by trading its relevance against its highest cosine similarity to
+the chunks already picked:
+
+    score = lambda * relevance - (1 - lambda) * max_sim_to_selected
+
+Relevance is derived from the fused rank (no second query embedding, and it
+works on retrieval-cache hits); similarities come from the episode's cached
+embedding matrix (episode_index.VectorIndex). Each greedy step is a single
+vectorized update over all candidates.
+"""
+
+import os
+from typing import List, Sequence
+
+import numpy as np
+
+from rank_fusion import chunk_key
+
+# 0.5 is LangChain's max_marginal_relevance_search default; 1.0 disables MMR
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.5"))
+
+
+def mmr_order(relevance: np.ndarray, embeddings: np.ndarray, k: int,
+              lambda_mult: float = MMR_LAMBDA) -> List[int]:
+    """Greedy MMR selection; returns up to `k` candidate positions in pick order.
+
+    `embeddings` rows must be L2-normalized (zero rows mean "unknown" and are
+    treated as dissimilar to everything).
+    """
+    m = len(relevance)
+    k = min(k, m)
+    if k <= 0:
+        return []
+
+    similarity = embeddings @ embeddings.T
+    max_sim = np.full(m, -np.inf, dtype=np.float32)
+    available = np.ones(m, dtype=bool)
+    picked: List[int] = []
+    for _ in range(k):
+        redundancy = np.where(np.isinf(max_sim), 0.0, max_sim)
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        max_sim = np.maximum(max_sim, similarity[best])
+    return picked
+
+
+def diversify(ranked: Sequence, vector_index, k: int, lambda_mult: float = MMR_LAMBDA) -> list:
+    """Re-rank fused results with MMR over the episode's cached embeddings.
+
+    The first pick is always the top fused chunk. Without a vector index (large
+    episodes searched on Chroma) the top `k` of the fused ranking are returned
+    unchanged.
+    """
+    ranked = list(ranked)
+    if vector_index is None or lambda_mult >= 1.0 or len(ranked) <= 1:
+        return ranked[:k]
+
+    m = len(ranked)
+    # Linear in fused rank: 1.0 for the best candidate down to 1/m for the last
+    relevance = (m - np.arange(m, dtype=np.float32)) / m
+    embeddings = vector_index.embeddings_for([chunk_key(doc) for doc in ranked])
+    return [ranked[i] for i in mmr_order(relevance, embeddings, k, lambda_mult)]
@@ -0,0 +1,154 @@
+"""
+Query embedding cache.
+
+Every vector search embeds the question with a network call to the embedding
+API, even when the same question (a suggested follow-up, a retry, another
+listener) was embedded a minute ago. CachedEmbeddings wraps the embedding
+function handed to Chroma and answers embed_query from two tiers:
+
+- an in-process LRU of recent query vectors
+- a SQLite file shared by every worker on the host (EMBEDDING_CACHE_PATH),
+  which also survives restarts; hits there are promoted to the LRU
+
+Keys are (embedding model, whitespace-normalized text), so switching models
+never serves a stale vector. Document embeddings at ingest pass through
+uncached: chunk texts are embedded once per ingest.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE = os.getenv("EMBEDDING_CACHE", "true").lower() == "true"
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.db")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+class EmbeddingStore:
+    """On-disk tier: float32 vectors in SQLite, keyed by model and text hash."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=15)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, text_hash))"
+            )
+
+    def get(self, model: str, text_hash: str) -> Optional[List[float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM query_embeddings WHERE model = ? AND text_hash = ?", (model, text_hash)
+            ).fetchone()
+        return None if row is None else np.frombuffer(row[0], dtype=np.float32).tolist()
+
+    def put(self, model: str, text_hash: str, vector: List[float]) -> None:
+        blob = np.asarray(vector, dtype=np.float32).tobytes()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                (model, text_hash, blob),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves repeated queries without a network call.
+
+    `hits` counts LRU hits, `disk_hits` SQLite hits and `misses` calls to the
+    wrapped embeddings. A failing disk tier is logged and skipped, never
+    raised: the cache must not take vector search down with it.
+    """
+
+    def __init__(self, embeddings: Embeddings, model: str, path: Optional[str] = EMBEDDING_CACHE_PATH,
+                 maxsize: int = EMBEDDING_CACHE_SIZE):
+        self.embeddings = embeddings
+        self.model = model
+        self._memory = LRUCache(maxsize=maxsize)
+        self._disk = None
+        if path:
+            try:
+                self._disk = EmbeddingStore(path)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache unavailable at {path}, using memory only: {e}")
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def embed_query(self, text: str) -> List[float]:
+        normalized = normalize_text(text)
+        text_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        key = (self.model, text_hash)
+
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._count("hits")
+            return list(vector)
+
+        if self._disk is not None:
+            try:
+                vector = self._disk.get(self.model, text_hash)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache read failed: {e}")
+            if vector is not None:
+                self._count("disk_hits")
+                self._memory.put(key, tuple(vector))
+                return vector
+
+        self._count("misses")
+        vector = self.embeddings.embed_query(normalized)
+        self._memory.put(key, tuple(vector))
+        if self._disk is not None:
+            try:
+                self._disk.put(self.model, text_hash, vector)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache write failed: {e}")
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+
+def cached_embeddings(embeddings: Embeddings, model: str) -> Embeddings:
+    """Wrap `embeddings` in the query cache unless EMBEDDING_CACHE is off."""
+    return CachedEmbeddings(embeddings, model) if EMBEDDING_CACHE else embeddings
@@ -0,0 +1,129 @@
+"""
+Batched, concurrent, retrying writes of new chunks to the vector store.
+
+Handing every chunk of a large backfill to one add_texts call means one
+embedding request stream with no retry: a single rate-limit or 5xx response
+loses the whole ingest. add_in_batches splits the chunks into
+EMBED_BATCH_SIZE batches and writes up to EMBED_CONCURRENCY of them at once,
+each retried with exponential backoff and jitter (tenacity). Only transient
+failures (429, 5xx, timeouts) are retried; a bad API key or an invalid
+request fails the batch on the first attempt. Chunk IDs are
+content hashes (see ingest.make_chunk_id), so retrying a batch is an
+idempotent upsert, and if a batch still fails, re-running the ingest only
+embeds the chunks that never made it in.
+
+Progress is logged per batch and can be reported to a callback.
+"""
+
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from tenacity import (Retrying, before_sleep_log, retry_if_exception, stop_after_attempt,
+                      wait_random_exponential)
+
+logger = logging.getLogger(__name__)
+
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_MAX_ATTEMPTS = int(os.getenv("EMBED_MAX_ATTEMPTS", "6"))
+# Backoff between attempts: random exponential, capped at this many seconds
+EMBED_RETRY_MAX_WAIT_S = float(os.getenv("EMBED_RETRY_MAX_WAIT_S", "30"))
+
+# HTTP statuses worth retrying; anything else (400, 401, 403, 404, ...) is permanent
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Wrapped client errors often only keep the status in their message
+_TRANSIENT_MESSAGE = re.compile(
+    r"\b(?:408|429|50[0-4])\b|resource.?exhausted|rate.?limit|unavailable|deadline.?exceeded|timed?.?out",
+    re.I,
+)
+
+T = TypeVar("T")
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """True for rate limits, server errors and timeouts, which a retry can fix."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # google.api_core errors carry the HTTP status as `code`, HTTP clients as `status_code`
+    status = getattr(error, "code", None)
+    if not isinstance(status, int):
+        status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in TRANSIENT_STATUS_CODES
+    return bool(_TRANSIENT_MESSAGE.search(str(error)))
+
+
+@dataclass
+class BatchProgress:
+    """Reported after every finished batch."""
+    batches_done: int
+    batches_total: int
+    chunks_done: int
+    chunks_total: int
+    elapsed_s: float
+
+
+def _batches(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def add_in_batches(items: Sequence[T], add_batch: Callable[[Sequence[T]], Optional[List[str]]],
+                   batch_size: int = EMBED_BATCH_SIZE, concurrency: int = EMBED_CONCURRENCY,
+                   max_attempts: int = EMBED_MAX_ATTEMPTS, max_wait_s: float = EMBED_RETRY_MAX_WAIT_S,
+                   progress: Optional[Callable[[BatchProgress], None]] = None) -> List[str]:
+    """Write `items` through `add_batch`, batched, concurrently and with retries.
+
+    Args:
+        items: Whatever `add_batch` takes (indices, Documents, ...).
+        add_batch: Embeds and stores one batch, returning its stored IDs.
+            Must be idempotent (upsert by deterministic ID).
+        progress: Called after each batch completes, from the calling thread.
+
+    Returns the stored IDs in input order. Re-raises the error of a batch that
+    failed permanently or on every attempt, after the other batches have
+    finished.
+    """
+    batches = _batches(items, max(1, batch_size))
+    if not batches:
+        return []
+
+    def run(batch):
+        for attempt in Retrying(
+            retry=retry_if_exception(is_transient_error),
+            stop=stop_after_attempt(max_attempts),
+            wait=wait_random_exponential(multiplier=0.5, max=max_wait_s),
+            before_sleep=before_sleep_log(logger, logging.WARNING),
+            reraise=True,
+        ):
+            with attempt:
+                return add_batch(batch) or []
+
+    started = time.perf_counter()
+    results: List[Optional[List[str]]] = [None] * len(batches)
+    errors = []
+    chunks_done = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches))),
+                            thread_name_prefix="embed") as pool:
+        futures = {pool.submit(run, batch): i for i, batch in enumerate(batches)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                logger.error(f"Embedding batch {i + 1}/{len(batches)} failed: {e}")
+                errors.append(e)
+                continue
+            chunks_done += len(batches[i])
+            report = BatchProgress(done, len(batches), chunks_done, len(items), time.perf_counter() - started)
+            logger.info(f"Embedded batch {done}/{len(batches)} ({chunks_done}/{len(items)} chunks, "
+                        f"{report.elapsed_s:.1f}s)")
+            if progress is not None:
+                progress(report)
+    if errors:
+        raise errors[0]
+    return [chunk_id for ids in results for chunk_id in ids]
@@ -0,0 +1,541 @@
+"""
+Per-episode retrieval indexes, cached in-process.
+
+Rebuilding a BM25 index on every question (and again on the critic retry)
+dominated the retrieval stage. Episode chunk snapshots and the indexes built
+on them are now loaded once per (episode_id, ingest version) on first use and
+kept in LRUs:
+
+- EpisodeSnapshot: every chunk of the episode (metadata-filtered get), as
+  read-only ChunkViews that caches and concurrent requests can share, plus
+  the interval index of its timestamped chunks (see time_index)
+- LexicalIndex: BM25 over the snapshot
+- TermIndex: entities and guarded terms mentioned in the episode (see
+  term_index); normally built at ingest, rebuilt here in other workers
+- VectorIndex: the episode's embedding matrix, for exact in-process top-k on
+  small corpora (large ones stay on Chroma's HNSW search). Episodes with
+  hundreds of chunks (long audio transcripts) are searched coarse-to-fine:
+  section centroids first, then only the chunks of the best sections
+
+schedule_warmup loads all of them in the background when a conversation is
+opened or resumed, so the first question does not pay the cold start.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from bm25 import SparseBM25, tokenize
+from cache import LRUCache
+from ingest import citation_header
+from ingest_versions import get_ingest_version
+from rank_fusion import chunk_key
+from term_index import TermIndex, build_term_index, cached_term_index, clear_term_indexes, remember_term_index
+from time_index import TimeIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_CACHE_SIZE = int(os.getenv("SNAPSHOT_CACHE_SIZE", "64"))
+LEXICAL_INDEX_CACHE_SIZE = int(os.getenv("LEXICAL_INDEX_CACHE_SIZE", "64"))
+VECTOR_INDEX_CACHE_SIZE = int(os.getenv("VECTOR_INDEX_CACHE_SIZE", "64"))
+# In-process vector search is used for episodes up to this many chunks
+NUMPY_VECTOR_INDEX = os.getenv("NUMPY_VECTOR_INDEX", "true").lower() == "true"
+NUMPY_INDEX_MAX_CHUNKS = int(os.getenv("NUMPY_INDEX_MAX_CHUNKS", "2000"))
+# Coarse-to-fine search kicks in at this many chunks; report and audio chunks
+# are grouped into sections of SECTION_WINDOW consecutive chunks, papers are
+# one section each, and chunks are searched in the best HIERARCHICAL_TOP_SECTIONS
+HIERARCHICAL_MIN_CHUNKS = int(os.getenv("HIERARCHICAL_MIN_CHUNKS", "300"))
+HIERARCHICAL_TOP_SECTIONS = int(os.getenv("HIERARCHICAL_TOP_SECTIONS", "6"))
+SECTION_WINDOW = int(os.getenv("SECTION_WINDOW", "8"))
+
+# Background warm-up when a conversation is opened or resumed
+EPISODE_WARMUP = os.getenv("EPISODE_WARMUP", "true").lower() == "true"
+WARMUP_POOL_SIZE = int(os.getenv("WARMUP_POOL_SIZE", "2"))
+
+
+# Metadata values repeated across an episode's chunks; interned so every chunk
+# of a paper shares one string object for each
+_INTERNED_METADATA = ("episode_id", "paper_title", "source_type", "section", "citation")
+
+
+class ChunkView:
+    """Read-only view of a stored chunk, as returned by retrieval.
+
+    Quacks like a LangChain Document (`id`, `page_content`, `metadata`), but
+    cannot be modified, so one instance is shared by the snapshot, the indexes,
+    the retrieval cache and every request. `text` is the raw chunk text, the
+    only copy of it kept in memory; `citation` is the header prepended to it in
+    the LLM context (computed at ingest, see ingest.citation_header), interned
+    and shared by every chunk of the same paper. `page_content` joins the two
+    on access, so only Documents handed to LangChain pay for the copy.
+    """
+    __slots__ = ("id", "text", "citation", "metadata")
+
+    id: Optional[str]
+    text: str
+    citation: str
+    metadata: Mapping[str, Any]
+
+    def __init__(self, id: Optional[str], text: str, citation: str, metadata: Mapping[str, Any]):
+        for name, value in zip(self.__slots__, (id, text, citation, metadata)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ChunkView is read-only (cannot set {name!r})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"ChunkView is read-only (cannot delete {name!r})")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ChunkView):
+            return NotImplemented
+        return (self.id, self.text, self.citation, self.metadata) == (other.id, other.text, other.citation, other.metadata)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ChunkView(id={self.id!r}, text={self.text[:40]!r}, metadata={dict(self.metadata)!r})"
+
+    @classmethod
+    def create(cls, chunk_id: Optional[str], text: str, metadata: Optional[Dict[str, Any]]) -> "ChunkView":
+        metadata = dict(metadata or {})
+        for key in _INTERNED_METADATA:
+            if isinstance(metadata.get(key), str):
+                metadata[key] = sys.intern(metadata[key])
+        text = text or ""
+        # Chunks ingested before headers were stored get one computed here, once
+        header = metadata.get("citation") or citation_header(metadata.get("paper_title"))
+        title_tag = header.partition(" (source)")[0]
+        citation = "" if text.lstrip().startswith(title_tag) else sys.intern(header)
+        return cls(id=chunk_id, text=text, citation=citation, metadata=MappingProxyType(metadata))
+
+    @classmethod
+    def from_document(cls, doc: Document) -> "ChunkView":
+        return cls.create(doc.id, doc.page_content, doc.metadata)
+
+    @property
+    def page_content(self) -> str:
+        return self.citation + self.text
+
+    def to_document(self) -> Document:
+        """Mutable copy for LangChain APIs that need a real Document."""
+        return Document(page_content=self.page_content, metadata=dict(self.metadata), id=self.id)
+
+
+def _chunk_index(doc: ChunkView) -> int:
+    index = doc.metadata.get("chunk_index")
+    return index if isinstance(index, int) else 0
+
+
+def _overview_chunks(docs: List[ChunkView], by_paper: Dict[str, List[ChunkView]]) -> List[ChunkView]:
+    """Chunks that together summarize the episode, most useful first.
+
+    The report opening (hook, executive summary), the audio summary, the first
+    section of every paper, then the rest of the report. Episodes ingested as
+    plain text keep their chunk order.
+    """
+    def of_type(source_type):
+        return sorted((d for d in docs if d.metadata.get("source_type") == source_type), key=_chunk_index)
+
+    report = of_type("report")
+    if not report and not by_paper:
+        return sorted(docs, key=_chunk_index)
+    overview = report[:1] + of_type("audio")[:2] + [chunks[0] for chunks in by_paper.values()] + report[1:]
+    return overview
+
+
+@dataclass
+class EpisodeSnapshot:
+    """All chunks stored for one episode at a given ingest version.
+
+    `by_id` maps each chunk's stable key (see rank_fusion.chunk_key) to its view,
+    `by_paper` maps each paper title to its section chunks in chunk_index order,
+    `overview` is the precomputed chunk set used for episode-wide summaries, and
+    `time_index` holds the timestamped chunks for time-anchored questions.
+    """
+    episode_id: str
+    version: int
+    docs: List[ChunkView]
+    by_id: Dict[str, ChunkView] = field(init=False, repr=False)
+    by_paper: Dict[str, List[ChunkView]] = field(init=False, repr=False)
+    overview: List[ChunkView] = field(init=False, repr=False)
+    time_index: TimeIndex = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.by_id = {chunk_key(doc): doc for doc in self.docs}
+        self.by_paper = {}
+        for doc in self.docs:
+            if doc.metadata.get("source_type") == "paper_section":
+                self.by_paper.setdefault(doc.metadata.get("paper_title"), []).append(doc)
+        for chunks in self.by_paper.values():
+            chunks.sort(key=_chunk_index)
+        self.overview = _overview_chunks(self.docs, self.by_paper)
+        self.time_index = TimeIndex(self.docs)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+
+class LexicalIndex:
+    """BM25 index over all chunks of one episode.
+
+    The sparse BM25 matrix (see bm25.SparseBM25) holds precomputed per-posting
+    weights, so a query only pays for summing its terms' postings.
+    """
+
+    def __init__(self, episode_id: str, version: int, docs: List[ChunkView]):
+        self.episode_id = episode_id
+        self.version = version
+        self.docs = docs
+        self._bm25 = SparseBM25([tokenize(doc.text) for doc in docs])
+
+    def top_n(self, query: str, n: int) -> List[ChunkView]:
+        """Return up to `n` best-scoring chunks that share a term with `query`."""
+        return [self.docs[i] for i in self._bm25.top_k(tokenize(query), n)]
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+
+class VectorIndex:
+    """Row-normalized embedding matrix for one episode.
+
+    Top-k is one matrix-vector product plus argpartition, i.e. exact cosine
+    similarity with no network or HNSW traversal. Rows are aligned with `docs`.
+    """
+
+    def __init__(self, episode_id: str, version: int, docs: List[ChunkView], matrix: np.ndarray):
+        self.episode_id = episode_id
+        self.version = version
+        self.docs = docs
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = (matrix / norms).astype(np.float32)
+        self.row_of = {chunk_key(doc): row for row, doc in enumerate(docs)}
+
+    def search(self, query_vector, k: int, keys: Optional[List[str]] = None) -> List[tuple[ChunkView, float]]:
+        """Top-k for a query: scoped to `keys` if given, coarse-to-fine for large episodes."""
+        if keys is None and len(self.docs) >= HIERARCHICAL_MIN_CHUNKS:
+            return self.sections.top_k(query_vector, k, HIERARCHICAL_TOP_SECTIONS)
+        return self.top_k(query_vector, k, keys=keys)
+
+    @cached_property
+    def sections(self) -> "SectionIndex":
+        return SectionIndex(self)
+
+    def embeddings_for(self, keys: List[str]) -> np.ndarray:
+        """Normalized embeddings for the given chunk keys (zero rows for unknown keys)."""
+        rows = np.zeros((len(keys), self.matrix.shape[1]), dtype=np.float32)
+        for i, key in enumerate(keys):
+            row = self.row_of.get(key)
+            if row is not None:
+                rows[i] = self.matrix[row]
+        return rows
+
+    def scores(self, query_vector) -> np.ndarray:
+        """Cosine similarity of the query against every chunk."""
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        return self.matrix @ query
+
+    def top_k(self, query_vector, k: int, keys: Optional[List[str]] = None) -> List[tuple[ChunkView, float]]:
+        """The `k` most similar chunks, best first, with their cosine scores.
+
+        With `keys`, only those chunks (see rank_fusion.chunk_key) are ranked.
+        """
+        if keys is None:
+            rows = np.arange(len(self.docs))
+            scores = self.scores(query_vector)
+        else:
+            rows = np.asarray([self.row_of[key] for key in keys if key in self.row_of], dtype=np.intp)
+            scores = self.scores(query_vector)[rows] if len(rows) else np.zeros(0, dtype=np.float32)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.docs[rows[i]], float(scores[i])) for i in top]
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+
+def section_key(doc: ChunkView) -> tuple:
+    """The section a chunk belongs to for coarse-to-fine search."""
+    md = doc.metadata
+    source_type = md.get("source_type")
+    if source_type in ("paper_section", "paper_stub"):
+        return (source_type, md.get("paper_title"))
+    return (source_type, md.get("section"), _chunk_index(doc) // SECTION_WINDOW)
+
+
+class SectionIndex:
+    """Two-level index over a VectorIndex: section centroids, then chunks.
+
+    A section's vector is the normalized mean of its chunk embeddings, so no
+    extra embedding calls are needed. A query scores every centroid, keeps the
+    best sections (more if they hold fewer than k chunks) and ranks only the
+    chunks inside them.
+    """
+
+    def __init__(self, vector_index: VectorIndex):
+        self.vector_index = vector_index
+        keys = [section_key(doc) for doc in vector_index.docs]
+        ids = {key: i for i, key in enumerate(dict.fromkeys(keys))}
+        section_of_row = np.fromiter((ids[key] for key in keys), dtype=np.intp, count=len(keys))
+
+        centroids = np.zeros((len(ids), vector_index.matrix.shape[1]), dtype=np.float32)
+        np.add.at(centroids, section_of_row, vector_index.matrix)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.centroids = centroids / norms
+
+        order = np.argsort(section_of_row, kind="stable")
+        bounds = np.searchsorted(section_of_row[order], np.arange(len(ids) + 1))
+        self.rows_by_section = [order[bounds[i]:bounds[i + 1]] for i in range(len(ids))]
+
+    def __len__(self) -> int:
+        return len(self.rows_by_section)
+
+    def top_k(self, query_vector, k: int, top_sections: int) -> List[tuple[ChunkView, float]]:
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        section_scores = self.centroids @ query
+        ranked_sections = np.argsort(-section_scores)
+        chosen, n_rows = [], 0
+        for section in ranked_sections:
+            if len(chosen) >= top_sections and n_rows >= k:
+                break
+            chosen.append(self.rows_by_section[section])
+            n_rows += len(chosen[-1])
+
+        rows = np.concatenate(chosen)
+        scores = self.vector_index.matrix[rows] @ query
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        docs = self.vector_index.docs
+        return [(docs[rows[i]], float(scores[i])) for i in top]
+
+
+_snapshots = LRUCache(maxsize=SNAPSHOT_CACHE_SIZE)
+_lexical_indexes = LRUCache(maxsize=LEXICAL_INDEX_CACHE_SIZE)
+_vector_indexes = LRUCache(maxsize=VECTOR_INDEX_CACHE_SIZE)
+
+
+def get_episode_chunks(vector_store, episode_id: str) -> EpisodeSnapshot:
+    """Return every chunk of an episode without embedding a query.
+
+    Uses a metadata-filtered `get` on the collection, so the result holds the
+    real chunk count rather than a top-k cutoff. Snapshots are cached per
+    ingest version; empty snapshots are not cached, so an episode ingested by
+    another worker is picked up on the next call.
+    """
+    key = (episode_id, get_ingest_version(episode_id))
+    snapshot = _snapshots.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    result = vector_store.get(
+        where={"episode_id": episode_id},
+        include=["documents", "metadatas"],
+    )
+    docs = [
+        ChunkView.create(chunk_id, text, metadata)
+        for chunk_id, text, metadata in zip(
+            result.get("ids") or [],
+            result.get("documents") or [],
+            result.get("metadatas") or [],
+        )
+    ]
+    snapshot = EpisodeSnapshot(episode_id=episode_id, version=key[1], docs=docs)
+    if docs:
+        _snapshots.put(key, snapshot)
+        logger.info(f"Loaded snapshot for episode {episode_id} (v{key[1]}, {len(docs)} chunks)")
+    return snapshot
+
+
+def get_episode_chunk_counts(vector_store) -> Dict[str, int]:
+    """Chunk count per episode, reading metadata only (no documents or vectors)."""
+    result = vector_store.get(include=["metadatas"])
+    counts = Counter(
+        metadata["episode_id"]
+        for metadata in result.get("metadatas") or []
+        if metadata and "episode_id" in metadata
+    )
+    return dict(counts)
+
+
+def get_lexical_index(vector_store, episode_id: str, paper_title: Optional[str] = None) -> LexicalIndex | None:
+    """Return the cached lexical index for an episode, building it on first use.
+
+    With `paper_title`, the index covers only that paper's section chunks.
+    Returns None when there are no chunks to index.
+    """
+    snapshot = get_episode_chunks(vector_store, episode_id)
+    docs = snapshot.docs if paper_title is None else snapshot.by_paper.get(paper_title, [])
+    if not docs:
+        return None
+
+    key = (episode_id, snapshot.version, paper_title)
+    index = _lexical_indexes.get(key)
+    if index is not None:
+        return index
+
+    index = LexicalIndex(episode_id, snapshot.version, docs)
+    _lexical_indexes.put(key, index)
+    scope = f"paper '{paper_title}' of episode" if paper_title else "episode"
+    logger.info(f"Built lexical index for {scope} {episode_id} (v{snapshot.version}, {len(index)} chunks)")
+    return index
+
+
+def get_vector_index(vector_store, episode_id: str) -> VectorIndex | None:
+    """Return the cached in-process vector index for an episode.
+
+    The embedding matrix is read from Chroma once per ingest version. Returns
+    None (callers fall back to Chroma) when the feature is disabled, the
+    episode is empty, or it has more than NUMPY_INDEX_MAX_CHUNKS chunks.
+    """
+    if not NUMPY_VECTOR_INDEX:
+        return None
+    snapshot = get_episode_chunks(vector_store, episode_id)
+    if not snapshot.docs or len(snapshot) > NUMPY_INDEX_MAX_CHUNKS:
+        return None
+
+    key = (episode_id, snapshot.version)
+    index = _vector_indexes.get(key)
+    if index is not None:
+        return index
+
+    result = vector_store.get(
+        ids=[doc.id for doc in snapshot.docs],
+        include=["embeddings"],
+    )
+    embeddings_by_id = dict(zip(result.get("ids") or [], result.get("embeddings")
+                                if result.get("embeddings") is not None else []))
+    docs = [doc for doc in snapshot.docs if doc.id in embeddings_by_id]
+    if not docs:
+        return None
+    matrix = np.asarray([embeddings_by_id[doc.id] for doc in docs], dtype=np.float32)
+
+    index = VectorIndex(episode_id, snapshot.version, docs, matrix)
+    _vector_indexes.put(key, index)
+    logger.info(f"Built vector index for episode {episode_id} (v{snapshot.version}, {len(index)} chunks)")
+    return index
+
+
+def get_term_index(vector_store, episode_id: str) -> TermIndex:
+    """Return the episode's term index, building it from the snapshot if this
+    worker did not ingest the episode. An episode with no chunks gets an empty
+    (uncached) index, so every guarded term counts as missing.
+    """
+    index = cached_term_index(episode_id, get_ingest_version(episode_id))
+    if index is not None:
+        return index
+
+    snapshot = get_episode_chunks(vector_store, episode_id)
+    if not snapshot.docs:
+        return TermIndex(episode_id, snapshot.version, ())
+    index = build_term_index(
+        episode_id,
+        snapshot.version,
+        (doc.text for doc in snapshot.docs),
+        {doc.metadata.get("paper_title") for doc in snapshot.docs},
+    )
+    remember_term_index(index)
+    logger.info(f"Built term index for episode {episode_id} (v{snapshot.version}, {len(index)} terms)")
+    return index
+
+
+def warm_episode(vector_store, episode_id: str) -> dict:
+    """Load an episode's snapshot and every index built on it into the caches.
+
+    Already-cached pieces are cache hits, so warming a warm episode is cheap.
+    """
+    started = time.time()
+    snapshot = get_episode_chunks(vector_store, episode_id)
+    if not snapshot.docs:
+        return {"episode_id": episode_id, "chunks": 0, "vector_index": False, "warmup_ms": 0.0}
+
+    get_term_index(vector_store, episode_id)
+    get_lexical_index(vector_store, episode_id)
+    vector_index = get_vector_index(vector_store, episode_id)
+    if vector_index is not None and len(vector_index) >= HIERARCHICAL_MIN_CHUNKS:
+        vector_index.sections  # cached_property: builds the section centroids
+
+    warmup_ms = (time.time() - started) * 1000
+    logger.info(f"Warmed episode {episode_id} (v{snapshot.version}, {len(snapshot)} chunks) in {warmup_ms:.2f}ms")
+    return {
+        "episode_id": episode_id,
+        "chunks": len(snapshot),
+        "vector_index": vector_index is not None,
+        "warmup_ms": round(warmup_ms, 2),
+    }
+
+
+_warmup_pool = ThreadPoolExecutor(max_workers=WARMUP_POOL_SIZE, thread_name_prefix="warmup")
+_warmups: Dict[tuple, Future] = {}
+_warmups_lock = threading.Lock()
+
+
+def _warm_in_background(vector_store, episode_id: str) -> Optional[dict]:
+    try:
+        return warm_episode(vector_store, episode_id)
+    except Exception as e:
+        # Warm-up is best effort; the first question loads whatever is missing
+        logger.warning(f"Warm-up failed for episode {episode_id}: {e}")
+        return None
+
+
+def schedule_warmup(vector_store, episode_id: str) -> Optional[Future]:
+    """Warm an episode on the background pool and return the job.
+
+    A request for an episode that is already being warmed (same ingest
+    version) joins the running job. Returns None when warm-up is disabled.
+    """
+    if not EPISODE_WARMUP or not episode_id:
+        return None
+    key = (episode_id, get_ingest_version(episode_id))
+    with _warmups_lock:
+        future = _warmups.get(key)
+        if future is not None:
+            return future
+        future = _warmup_pool.submit(_warm_in_background, vector_store, episode_id)
+        _warmups[key] = future
+
+    def _done(_future):
+        with _warmups_lock:
+            if _warmups.get(key) is _future:
+                del _warmups[key]
+
+    future.add_done_callback(_done)
+    return future
+
+
+def clear_episode_indexes() -> None:
+    """Drop every cached snapshot and index (used by tests and admin tooling)."""
+    _snapshots.clear()
+    _lexical_indexes.clear()
+    _vector_indexes.clear()
+    clear_term_indexes()
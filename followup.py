@@ -0,0 +1,76 @@
+"""
+Follow-up turns: reuse the previous turn's retrieval.
+
+Each answer stores the chunk IDs it retrieved (and the query they were
+retrieved for) in the assistant message's meta_data. On the next turn in the
+same conversation those chunks become a warm candidate pool, and retrieval only
+runs for the terms the new question adds. A question that shares nothing with
+the previous one (and does not refer back to it) is treated as a new topic.
+One that adds new terms and points back only with a single generic pronoun
+("who funded it?") is still a follow-up, but gets full retrieval.
+"""
+
+import re
+from typing import List, Tuple
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9\-\.]*[a-z0-9]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each even few for from further get
+give had has have having he her here hers him his how i if in into is it its itself just let
+like me more most my no nor not now of off on once only or other our ours out over own please
+same she should so some such tell than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which while who whom why
+will with would you your yours
+""".split())
+
+# Words that point back at the previous turn ("what are its limitations?")
+BACK_REFERENCES = frozenset(
+    "it its this that these those they them their same above previous earlier".split()
+)
+# Pronouns too common to tie a question with new terms to the previous turn on
+# their own ("what is this circuits paper?")
+GENERIC_BACK_REFERENCES = frozenset("it this that these those they them".split())
+
+
+def content_terms(text: str) -> List[str]:
+    """Lowercased non-stopword terms, in order, without duplicates."""
+    words = _WORD.findall((text or "").lower())
+    return list(dict.fromkeys(w for w in words if w not in STOPWORDS))
+
+
+def query_delta(previous_query: str, question: str) -> Tuple[List[str], bool]:
+    """Terms the question adds over the previous query, and whether it is a follow-up.
+
+    A question is a follow-up when it shares a content term with the previous
+    query, refers back to it, or has no content terms of its own ("why?").
+    """
+    previous = set(content_terms(previous_query))
+    current = content_terms(question)
+    delta = [term for term in current if term not in previous]
+    words = set(_WORD.findall((question or "").lower()))
+    follow_up = (
+        bool(previous)
+        and (len(delta) < len(current) or bool(words & BACK_REFERENCES) or not current)
+    )
+    return delta, follow_up
+
+
+def retrieves_delta_only(previous_query: str, question: str) -> bool:
+    """Whether a follow-up is tied closely enough to the previous turn to
+    retrieve only the terms it adds.
+
+    True when the question adds no terms, shares a content term with the
+    previous query, or refers back with a specific word ("its", "same") or
+    more than one generic pronoun.
+    """
+    previous = set(content_terms(previous_query))
+    current = content_terms(question)
+    if not current or any(term in previous for term in current):
+        return True
+    words = _WORD.findall((question or "").lower())
+    return (
+        any(word in BACK_REFERENCES and word not in GENERIC_BACK_REFERENCES for word in words)
+        or sum(word in GENERIC_BACK_REFERENCES for word in words) > 1
+    )
@@ -0,0 +1,138 @@
+"""
+Shared on-disk lexical index: a SQLite FTS5 table in the app database.
+
+Each uvicorn worker otherwise builds its own in-process BM25 index
+(bm25.SparseBM25) per episode. ingest_bundle_gpk writes every chunk into `chunk_fts` as well, so
+any worker can rank an episode's chunks with FTS5's bm25() without building
+anything in Python:
+
+    chunk_fts(text, episode_id, paper_title UNINDEXED, chunk_id UNINDEXED)
+
+The episode filter is part of the MATCH expression (episode_id is an indexed
+column, weighted 0 in bm25()) so FTS5 intersects posting lists instead of
+scanning every episode's matches; an exact episode_id comparison guards
+against phrase matches on a longer ID. `chunk_fts_episodes` records which
+episodes are indexed, so episodes ingested before the table existed fall back
+to the in-process index.
+"""
+
+import logging
+import os
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+
+from database import engine as default_engine
+from followup import content_terms
+
+logger = logging.getLogger(__name__)
+
+FTS_LEXICAL_INDEX = os.getenv("FTS_LEXICAL_INDEX", "true").lower() == "true"
+FTS_TABLE = "chunk_fts"
+FTS_EPISODES_TABLE = "chunk_fts_episodes"
+
+_SCHEMA = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "text, episode_id, paper_title UNINDEXED, chunk_id UNINDEXED, tokenize='unicode61')",
+    f"CREATE TABLE IF NOT EXISTS {FTS_EPISODES_TABLE} ("
+    "episode_id TEXT PRIMARY KEY, chunks INTEGER NOT NULL)",
+]
+
+_ready_engines = set()
+_engine = None
+
+
+def use_engine(engine) -> None:
+    """Index and search through `engine` instead of the app database (tests use an in-memory one)."""
+    global _engine
+    _engine = engine
+
+
+def _resolve_engine(engine):
+    return engine or _engine or default_engine
+
+
+def fts_enabled(engine=None) -> bool:
+    engine = _resolve_engine(engine)
+    return FTS_LEXICAL_INDEX and engine.dialect.name == "sqlite"
+
+
+def _ensure_schema(engine) -> None:
+    if id(engine) in _ready_engines:
+        return
+    with engine.begin() as conn:
+        for statement in _SCHEMA:
+            conn.execute(text(statement))
+    _ready_engines.add(id(engine))
+
+
+def _phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def match_expression(query: str, episode_id: str) -> Optional[str]:
+    """FTS5 MATCH for any content term of `query` within one episode, or None."""
+    terms = content_terms(query)
+    if not terms:
+        return None
+    return f"episode_id:{_phrase(episode_id)} AND text:({' OR '.join(_phrase(t) for t in terms)})"
+
+
+def index_episode_chunks(episode_id: str, chunk_ids: Sequence[str], texts: Sequence[str],
+                         metadatas: Sequence[dict], engine=None) -> int:
+    """Replace an episode's rows in the FTS table; returns the number of chunks indexed."""
+    engine = _resolve_engine(engine)
+    if not fts_enabled(engine):
+        return 0
+    _ensure_schema(engine)
+    rows = [
+        {"text": chunk_text, "episode_id": episode_id,
+         "paper_title": (md or {}).get("paper_title") or "None", "chunk_id": chunk_id}
+        for chunk_id, chunk_text, md in zip(chunk_ids, texts, metadatas)
+    ]
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match AND episode_id = :episode_id"),
+                     {"match": f"episode_id:{_phrase(episode_id)}", "episode_id": episode_id})
+        if rows:
+            conn.execute(
+                text(f"INSERT INTO {FTS_TABLE} (text, episode_id, paper_title, chunk_id) "
+                     "VALUES (:text, :episode_id, :paper_title, :chunk_id)"),
+                rows,
+            )
+        conn.execute(
+            text(f"INSERT OR REPLACE INTO {FTS_EPISODES_TABLE} (episode_id, chunks) VALUES (:episode_id, :chunks)"),
+            {"episode_id": episode_id, "chunks": len(rows)},
+        )
+    logger.info(f"Indexed {len(rows)} chunks of episode {episode_id} in {FTS_TABLE}")
+    return len(rows)
+
+
+def search_chunk_ids(query: str, episode_id: str, n: int, paper_title: Optional[str] = None,
+                     engine=None) -> Optional[List[str]]:
+    """Chunk IDs of the episode ranked by bm25(), best first.
+
+    Returns None when the FTS index cannot answer (disabled, not SQLite, or the
+    episode was never indexed), so the caller can fall back to in-process BM25.
+    """
+    engine = _resolve_engine(engine)
+    if not fts_enabled(engine):
+        return None
+    _ensure_schema(engine)
+    with engine.connect() as conn:
+        indexed = conn.execute(
+            text(f"SELECT 1 FROM {FTS_EPISODES_TABLE} WHERE episode_id = :episode_id"),
+            {"episode_id": episode_id},
+        ).first()
+        if indexed is None:
+            return None
+        match = match_expression(query, episode_id)
+        if match is None:
+            return []
+        sql = (f"SELECT chunk_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match "
+               "AND episode_id = :episode_id")
+        params = {"match": match, "episode_id": episode_id, "n": n}
+        if paper_title is not None:
+            sql += " AND paper_title = :paper_title"
+            params["paper_title"] = paper_title
+        sql += f" ORDER BY bm25({FTS_TABLE}, 1.0, 0.0) LIMIT :n"
+        return [row[0] for row in conn.execute(text(sql), params)]
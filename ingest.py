@@ -1,17 +1,31 @@
 import os
 import re
+import hashlib
+import logging
 from dataclasses import dataclass
 from typing import List, Optional
 from langchain_chroma import Chroma
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from dotenv import load_dotenv
+from term_index import build_term_index, remember_term_index
 
 load_dotenv()
 
+from embedding_cache import cached_embeddings
+# Every (re-)ingest bumps the episode's version, shared by all processes (see
+# ingest_versions), so caches keyed by (episode_id, version) never serve chunks
+# from an old ingest.
+from ingest_versions import bump_ingest_version
+from embedding_pipeline import add_in_batches
+
+logger = logging.getLogger(__name__)
+
 # Initialize Embeddings
 # Note: Ensure GOOGLE_API_KEY is set in environment
-embeddings = GoogleGenerativeAIEmbeddings(model="models/text-embedding-004")
+EMBEDDING_MODEL = "models/text-embedding-004"
+# Repeated questions are embedded once (see embedding_cache)
+embeddings = cached_embeddings(GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL), EMBEDDING_MODEL)
 
 # Initialize Vector Store (Persistent)
 PERSIST_DIRECTORY = "./chroma_db"
@@ -50,6 +64,22 @@ def get_vector_store():
         persist_directory=PERSIST_DIRECTORY,
     )
 
+def make_chunk_id(episode_id: str, source_type: str, paper_title: str, text: str) -> str:
+    """Deterministic content-hash ID for a chunk.
+
+    Unlike chunk_index (which restarts at 0 for the report, the audio transcript
+    and every paper), this is unique across sections of an episode and stable
+    across re-ingests of unchanged text.
+    """
+    key = "\x1f".join([episode_id, source_type, paper_title, text])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+def citation_header(paper_title: Optional[str]) -> str:
+    """Header prepended to a chunk in the LLM context so answers can cite it."""
+    if not paper_title or str(paper_title).lower() == "none":
+        paper_title = "Episode Overview"
+    return f"[{paper_title}] (source)\n"
+
 def parse_daily_report_gpk(episode_id: str, report_text: str) -> EpisodeBundleGpk:
     """
     Very lightweight parser tuned to Kochi Daily Reports:
@@ -129,12 +159,52 @@ def choose_chunk_params(text: str):
         return 500, 100
     return 1000, 200
 
-def ingest_bundle_gpk(bundle: EpisodeBundleGpk, audio_text: str | None = None) -> dict:
+def _index_fts(episode_id: str, chunk_ids, texts, metadatas) -> None:
+    """Mirror the episode's chunks into the shared FTS5 lexical index (best effort)."""
+    # Imported here so database.py reads DATABASE_URL after load_dotenv
+    from fts_index import index_episode_chunks
+    try:
+        index_episode_chunks(episode_id, chunk_ids, texts, metadatas)
+    except Exception as e:
+        # Retrieval falls back to the in-process BM25 index for this episode
+        logger.warning(f"FTS indexing failed for episode {episode_id}: {e}")
+
+def _diff_stored_chunks(vs, episode_id: str, chunk_ids: List[str], metadatas: List[dict]):
+    """Compare an episode's new chunks with what the store already holds.
+
+    Returns (new_ids, stale_ids, metadata_updates): chunk IDs to embed and add,
+    stored IDs no longer produced (edited text, or legacy random IDs), and
+    metadata for unchanged text whose position or timestamps moved.
+    """
+    stored = vs.get(where={"episode_id": episode_id}, include=["metadatas"])
+    stored_metadata = dict(zip(stored.get("ids") or [], stored.get("metadatas") or []))
+    current = set(chunk_ids)
+    new_ids = {chunk_id for chunk_id in chunk_ids if chunk_id not in stored_metadata}
+    stale_ids = [chunk_id for chunk_id in stored_metadata if chunk_id not in current]
+    metadata_updates = {}
+    for chunk_id, md in zip(chunk_ids, metadatas):
+        if chunk_id in stored_metadata and any(
+                (stored_metadata[chunk_id] or {}).get(key) != value for key, value in md.items()):
+            metadata_updates[chunk_id] = md
+    return new_ids, stale_ids, metadata_updates
+
+def _apply_chunk_diff(vs, episode_id: str, stale_ids: List[str], metadata_updates: dict) -> None:
+    """Delete stale chunks and rewrite moved metadata (no embedding calls)."""
+    if metadata_updates:
+        vs._collection.update(ids=list(metadata_updates), metadatas=list(metadata_updates.values()))
+    if stale_ids:
+        vs.delete(ids=stale_ids)
+    logger.info(f"Episode {episode_id}: {len(metadata_updates)} chunks re-labelled, {len(stale_ids)} stale chunks deleted")
+
+def ingest_bundle_gpk(bundle: EpisodeBundleGpk, audio_text: str | None = None, progress=None) -> dict:
     """
     Ingest a full episode bundle:
     - full report (all sections)
     - optional audio transcript (treated as 'summary' source)
-    Each chunk gets metadata: episode_id, source_type, section, paper_title, priority.
+    Each chunk gets metadata: episode_id, source_type, section, paper_title, priority,
+    plus its content-hash chunk_id and precomputed citation header.
+    New chunks are embedded in batches (see embedding_pipeline); `progress`
+    receives a BatchProgress after each batch.
     """
     
     # Use the global vector store getter
@@ -228,20 +298,55 @@ def ingest_bundle_gpk(bundle: EpisodeBundleGpk, audio_text: str | None = None) -
                 "chunk_index": 0,
             })
 
-    if docs:
-        ids = vs.add_texts(docs, metadatas=metadatas)
-    else:
-        ids = []
+    # 4) Content-hash chunk IDs (identical chunks within a section collapse into one)
+    chunk_ids = []
+    seen_ids = set()
+    unique_docs, unique_metadatas = [], []
+    for text, md in zip(docs, metadatas):
+        chunk_id = make_chunk_id(bundle.episode_id, md["source_type"], md["paper_title"], text)
+        if chunk_id in seen_ids:
+            continue
+        seen_ids.add(chunk_id)
+        md["chunk_id"] = chunk_id
+        md["citation"] = citation_header(md["paper_title"])
+        chunk_ids.append(chunk_id)
+        unique_docs.append(text)
+        unique_metadatas.append(md)
+
+    # Only new or edited text is embedded; re-ingesting an unchanged report is free
+    new_ids, stale_ids, metadata_updates = _diff_stored_chunks(vs, bundle.episode_id, chunk_ids, unique_metadatas)
+    added = [i for i, chunk_id in enumerate(chunk_ids) if chunk_id in new_ids]
+    add_in_batches(
+        added,
+        lambda batch: vs.add_texts([unique_docs[i] for i in batch], metadatas=[unique_metadatas[i] for i in batch],
+                                   ids=[chunk_ids[i] for i in batch]),
+        progress=progress,
+    )
+    _apply_chunk_diff(vs, bundle.episode_id, stale_ids, metadata_updates)
+    ids = chunk_ids
+    version = bump_ingest_version(bundle.episode_id)
+    _index_fts(bundle.episode_id, chunk_ids, unique_docs, unique_metadatas)
+
+    # 5) Term index for the guardrail (titles, model names, authors, acronyms)
+    remember_term_index(build_term_index(
+        bundle.episode_id,
+        version,
+        unique_docs,
+        [p.title for p in bundle.papers],
+    ))
 
     return {
         "episode_id": bundle.episode_id,
         "report_chunks": len(report_chunks),
         "audio_chunks": len(audio_chunks) if audio_text else 0,
         "paper_entries": len(bundle.papers),
-        "ids_count": len(ids)
+        "ids_count": len(ids),
+        "chunks_added": len(added),
+        "chunks_deleted": len(stale_ids),
+        "chunks_unchanged": len(chunk_ids) - len(added),
     }
 
-def ingest_episode(episode_id: str, text: str):
+def ingest_episode(episode_id: str, text: str, progress=None):
     """
     Legacy ingestion function for backward compatibility.
     Now wraps the new logic by creating a minimal bundle.
@@ -251,7 +356,7 @@ def ingest_episode(episode_id: str, text: str):
         bundle = parse_daily_report_gpk(episode_id, text)
         # If parsing found something useful (like papers), use the new path
         if bundle.papers or bundle.date_str:
-             return ingest_bundle_gpk(bundle)
+             return ingest_bundle_gpk(bundle, progress=progress)
     except Exception:
         pass
         
@@ -262,21 +367,41 @@ def ingest_episode(episode_id: str, text: str):
         length_function=len,
     )
     
-    chunks = text_splitter.create_documents([text])
-    
-    # Add metadata to each chunk
-    for chunk in chunks:
+    chunks = []
+    chunk_ids = []
+    for chunk in text_splitter.create_documents([text]):
+        chunk_id = make_chunk_id(episode_id, "text", "None", chunk.page_content)
+        if chunk_id in chunk_ids:
+            continue
+        # Add metadata to each chunk
         chunk.metadata["episode_id"] = episode_id
+        chunk.metadata["chunk_id"] = chunk_id
+        chunk.metadata["citation"] = citation_header(None)
+        chunks.append(chunk)
+        chunk_ids.append(chunk_id)
         
     vector_store = get_vector_store()
     
-    # Add to vector store
-    ids = vector_store.add_documents(chunks)
+    # Add only chunks the store does not hold yet, then drop the stale ones
+    new_ids, stale_ids, metadata_updates = _diff_stored_chunks(
+        vector_store, episode_id, chunk_ids, [c.metadata for c in chunks])
+    added = [c for c, chunk_id in zip(chunks, chunk_ids) if chunk_id in new_ids]
+    add_in_batches(
+        added,
+        lambda batch: vector_store.add_documents(list(batch), ids=[c.metadata["chunk_id"] for c in batch]),
+        progress=progress,
+    )
+    _apply_chunk_diff(vector_store, episode_id, stale_ids, metadata_updates)
+    version = bump_ingest_version(episode_id)
+    _index_fts(episode_id, chunk_ids, [c.page_content for c in chunks], [c.metadata for c in chunks])
+    remember_term_index(build_term_index(episode_id, version, [c.page_content for c in chunks]))
     
     return {
         "episode_id": episode_id,
         "chunks_count": len(chunks),
-        "ids": ids
+        "ids": chunk_ids,
+        "chunks_added": len(added),
+        "chunks_deleted": len(stale_ids),
     }
 
 if __name__ == "__main__":
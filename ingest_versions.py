@@ -0,0 +1,129 @@
+"""
+Episode ingest versions, shared by every process through the app database.
+
+Every (re-)ingest of an episode bumps its version, and every per-episode
+cache (snapshots, lexical/vector/term indexes, retrieval and negative caches)
+is keyed by (episode_id, version), so a re-ingest invalidates them all. The
+counter used to live in the ingesting process only; an ingest from
+fetch_and_ingest.py, ingest_rich.py or another uvicorn worker left the
+server's caches stale until restart. Versions are now rows of
+`episode_ingest_versions` in the app database:
+
+- bump_ingest_version increments the row in one statement (safe across
+  processes)
+- reads are cached for INGEST_VERSION_TTL_S, so a cache lookup costs at most
+  one small query per episode per interval and another process's ingest is
+  seen within that interval; this process's own bumps are seen immediately
+
+If the database cannot be reached, versions fall back to a process-local
+counter (the old behaviour) rather than failing retrieval.
+"""
+
+import logging
+import os
+import threading
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+INGEST_VERSION_TTL_S = float(os.getenv("INGEST_VERSION_TTL_S", "2"))
+VERSIONS_TABLE = "episode_ingest_versions"
+_ARCHIVE_KEY = ("__archive__",)
+
+_SCHEMA = (f"CREATE TABLE IF NOT EXISTS {VERSIONS_TABLE} ("
+           "episode_id TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+
+_engine = None
+_ready_engines = set()
+_read_cache = LRUCache(maxsize=4096, ttl_seconds=INGEST_VERSION_TTL_S)
+_local_versions: dict[str, int] = {}
+_local_lock = threading.Lock()
+
+
+def use_engine(engine) -> None:
+    """Store versions through `engine` (tests use an in-memory database)."""
+    global _engine
+    _engine = engine
+    _read_cache.clear()
+    with _local_lock:
+        _local_versions.clear()
+
+
+def _get_engine():
+    if _engine is None:
+        # Imported here so database.py reads DATABASE_URL after load_dotenv
+        from database import engine
+        use_engine(engine)
+    return _engine
+
+
+def _connect_ready():
+    engine = _get_engine()
+    if id(engine) not in _ready_engines:
+        with engine.begin() as conn:
+            conn.execute(text(_SCHEMA))
+        _ready_engines.add(id(engine))
+    return engine
+
+
+def _local_version(episode_id: Optional[str]) -> int:
+    with _local_lock:
+        if episode_id is None:
+            return sum(_local_versions.values())
+        return _local_versions.get(episode_id, 0)
+
+
+def get_ingest_version(episode_id: str) -> int:
+    """Current ingest version of an episode (0 if it was never ingested)."""
+    version = _read_cache.get(episode_id)
+    if version is not None:
+        return version
+    try:
+        with _connect_ready().connect() as conn:
+            row = conn.execute(text(f"SELECT version FROM {VERSIONS_TABLE} WHERE episode_id = :episode_id"),
+                               {"episode_id": episode_id}).first()
+        version = row[0] if row else 0
+    except SQLAlchemyError as e:
+        logger.warning(f"Reading ingest version of {episode_id} failed, using the local counter: {e}")
+        return _local_version(episode_id)
+    _read_cache.put(episode_id, version)
+    return version
+
+
+def bump_ingest_version(episode_id: str) -> int:
+    """Mark an episode as re-ingested, invalidating its cached indexes everywhere."""
+    try:
+        with _connect_ready().begin() as conn:
+            conn.execute(text(
+                f"INSERT INTO {VERSIONS_TABLE} (episode_id, version) VALUES (:episode_id, 1) "
+                "ON CONFLICT (episode_id) DO UPDATE SET version = version + 1"
+            ), {"episode_id": episode_id})
+            version = conn.execute(text(f"SELECT version FROM {VERSIONS_TABLE} WHERE episode_id = :episode_id"),
+                                   {"episode_id": episode_id}).scalar_one()
+    except SQLAlchemyError as e:
+        logger.warning(f"Storing ingest version of {episode_id} failed, using the local counter: {e}")
+        with _local_lock:
+            version = _local_versions[episode_id] = _local_versions.get(episode_id, 0) + 1
+    _read_cache.put(episode_id, version)
+    _read_cache.pop(_ARCHIVE_KEY)
+    return version
+
+
+def get_archive_version() -> int:
+    """Changes whenever any episode is (re-)ingested, by any process."""
+    version = _read_cache.get(_ARCHIVE_KEY)
+    if version is not None:
+        return version
+    try:
+        with _connect_ready().connect() as conn:
+            version = conn.execute(text(f"SELECT COALESCE(SUM(version), 0) FROM {VERSIONS_TABLE}")).scalar_one()
+    except SQLAlchemyError as e:
+        logger.warning(f"Reading the archive version failed, using the local counters: {e}")
+        return _local_version(None)
+    _read_cache.put(_ARCHIVE_KEY, int(version))
+    return int(version)
@@ -10,6 +10,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 import logging
 import os
+import re
 import time
 import uuid
 from pathlib import Path
@@ -19,10 +20,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from ingest import ingest_episode, get_vector_store
+from episode_index import get_episode_chunks, get_episode_chunk_counts
 from agent import EpisodeCompanionAgent
 from orchestrator import Orchestrator
 from conversation_manager import ConversationManager
-from backend.schemas import CompanionQueryRequest, CompanionQueryResponse
+from backend.schemas import CompanionQueryRequest, CompanionQueryResponse, SearchResponse
+from archive_search import search_archive
+from repositories.episode_repository import EpisodeRepository
 
 # Upstream Pipeline imports
 from arxiv_loader import ArxivLoader
@@ -200,21 +204,9 @@ def list_episodes():
     Returns a list of episode_id strings that have been ingested.
     """
     try:
-        vector_store = get_vector_store()
-        # Get all unique episode IDs from the collection
-        # Note: This is a simplified version; in production, you'd maintain a separate index
-        collection = vector_store._collection
-        all_metadata = collection.get()
-        
-        if not all_metadata or 'metadatas' not in all_metadata:
-            return []
-        
-        episode_ids = set()
-        for metadata in all_metadata['metadatas']:
-            if metadata and 'episode_id' in metadata:
-                episode_ids.add(metadata['episode_id'])
-        
-        return sorted(list(episode_ids))
+        # Reads chunk metadata only; documents and embeddings are not fetched
+        chunk_counts = get_episode_chunk_counts(agent.vector_store)
+        return sorted(chunk_counts)
     
     except Exception as e:
         logger.error(f"Failed to list episodes: {e}")
@@ -223,6 +215,31 @@ def list_episodes():
             detail=f"Failed to retrieve episode list: {str(e)}"
         )
 
+@app.get("/episodes/{episode_id}", response_model=EpisodeInfo, tags=["Episodes"])
+def get_episode_info(episode_id: str):
+    """
+    Get metadata for a single ingested episode.
+    
+    The chunk count comes from the cached episode snapshot (a metadata-filtered
+    read of the vector store), so repeated calls are cheap.
+    """
+    try:
+        snapshot = get_episode_chunks(agent.vector_store, episode_id)
+    except Exception as e:
+        logger.error(f"Failed to load episode {episode_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to load episode: {str(e)}"
+        )
+    
+    if not snapshot.docs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Episode {episode_id} not found"
+        )
+    
+    return EpisodeInfo(episode_id=episode_id, chunks_count=len(snapshot))
+
 @app.post("/episodes/{episode_id}/ingest", tags=["Episodes"])
 def ingest_episode_endpoint(episode_id: str, request: IngestRequest):
     """
@@ -270,6 +287,67 @@ def ingest_episode_endpoint(episode_id: str, request: IngestRequest):
             detail=f"Ingestion failed: {str(e)}"
         )
 
+@app.get("/search", response_model=SearchResponse, tags=["Search"])
+def search_episodes(
+    q: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 10,
+    semantic: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Search every ingested episode.
+    
+    Returns ranked chunks, plus the episodes and papers they roll up to.
+    `date_from`/`date_to` (inclusive, YYYY-MM-DD) filter on the episode date,
+    and `offset`/`limit` page through each list. The last word of `q` may be
+    unfinished; typeahead clients should pass `semantic=false` to skip the
+    embedding call.
+    """
+    for value in (date_from, date_to):
+        if value and not re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid date format. Use YYYY-MM-DD"
+            )
+    if offset < 0 or not 1 <= limit <= 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="offset must be >= 0 and limit between 1 and 100"
+        )
+    
+    started = time.time()
+    try:
+        episode_dates = EpisodeRepository(db).get_episode_dates()
+    except Exception as e:
+        # Episodes missing from the table are dated by their ID
+        logger.warning(f"Could not load episode dates: {e}")
+        episode_dates = {}
+    
+    results = search_archive(
+        agent.vector_store, q,
+        date_from=date_from, date_to=date_to,
+        offset=offset, limit=limit, semantic=semantic,
+        episode_dates=episode_dates,
+    )
+    return SearchResponse(
+        **vars(results),
+        latency_ms=round((time.time() - started) * 1000, 2),
+    )
+
+@app.post("/episodes/{episode_id}/warmup", status_code=status.HTTP_202_ACCEPTED, tags=["Episodes"])
+def warmup_episode(episode_id: str):
+    """
+    Preload an episode's chunks and retrieval indexes in the background.
+    
+    Called when the interactive modal opens, so the first question does not
+    pay the cold-start cost of loading the episode.
+    """
+    scheduled = agent.warm_up(episode_id) is not None
+    return {"status": "scheduled" if scheduled else "disabled", "episode_id": episode_id}
+
 @app.post("/episodes/{episode_id}/query", tags=["Episodes"])
 def query_episode(episode_id: str, mode: str, request: QueryRequest, req: Request):
     """
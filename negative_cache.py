@@ -0,0 +1,67 @@
+"""
+Negative-result cache for questions an episode cannot answer.
+
+Off-topic questions get repeated (the same suggested prompt, the same user
+retrying). A guardrail refusal is cheap to recompute, but a grounding failure
+costs two generations and two critic calls before ending in INSUFFICIENT_MSG.
+This cache maps (episode_id, ingest version, mode, normalized query) to the
+refusal that was returned, so a repeat is answered immediately. The ingest
+version in the key means a re-ingest (which may add the missing content)
+invalidates every entry for the episode. Grounding failures depend on the
+mode's prompt, so they are cached per mode; guardrail refusals depend only on
+the episode's terms and are shared by every mode (mode None).
+"""
+
+import os
+from typing import Optional
+
+from cache import LRUCache
+from ingest_versions import get_ingest_version
+from retrieval_cache import normalize_query
+
+NEGATIVE_CACHE_SIZE = int(os.getenv("NEGATIVE_CACHE_SIZE", "4096"))
+NEGATIVE_CACHE_TTL_S = float(os.getenv("NEGATIVE_CACHE_TTL_S", "3600"))
+
+REASON_GUARDRAIL = "guardrail"
+REASON_GROUNDING = "grounding_failed"
+
+
+class NegativeCache:
+    """LRU + TTL cache of refusals per episode and query.
+
+    Entries hold the refusal's `reason`, its `quality_checks` and the
+    `source_papers` that were reported with it.
+    """
+
+    def __init__(self, maxsize: int = NEGATIVE_CACHE_SIZE, ttl_seconds: float = NEGATIVE_CACHE_TTL_S):
+        self._cache = LRUCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def _key(episode_id: str, query: str, mode: Optional[str] = None) -> tuple:
+        return (episode_id, get_ingest_version(episode_id), mode, normalize_query(query))
+
+    def get(self, episode_id: str, query: str, mode: Optional[str] = None) -> Optional[dict]:
+        """Refusal cached for this query in any mode, else for this query in `mode`."""
+        entry = self._cache.get(self._key(episode_id, query))
+        if entry is None and mode is not None:
+            entry = self._cache.get(self._key(episode_id, query, mode))
+        return entry
+
+    def put(self, episode_id: str, query: str, reason: str, quality_checks: dict, source_papers=(),
+            mode: Optional[str] = None) -> None:
+        """Cache a refusal; grounding failures are kept per `mode`, guardrail refusals for all modes."""
+        key_mode = mode if reason == REASON_GROUNDING else None
+        self._cache.put(self._key(episode_id, query, key_mode), {
+            "reason": reason,
+            "quality_checks": dict(quality_checks),
+            "source_papers": list(source_papers),
+        })
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+negative_cache = NegativeCache()
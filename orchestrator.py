@@ -147,6 +147,9 @@ class Orchestrator:
             # 2. Resolve episode ID (auto-resume last if not provided)
             if not episode_id:
                 episode_id = manager.get_last_episode_id(user_id)
+                if episode_id:
+                    # Resumed conversation: load the episode's indexes in the background
+                    self.episode_agent.warm_up(episode_id)
 
             text_lower = text.lower()
             is_build_intent = any(
@@ -207,8 +210,10 @@ class Orchestrator:
             if mode is None:
                 mode = self.detect_intent(text)
 
-            # Fetch conversation context for this user/episode
+            # Fetch conversation context for this user/episode, and the chunks
+            # the previous turn retrieved (warm pool for follow-ups)
             history_str = manager.get_conversation_context(user_id, episode_id)
+            previous_retrieval = manager.get_last_retrieval(user_id, episode_id)
 
             # 5. Generate answer via episode companion agent
             response = self.episode_agent.get_answer(
@@ -219,6 +224,7 @@ class Orchestrator:
                 user_profile=user_profile,
                 conversation_history=history_str,
                 debug=debug,
+                previous_retrieval=previous_retrieval,
             )
 
             # 6. Persist interaction
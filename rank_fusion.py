@@ -0,0 +1,86 @@
+"""
+Weighted Reciprocal Rank Fusion (RRF) over any number of ranked lists.
+
+Each retriever contributes weight * (1 / (rank + k) + boost(doc)) for every
+chunk it returns. Chunks are deduplicated by a stable ID (the content-hash
+`chunk_id` assigned at ingest), never by `chunk_index`, which restarts at 0
+for the report, the audio transcript and every paper section.
+"""
+
+import hashlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+# Standard RRF damping constant
+RRF_K = 60
+
+
+def chunk_key(doc: Document) -> str:
+    """Stable identity for a retrieved chunk.
+
+    Prefers the ingest-time content hash, then the vector store ID, and for
+    legacy chunks without either falls back to a hash of the full text.
+    """
+    metadata = doc.metadata or {}
+    chunk_id = metadata.get("chunk_id") or doc.id
+    if chunk_id:
+        return str(chunk_id)
+    return hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()[:32]
+
+
+def priority_boost(doc: Document) -> float:
+    """Small bonus for high-priority sources (paper sections over report chunks)."""
+    return (doc.metadata or {}).get("priority", 1) * 0.005
+
+
+def fuse_with_scores(
+    ranked_lists: Sequence[Sequence[Document]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = RRF_K,
+    key: Callable[[Document], str] = chunk_key,
+    boost: Optional[Callable[[Document], float]] = priority_boost,
+) -> List[Tuple[Document, float]]:
+    """Fuse ranked lists into one (document, score) list, best first.
+
+    Args:
+        ranked_lists: One list per retriever, best match first.
+        weights: Per-retriever weights (defaults to 1.0 each).
+        k: RRF damping constant.
+        key: Function mapping a document to its dedupe ID.
+        boost: Optional per-document bonus added to every contribution.
+    """
+    if weights is None:
+        weights = [1.0] * len(ranked_lists)
+    if len(weights) != len(ranked_lists):
+        raise ValueError(f"Got {len(weights)} weights for {len(ranked_lists)} ranked lists")
+
+    docs: Dict[str, Document] = {}
+    scores: Dict[str, float] = {}
+    for ranked, weight in zip(ranked_lists, weights):
+        if not weight:
+            continue
+        for rank, doc in enumerate(ranked):
+            doc_id = key(doc)
+            if doc_id not in docs:
+                docs[doc_id] = doc
+                scores[doc_id] = 0.0
+            contribution = 1.0 / (rank + k)
+            if boost is not None:
+                contribution += boost(doc)
+            scores[doc_id] += weight * contribution
+
+    # Python's sort is stable, so ties keep first-seen order
+    ordered = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [(docs[doc_id], scores[doc_id]) for doc_id in ordered]
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[Sequence[Document]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = RRF_K,
+    key: Callable[[Document], str] = chunk_key,
+    boost: Optional[Callable[[Document], float]] = priority_boost,
+) -> List[Document]:
+    """Same as fuse_with_scores, returning only the documents."""
+    return [doc for doc, _score in fuse_with_scores(ranked_lists, weights, k, key, boost)]
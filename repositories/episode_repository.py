@@ -6,7 +6,7 @@ Data access layer for Episode model.
 
 import logging
 import json
-from typing import Optional, List
+from typing import Dict, Optional, List
 from sqlalchemy.orm import Session
 from models import Episode
 from database import get_db
@@ -131,6 +131,16 @@ class EpisodeRepository:
         db = self._get_db()
         return db.query(Episode).order_by(Episode.date_str.desc()).limit(limit).all()
     
+    def get_episode_dates(self) -> Dict[str, str]:
+        """
+        Map every episode ID to its date, without loading report text.
+        
+        Returns:
+            Dict of episode_id -> "YYYY-MM-DD"
+        """
+        db = self._get_db()
+        return dict(db.query(Episode.episode_id, Episode.date_str).all())
+    
     def delete_episode(self, episode_id: str) -> bool:
         """
         Delete episode by ID.
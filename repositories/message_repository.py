@@ -92,6 +92,13 @@ class MessageRepository:
         # Reverse to chronological order
         return messages[::-1]
 
+    def get_last_assistant_message(self, conversation_id: int) -> Optional[Message]:
+        """Most recent assistant message of a conversation (by insertion order)."""
+        return self.db.query(Message).filter(
+            Message.conversation_id == conversation_id,
+            Message.role == "assistant",
+        ).order_by(desc(Message.id)).first()
+
     def get_message_count(self, conversation_id: int) -> int:
         """Get total message count for conversation"""
         return self.db.query(Message).filter(
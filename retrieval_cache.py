@@ -0,0 +1,58 @@
+"""
+Retrieval result cache.
+
+Suggested follow-ups are the same for every listener of an episode, so the
+same handful of questions hit hybrid retrieval over and over. This cache maps
+(episode_id, ingest version, normalized expanded query, k) to the ranked chunk
+IDs that retrieval produced. Chunk IDs are resolved back to documents through
+the episode snapshot, so cached entries stay small.
+"""
+
+import os
+import re
+from typing import List, Optional
+
+from cache import LRUCache
+from ingest_versions import get_ingest_version
+
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "2048"))
+RETRIEVAL_CACHE_TTL_S = float(os.getenv("RETRIEVAL_CACHE_TTL_S", "900"))
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = re.compile(r"^[\s\"'“”‘’.,!?;:]+|[\s\"'“”‘’.,!?;:]+$")
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, collapse whitespace and strip surrounding punctuation."""
+    query = _WHITESPACE.sub(" ", (query or "").lower())
+    return _EDGE_PUNCTUATION.sub("", query)
+
+
+class RetrievalCache:
+    """LRU + TTL cache of ranked chunk IDs per episode and query.
+
+    The episode's ingest version is part of the key, so a re-ingest
+    invalidates every cached result for that episode.
+    """
+
+    def __init__(self, maxsize: int = RETRIEVAL_CACHE_SIZE, ttl_seconds: float = RETRIEVAL_CACHE_TTL_S):
+        self._cache = LRUCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def _key(episode_id: str, query: str, k: int) -> tuple:
+        return (episode_id, get_ingest_version(episode_id), normalize_query(query), k)
+
+    def get(self, episode_id: str, query: str, k: int) -> Optional[List[str]]:
+        return self._cache.get(self._key(episode_id, query, k))
+
+    def put(self, episode_id: str, query: str, k: int, chunk_ids: List[str]) -> None:
+        self._cache.put(self._key(episode_id, query, k), list(chunk_ids))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+retrieval_cache = RetrievalCache()
@@ -0,0 +1,127 @@
+"""
+Retrieval strategy routing.
+
+Not every question needs full hybrid retrieval:
+
+- overview: TL;DRs and episode-wide summaries are answered from the episode's
+  precomputed overview chunk set (see EpisodeSnapshot.overview), with
+  no embedding call or BM25 scoring
+- paper: questions that name one of the episode's papers (detected from the
+  episode's paper titles) are answered from that paper's chunks only, with
+  paper_title-filtered vector and BM25 search
+- time: questions anchored to a point in the audio ("around 3:20") that name
+  no paper are answered from the chunks whose timestamps overlap it (see
+  time_index)
+- hybrid: everything else goes through vector + BM25 retrieval with RRF
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from term_index import extract_terms
+from time_index import parse_timestamp
+
+STRATEGY_OVERVIEW = "overview"
+STRATEGY_PAPER = "paper"
+STRATEGY_HYBRID = "hybrid"
+STRATEGY_TIME = "time"
+# Follow-up turn served from the previous turn's chunks (see followup.py)
+STRATEGY_FOLLOW_UP = "follow_up"
+
+OVERVIEW_QUESTION_TYPES = {"tldr", "summary"}
+
+# Summary questions about the episode as a whole (not "what is JiT?")
+_EPISODE_WIDE = re.compile(
+    r"\b(this episode|the episode|today'?s episode|episode overview|today|overall|whole episode|all the papers)\b"
+)
+_GENERIC_EPISODE_QUERIES = (
+    "explain this episode",
+    "summary of this episode",
+    "what is this episode about",
+)
+
+# Titles shorter than this (characters) are too ambiguous to route on
+MIN_TITLE_CHARS = 6
+
+
+@dataclass(frozen=True)
+class RetrievalRoute:
+    strategy: str
+    paper_title: Optional[str] = None
+    timestamp: Optional[int] = None  # seconds, for STRATEGY_TIME
+
+
+HYBRID_ROUTE = RetrievalRoute(STRATEGY_HYBRID)
+
+
+class PaperMatcher:
+    """Finds which of an episode's papers a query names.
+
+    Each paper is known by its full title, its short name (the part before a
+    colon, e.g. "Back to Basics" or "Kandinsky 5.0"), and the model names and
+    acronyms in its title that no other paper shares (e.g. "JiT", "DALA").
+    All aliases are compiled into one case-insensitive alternation.
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        titles = sorted({t for t in titles if t})
+        title_terms = {title: extract_terms(title) for title in titles}
+        self.aliases: Dict[str, str] = {}
+        ambiguous = set()
+        for title in titles:
+            full = title.lower().strip()
+            names = {full, full.split(":", 1)[0].strip()}
+            names |= {term for term in title_terms[title]
+                      if sum(term in other for other in title_terms.values()) == 1}
+            for name in names:
+                if len(name) < MIN_TITLE_CHARS and name not in title_terms[title]:
+                    continue
+                if len(name) < 3:
+                    continue
+                if name in self.aliases and self.aliases[name] != title:
+                    ambiguous.add(name)
+                self.aliases[name] = title
+        for name in ambiguous:
+            del self.aliases[name]
+
+        pattern = "|".join(re.escape(a) for a in sorted(self.aliases, key=len, reverse=True))
+        self._regex = re.compile(rf"(?<![a-z0-9])(?:{pattern})(?![a-z0-9])") if pattern else None
+
+    def find(self, query: str) -> Optional[str]:
+        """The paper title the query names, if it names exactly one paper."""
+        if self._regex is None:
+            return None
+        matches = {self.aliases[m.group(0)] for m in self._regex.finditer(query.lower())}
+        return matches.pop() if len(matches) == 1 else None
+
+
+@lru_cache(maxsize=256)
+def paper_matcher(titles: FrozenSet[str]) -> PaperMatcher:
+    """Compiled matcher per set of episode titles (the titles rarely change)."""
+    return PaperMatcher(titles)
+
+
+def find_named_paper(query: str, titles: Iterable[str]) -> Optional[str]:
+    """Return the episode paper title the query names, if exactly one matches."""
+    return paper_matcher(frozenset(titles)).find(query)
+
+
+def route_question(question_type: str, query: str, titles: Iterable[str] = ()) -> RetrievalRoute:
+    """Pick a retrieval strategy for a classified question."""
+    # Comparisons need more than one paper in context
+    paper_title = find_named_paper(query, titles) if question_type != "compare" else None
+    if paper_title is not None:
+        return RetrievalRoute(STRATEGY_PAPER, paper_title)
+
+    timestamp = parse_timestamp(query)
+    if timestamp is not None:
+        return RetrievalRoute(STRATEGY_TIME, timestamp=timestamp)
+
+    q = query.lower()
+    if any(generic in q for generic in _GENERIC_EPISODE_QUERIES):
+        return RetrievalRoute(STRATEGY_OVERVIEW)
+    if question_type == "tldr" or (question_type in OVERVIEW_QUESTION_TYPES and _EPISODE_WIDE.search(q)):
+        return RetrievalRoute(STRATEGY_OVERVIEW)
+    return HYBRID_ROUTE
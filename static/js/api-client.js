@@ -111,6 +111,30 @@ class APIClient {
     }
   }
 
+  /**
+   * Ask the backend to preload an episode's indexes (fire-and-forget)
+   * @param {string} episodeId - Episode to warm up
+   * @returns {Promise<Object>} Warm-up status
+   */
+  async warmup(episodeId) {
+    const url = `${this.baseURL}/episodes/${encodeURIComponent(episodeId)}/warmup`;
+
+    try {
+      const response = await this._fetch(url, { method: 'POST' }, 10000);
+
+      if (!response.ok) {
+        throw new APIError('Warm-up failed', response.status);
+      }
+
+      return await response.json();
+    } catch (error) {
+      if (error instanceof APIError) {
+        throw error;
+      }
+      throw new APIError(`Warm-up error: ${error.message}`, 0);
+    }
+  }
+
   /**
    * Internal fetch wrapper with timeout and retry logic
    * @private
@@ -37,11 +37,28 @@ function openModal() {
         if (queryInput) {
             setTimeout(() => queryInput.focus(), 300);
         }
+
+        warmUpEpisode();
     } else {
         console.error('❌ Modal element #modalOverlay not found!');
     }
 }
 
+// Preload the episode's indexes while the user types their first question
+let episodeWarmedUp = false;
+
+function warmUpEpisode() {
+    if (episodeWarmedUp) return;
+    episodeWarmedUp = true;
+    if (!apiClient) apiClient = new APIClient();
+    apiClient.warmup(EPISODE_ID)
+        .then(result => console.log('🔥 Episode warm-up:', result.status))
+        .catch(error => {
+            episodeWarmedUp = false;
+            console.warn('Episode warm-up failed:', error.message);
+        });
+}
+
 function closeModal() {
     console.log('🔒 closeModal called');
     modal = document.getElementById('modalOverlay');
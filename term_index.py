@@ -0,0 +1,135 @@
+"""
+Per-episode term index for the hallucination guardrail.
+
+The guardrail refuses questions about guarded terms (models and topics the
+assistant is prone to make things up about) that the episode never mentions.
+It used to run after retrieval and substring-scan the retrieved context and
+paper titles once per term. Now:
+
+- each episode gets a TermIndex, built at ingest (and rebuilt from the episode
+  snapshot in other workers): paper titles, model names, authors, acronyms,
+  plus every guarded term that occurs anywhere in the episode text
+- one compiled regex finds the guarded terms in the query
+- "is this term in the episode" is a set lookup, so off-topic questions are
+  answered before retrieval runs
+"""
+
+import os
+import re
+from typing import FrozenSet, Iterable, List, Optional
+
+from cache import LRUCache
+
+# Terms that MUST be present in the episode to answer safely. If the user asks
+# about one of them and it is nowhere in the episode, the agent returns the
+# strict insufficient-context message.
+DEFAULT_GUARDED_TERMS = [
+    "kandinsky 5.0",
+    "kandinsky5",
+    "sdxl",
+    "gpt-4o",
+    "java virtual machine",
+    "jvm",
+    "python's garbage collector",
+    "python garbage collector",
+    "garbage collector",
+    "garbage collection",
+]
+GUARDED_TERMS = [
+    term.strip().lower()
+    for term in os.getenv("GUARDRAIL_TERMS", ",".join(DEFAULT_GUARDED_TERMS)).split(",")
+    if term.strip()
+]
+
+TERM_INDEX_CACHE_SIZE = int(os.getenv("TERM_INDEX_CACHE_SIZE", "256"))
+
+# Words, hyphen-joined; acronyms and mixed-case names among them are kept
+# (ARC, JiT, DALA, SenseNova-SI-8M, Qwen3-VL)
+_WORD = re.compile(r"\b[A-Za-z][A-Za-z0-9]*(?:-[A-Za-z0-9]+)*\b")
+# Versioned model names: Kandinsky 5.0, GPT-4o, Llama 3.1
+_VERSIONED_NAME = re.compile(r"\b[A-Z][A-Za-z]+(?:[ -]v?\d+(?:\.\d+)*[a-z]?)\b")
+# "Authors: A, B and C" lines in the report
+_AUTHORS_LINE = re.compile(r"^Authors?:\s*(.+)$", re.M)
+_AUTHOR_SPLIT = re.compile(r",|\band\b|\bet al\.?")
+
+
+def _is_name_like(word: str) -> bool:
+    """Two or more capitals (ARC, JiT) or a capitalized word with digits (Qwen3-VL)."""
+    capitals = sum(c.isupper() for c in word)
+    return capitals >= 2 or (capitals == 1 and word[0].isupper() and any(c.isdigit() for c in word))
+
+
+def extract_terms(text: str) -> set:
+    """Model names, acronyms and author names mentioned in `text` (lowercased)."""
+    terms = {word.lower() for word in (m.group(0) for m in _WORD.finditer(text)) if _is_name_like(word)}
+    terms.update(m.group(0).lower() for m in _VERSIONED_NAME.finditer(text))
+    for line in _AUTHORS_LINE.finditer(text):
+        for name in _AUTHOR_SPLIT.split(line.group(1)):
+            name = name.strip(" .")
+            if name and len(name.split()) <= 4:
+                terms.add(name.lower())
+    return terms
+
+
+class GuardedTermMatcher:
+    """One compiled alternation over the guarded terms, longest first."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = sorted({t.lower() for t in terms}, key=len, reverse=True)
+        pattern = "|".join(re.escape(t) for t in self.terms)
+        self._regex = re.compile(rf"(?<![a-z0-9])(?:{pattern})(?![a-z0-9])") if self.terms else None
+
+    def find(self, query: str) -> List[str]:
+        """Guarded terms in the query, in order of appearance."""
+        if self._regex is None:
+            return []
+        return list(dict.fromkeys(m.group(0) for m in self._regex.finditer(query.lower())))
+
+
+guarded_term_matcher = GuardedTermMatcher(GUARDED_TERMS)
+
+
+class TermIndex:
+    """Lowercased terms known to occur in one episode."""
+
+    def __init__(self, episode_id: str, version: int, terms: Iterable[str], titles: Iterable[str] = ()):
+        self.episode_id = episode_id
+        self.version = version
+        self.titles: FrozenSet[str] = frozenset(t for t in titles if t and t.lower() != "none")
+        self.terms: FrozenSet[str] = frozenset(terms) | {t.lower() for t in self.titles}
+
+    def __contains__(self, term: str) -> bool:
+        return term.lower() in self.terms
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def missing_guarded_terms(self, query: str, matcher: GuardedTermMatcher = guarded_term_matcher) -> List[str]:
+        """Guarded terms the query asks about that the episode never mentions."""
+        return [term for term in matcher.find(query) if term not in self.terms]
+
+
+def build_term_index(episode_id: str, version: int, texts: Iterable[str],
+                     titles: Iterable[str] = (), guarded_terms: Iterable[str] = GUARDED_TERMS) -> TermIndex:
+    """Index an episode's chunk texts and paper titles."""
+    titles = [title for title in titles if title]  # plain-text ingests have no paper_title
+    blob = "\n".join(list(texts) + titles)
+    lower_blob = blob.lower()
+    terms = extract_terms(blob)
+    terms.update(term for term in guarded_terms if term in lower_blob)
+    return TermIndex(episode_id, version, terms, titles)
+
+
+_term_indexes = LRUCache(maxsize=TERM_INDEX_CACHE_SIZE)
+
+
+def remember_term_index(index: TermIndex) -> None:
+    _term_indexes.put((index.episode_id, index.version), index)
+
+
+def cached_term_index(episode_id: str, version: int) -> Optional[TermIndex]:
+    return _term_indexes.get((episode_id, version))
+
+
+def clear_term_indexes() -> None:
+    _term_indexes.clear()
@@ -0,0 +1,47 @@
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import fts_index
+import ingest_versions
+
+
+@pytest.fixture(autouse=True)
+def ingest_versions_engine():
+    """Keep ingest versions and FTS rows written by tests out of the real app database."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    ingest_versions.use_engine(engine)
+    fts_index.use_engine(engine)
+    yield engine
+    ingest_versions.use_engine(None)
+    fts_index.use_engine(None)
+
+
+@pytest.fixture
+def make_store():
+    """Builds a MagicMock vector store whose get() returns `docs` as the episode
+    snapshot and whose similarity_search returns `vector_hits` (default `docs`)."""
+    def make(docs, vector_hits=None):
+        store = MagicMock()
+        store.get.return_value = {
+            "ids": [doc.id for doc in docs],
+            "documents": [doc.page_content for doc in docs],
+            "metadatas": [doc.metadata for doc in docs],
+        }
+        store.similarity_search.return_value = list(docs if vector_hits is None else vector_hits)
+        return store
+    return make
+
+
+@pytest.fixture
+def make_agent():
+    """Builds an agent with only the retrieval dependencies wired up (no LLM)."""
+    from agent import EpisodeCompanionAgent
+
+    def make(vector_store):
+        agent = EpisodeCompanionAgent.__new__(EpisodeCompanionAgent)
+        agent.vector_store = vector_store
+        agent.model_name = "fake"
+        return agent
+    return make
@@ -0,0 +1,82 @@
+import pytest
+from langchain_core.documents import Document
+
+import archive_search
+from ingest_versions import bump_ingest_version
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    archive_search.clear_search_caches()
+    yield
+    archive_search.clear_search_caches()
+
+
+def _docs():
+    return [
+        Document(id="a0", page_content="Kandinsky 5.0 is a family of video generation models",
+                 metadata={"episode_id": "ai-research-daily-2025-11-18", "paper_title": "Kandinsky 5.0"}),
+        Document(id="a1", page_content="Today's episode covers video models and visual reasoning",
+                 metadata={"episode_id": "ai-research-daily-2025-11-18", "paper_title": "None"}),
+        Document(id="b0", page_content="ARC is a vision problem according to this paper",
+                 metadata={"episode_id": "ai-research-daily-2025-11-20", "paper_title": "ARC Is a Vision Problem!"}),
+        Document(id="b1", page_content="Video diffusion transformers scale with data",
+                 metadata={"episode_id": "ai-research-daily-2025-11-20", "paper_title": "Video Scaling"}),
+    ]
+
+
+def test_search_ranks_chunks_episodes_and_papers(make_store):
+    store = make_store(_docs(), vector_hits=())
+
+    results = archive_search.search_archive(store, "kandinsky video", semantic=False)
+
+    assert results.chunks[0]["chunk_id"] == "a0"
+    assert results.chunks[0]["date"] == "2025-11-18"
+    assert results.episodes[0]["episode_id"] == "ai-research-daily-2025-11-18"
+    assert results.papers[0]["paper_title"] == "Kandinsky 5.0"
+    assert "None" not in {paper["paper_title"] for paper in results.papers}
+    store.similarity_search.assert_not_called()
+
+
+def test_unfinished_last_word_matches_as_prefix(make_store):
+    store = make_store(_docs(), vector_hits=())
+
+    assert archive_search.search_archive(store, "kandin", semantic=False).chunks[0]["chunk_id"] == "a0"
+    assert archive_search.search_archive(store, "kandin ", semantic=False).total_chunks == 0
+
+
+def test_date_filter_uses_episode_dates_and_scopes_vector_search(make_store):
+    docs = _docs()
+    store = make_store(docs, vector_hits=[docs[3]])
+
+    results = archive_search.search_archive(
+        store, "video", date_from="2025-11-19",
+        episode_dates={"ai-research-daily-2025-11-18": "2025-11-18"},
+    )
+
+    assert {chunk["episode_id"] for chunk in results.chunks} == {"ai-research-daily-2025-11-20"}
+    search_filter = store.similarity_search.call_args.kwargs["filter"]
+    assert search_filter == {"episode_id": {"$in": ["ai-research-daily-2025-11-20"]}}
+
+
+def test_pagination_and_result_cache(make_store):
+    store = make_store(_docs(), vector_hits=())
+
+    first = archive_search.search_archive(store, "video", offset=0, limit=1, semantic=False)
+    second = archive_search.search_archive(store, "video", offset=1, limit=1, semantic=False)
+
+    assert first.total_chunks == second.total_chunks == 3
+    assert first.chunks[0]["chunk_id"] != second.chunks[0]["chunk_id"]
+    assert second.cache_hit
+    store.get.assert_called_once()
+
+
+def test_archive_index_rebuilt_after_ingest(make_store):
+    store = make_store(_docs(), vector_hits=())
+    archive_search.search_archive(store, "video", semantic=False)
+
+    bump_ingest_version("ai-research-daily-2025-11-21")
+    results = archive_search.search_archive(store, "video", semantic=False)
+
+    assert not results.cache_hit
+    assert store.get.call_count == 2
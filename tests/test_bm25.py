@@ -0,0 +1,47 @@
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from bm25 import SparseBM25, tokenize
+
+CORPUS = [
+    "Kandinsky 5.0 is a family of video generation models",
+    "ARC is a vision problem according to this paper",
+    "Today's episode covers video models and visual reasoning",
+    "Physics olympiad benchmark for reasoning models with GPT-4o",
+    "Video video video diffusion",
+]
+
+
+def test_tokenize_keeps_model_names_and_drops_stopwords():
+    assert tokenize("What is GPT-4o and Kandinsky 5.0?") == ["gpt-4o", "kandinsky", "5.0"]
+
+
+def test_scores_match_bm25okapi_on_the_same_tokens():
+    corpus = [tokenize(text) for text in CORPUS]
+    query = ["video", "reasoning", "models", "video", "unknown"]
+
+    expected = BM25Okapi(corpus).get_scores(query)
+
+    np.testing.assert_allclose(SparseBM25(corpus).get_scores(query), expected, rtol=1e-5)
+
+
+def test_top_k_returns_only_matching_documents_best_first():
+    index = SparseBM25([tokenize(text) for text in CORPUS])
+
+    assert index.top_k(["video"], 10) == [4, 0, 2]
+    assert index.top_k(["video"], 1) == [4]
+    assert index.top_k(["nothing"], 10) == []
+
+
+def test_top_k_mask_restricts_candidates():
+    index = SparseBM25([tokenize(text) for text in CORPUS])
+    mask = np.array([True, True, True, True, False])
+
+    assert index.top_k(["video"], 10, mask) == [0, 2]
+
+
+def test_empty_corpus():
+    index = SparseBM25([])
+
+    assert len(index) == 0
+    assert index.top_k(["video"], 5) == []
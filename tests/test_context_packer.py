@@ -0,0 +1,91 @@
+from langchain_core.documents import Document
+
+from context_packer import CONTEXT_SEPARATOR, estimate_tokens, pack_context, strip_overlap
+from episode_index import ChunkView
+
+
+def _view(text, source_type="report", paper_title="None", chunk_index=0, section=None):
+    return ChunkView.create(
+        f"{source_type}-{paper_title}-{chunk_index}",
+        text,
+        {
+            "source_type": source_type,
+            "section": section or source_type,
+            "paper_title": paper_title,
+            "chunk_index": chunk_index,
+        },
+    )
+
+
+LEFT = "Kandinsky 5.0 is a family of video generation models trained at scale."
+RIGHT = "video generation models trained at scale. It also ships image models."
+
+
+def test_strip_overlap_removes_repeated_prefix():
+    assert strip_overlap(LEFT, RIGHT) == " It also ships image models."
+    assert strip_overlap(LEFT, "Unrelated text that shares nothing at all.") == (
+        "Unrelated text that shares nothing at all."
+    )
+
+
+def test_adjacent_chunks_are_merged_without_overlap():
+    first = _view(LEFT, "paper_section", "Kandinsky 5.0", 0)
+    second = _view(RIGHT, "paper_section", "Kandinsky 5.0", 1)
+
+    packed = pack_context([second, first])
+
+    assert len(packed.blocks) == 1
+    assert packed.text == (
+        "[Kandinsky 5.0] (source)\n"
+        "Kandinsky 5.0 is a family of video generation models trained at scale. It also ships image models."
+    )
+    assert [c.id for c in packed.chunks] == [first.id, second.id]
+
+
+def test_non_adjacent_chunks_stay_separate():
+    packed = pack_context([_view(LEFT, chunk_index=0), _view(RIGHT, chunk_index=2)])
+
+    assert len(packed.blocks) == 2
+    assert CONTEXT_SEPARATOR in packed.text
+
+
+def test_report_chunk_duplicating_a_paper_chunk_is_dropped():
+    paper_text = "ARC is framed as a vision problem and solved with a vision transformer trained from scratch."
+    report = _view("## ARC\n" + paper_text, "report", "None", 3)
+    paper = _view(paper_text, "paper_section", "ARC Is a Vision Problem!", 0)
+
+    packed = pack_context([report, paper])
+
+    assert packed.duplicates_dropped == 1
+    assert [c.id for c in packed.chunks] == [paper.id]
+
+
+def test_packing_respects_token_budget_but_keeps_best_block():
+    big = _view("x " * 2000, chunk_index=0, section="a")
+    small = _view("short passage", chunk_index=0, section="b")
+    huge = _view("y " * 4000, chunk_index=0, section="c")
+
+    packed = pack_context([big, huge, small], token_budget=1100)
+
+    assert [c.id for c in packed.chunks] == [big.id, small.id]
+    assert packed.over_budget_dropped == 1
+    assert packed.tokens <= 1100
+
+
+def test_plain_documents_without_chunk_index_are_packed_as_is():
+    doc = Document(page_content="[Episode Overview] (source)\nLegacy text", metadata={})
+
+    assert pack_context([doc]).text == doc.page_content
+    assert estimate_tokens(doc.page_content) == len(doc.page_content) // 4
+
+
+def test_report_block_keeps_only_lines_not_covered_by_papers():
+    paper_text = "ARC is framed as a vision problem and solved with a vision transformer trained from scratch."
+    other = "Kandinsky 5.0 ships a family of video generation models trained at scale for creators."
+    report = _view(paper_text + "\n" + other, "report", "None", 3)
+    paper = _view(paper_text, "paper_section", "ARC Is a Vision Problem!", 0)
+
+    packed = pack_context([paper, report])
+
+    assert packed.duplicates_dropped == 0
+    assert packed.blocks[1].text == other
@@ -114,3 +114,15 @@ class TestConversationManager:
         deleted = manager.cleanup_old_conversations(days_old=30)
         
         assert deleted == 0  # Nothing older than 30 days
+
+
+def test_get_last_retrieval_returns_previous_turn_chunks(test_db):
+    manager = ConversationManager(test_db)
+    assert manager.get_last_retrieval("user-r", "ep-r") is None
+
+    manager.add_interaction("user-r", "ep-r", "First?", "A1", "plain_english",
+                            metadata={"retrieved_chunk_ids": ["a", "b"], "retrieval_query": "first"})
+    manager.add_interaction("user-r", "ep-r", "Second?", "A2", "plain_english",
+                            metadata={"retrieved_chunk_ids": ["c"], "retrieval_query": "first second"})
+
+    assert manager.get_last_retrieval("user-r", "ep-r") == {"chunk_ids": ["c"], "query": "first second"}
@@ -0,0 +1,43 @@
+import numpy as np
+from langchain_core.documents import Document
+
+from diversity import diversify, mmr_order
+from episode_index import VectorIndex
+
+
+def _paper_chunks(rng, papers=4, copies=3, dim=32):
+    """`copies` near-identical chunks per paper, ranked paper by paper."""
+    docs, vectors = [], []
+    for p in range(papers):
+        center = rng.normal(size=dim)
+        for c in range(copies):
+            docs.append(Document(id=f"p{p}-c{c}", page_content=f"paper {p} copy {c}",
+                                 metadata={"paper_title": f"paper {p}"}))
+            vectors.append(center + rng.normal(scale=0.05, size=dim))
+    return docs, np.asarray(vectors)
+
+
+def test_mmr_order_prefers_unseen_clusters():
+    embeddings = np.asarray([[1, 0], [1, 0], [0, 1]], dtype=np.float32)
+    relevance = np.asarray([1.0, 0.9, 0.5], dtype=np.float32)
+
+    assert mmr_order(relevance, embeddings, 2, lambda_mult=0.5) == [0, 2]
+    assert mmr_order(relevance, embeddings, 2, lambda_mult=1.0) == [0, 1]
+
+
+def test_diversify_covers_more_papers_in_top_k():
+    docs, vectors = _paper_chunks(np.random.default_rng(0))
+    index = VectorIndex("ep", 0, docs, vectors)
+
+    plain = docs[:4]
+    diverse = diversify(docs, index, k=4)
+
+    assert len({d.metadata["paper_title"] for d in plain}) == 2
+    assert len({d.metadata["paper_title"] for d in diverse}) == 4
+    assert diverse[0] is docs[0]
+
+
+def test_diversify_without_vector_index_keeps_fused_order():
+    docs, _ = _paper_chunks(np.random.default_rng(1))
+
+    assert diversify(docs, None, k=3) == docs[:3]
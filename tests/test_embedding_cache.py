@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+from embedding_cache import CachedEmbeddings
+
+
+def _embeddings():
+    inner = MagicMock()
+    inner.embed_query.side_effect = lambda text: [float(len(text)), 0.5, -1.0]
+    inner.embed_documents.side_effect = lambda texts: [[1.0] for _ in texts]
+    return inner
+
+
+def test_repeated_query_skips_the_network():
+    inner = _embeddings()
+    cache = CachedEmbeddings(inner, "model-a", path=None)
+
+    first = cache.embed_query("What is JiT?")
+    second = cache.embed_query("  What is   JiT? ")
+
+    assert first == second == [12.0, 0.5, -1.0]
+    inner.embed_query.assert_called_once_with("What is JiT?")
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_tier_is_shared_across_instances(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    CachedEmbeddings(_embeddings(), "model-a", path=path).embed_query("diffusion transformers")
+
+    inner = _embeddings()
+    cache = CachedEmbeddings(inner, "model-a", path=path)
+    assert cache.embed_query("diffusion transformers") == [22.0, 0.5, -1.0]
+    assert cache.embed_query("diffusion transformers") == [22.0, 0.5, -1.0]
+
+    inner.embed_query.assert_not_called()
+    assert (cache.disk_hits, cache.hits, cache.misses) == (1, 1, 0)
+
+
+def test_model_name_is_part_of_the_key(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    CachedEmbeddings(_embeddings(), "model-a", path=path).embed_query("same text")
+
+    inner = _embeddings()
+    CachedEmbeddings(inner, "model-b", path=path).embed_query("same text")
+
+    inner.embed_query.assert_called_once()
+
+
+def test_documents_are_not_cached():
+    inner = _embeddings()
+    cache = CachedEmbeddings(inner, "model-a", path=None)
+
+    cache.embed_documents(["a", "b"])
+    cache.embed_documents(["a", "b"])
+
+    assert inner.embed_documents.call_count == 2
+    assert cache.stats()["misses"] == 0
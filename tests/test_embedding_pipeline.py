@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from embedding_pipeline import add_in_batches, is_transient_error
+
+
+def test_batches_keep_input_order_and_report_progress():
+    seen, reports = [], []
+    lock = threading.Lock()
+
+    def add_batch(batch):
+        with lock:
+            seen.append(list(batch))
+        return [f"id-{i}" for i in batch]
+
+    ids = add_in_batches(list(range(10)), add_batch, batch_size=3, concurrency=3, progress=reports.append)
+
+    assert ids == [f"id-{i}" for i in range(10)]
+    assert sorted(len(batch) for batch in seen) == [1, 3, 3, 3]
+    assert [r.batches_done for r in reports] == [1, 2, 3, 4]
+    assert reports[-1].chunks_done == reports[-1].chunks_total == 10
+
+
+def test_transient_errors_are_retried():
+    calls = {"n": 0}
+
+    def flaky(batch):
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise RuntimeError("429 Resource exhausted")
+        return list(batch)
+
+    assert add_in_batches(["a", "b"], flaky, batch_size=2, max_attempts=3, max_wait_s=0) == ["a", "b"]
+    assert calls["n"] == 3
+
+
+def test_permanent_errors_are_not_retried():
+    calls = {"n": 0}
+
+    def invalid(batch):
+        calls["n"] += 1
+        raise RuntimeError("400 API key not valid. Please pass a valid API key.")
+
+    with pytest.raises(RuntimeError, match="API key"):
+        add_in_batches(["a"], invalid, max_attempts=6, max_wait_s=0)
+    assert calls["n"] == 1
+
+
+def test_transient_error_classification():
+    class ApiError(Exception):
+        def __init__(self, code):
+            super().__init__("error")
+            self.code = code
+
+    assert is_transient_error(ApiError(429)) and is_transient_error(ApiError(503))
+    assert not is_transient_error(ApiError(400)) and not is_transient_error(ApiError(403))
+    assert is_transient_error(TimeoutError()) and is_transient_error(ConnectionResetError())
+    assert is_transient_error(RuntimeError("Deadline Exceeded"))
+    assert not is_transient_error(ValueError("InvalidArgument: text is empty"))
+
+
+def test_persistent_failure_raises_after_other_batches_finish():
+    written = []
+
+    def add_batch(batch):
+        if "bad" in batch:
+            raise RuntimeError("503 Service unavailable")
+        written.extend(batch)
+        return list(batch)
+
+    with pytest.raises(RuntimeError, match="503"):
+        add_in_batches(["a", "bad", "c", "d"], add_batch, batch_size=1, concurrency=2,
+                       max_attempts=2, max_wait_s=0)
+    assert sorted(written) == ["a", "c", "d"]
+
+
+def test_no_items_makes_no_calls():
+    assert add_in_batches([], lambda batch: pytest.fail("called")) == []
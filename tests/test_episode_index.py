@@ -0,0 +1,291 @@
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from langchain_core.documents import Document
+
+import episode_index
+from cache import LRUCache
+from ingest_versions import bump_ingest_version
+
+
+@pytest.fixture(autouse=True)
+def clear_indexes():
+    episode_index.clear_episode_indexes()
+    yield
+    episode_index.clear_episode_indexes()
+
+
+def _docs():
+    return [
+        Document(id="c0", page_content="Kandinsky 5.0 is a family of video generation models",
+                 metadata={"episode_id": "ep", "chunk_index": 0}),
+        Document(id="c1", page_content="ARC is a vision problem according to this paper",
+                 metadata={"episode_id": "ep", "chunk_index": 1}),
+        Document(id="c2", page_content="Physics olympiad benchmark for reasoning models",
+                 metadata={"episode_id": "ep", "chunk_index": 2}),
+    ]
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recent
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lexical_index_built_once_per_episode(make_store):
+    store = make_store(_docs())
+
+    first = episode_index.get_lexical_index(store, "ep-bm25")
+    second = episode_index.get_lexical_index(store, "ep-bm25")
+
+    assert first is second
+    store.get.assert_called_once()
+    store.similarity_search.assert_not_called()
+
+
+def test_lexical_index_rebuilt_after_reingest(make_store):
+    store = make_store(_docs())
+
+    first = episode_index.get_lexical_index(store, "ep-reingest")
+    bump_ingest_version("ep-reingest")
+    second = episode_index.get_lexical_index(store, "ep-reingest")
+
+    assert first is not second
+    assert store.get.call_count == 2
+
+
+def test_lexical_index_ranks_matching_chunk_first(make_store):
+    store = make_store(_docs())
+    index = episode_index.get_lexical_index(store, "ep-rank")
+
+    results = index.top_n("video generation Kandinsky", n=2)
+
+    assert results[0].metadata["chunk_index"] == 0
+
+
+def test_empty_episode_is_not_cached(make_store):
+    store = make_store([])
+
+    assert episode_index.get_lexical_index(store, "ep-empty") is None
+    assert episode_index.get_lexical_index(store, "ep-empty") is None
+    assert store.get.call_count == 2
+
+
+def test_episode_chunks_use_metadata_filter_and_real_count(make_store):
+    docs = _docs() * 100  # more than the old k=200 cutoff
+    store = make_store(docs)
+
+    snapshot = episode_index.get_episode_chunks(store, "ep-big")
+
+    assert len(snapshot) == 300
+    assert snapshot.by_id["c1"].metadata["chunk_index"] == 1
+    store.get.assert_called_once_with(
+        where={"episode_id": "ep-big"},
+        include=["documents", "metadatas"],
+    )
+
+
+def test_episode_chunk_counts_reads_metadata_only():
+    store = MagicMock()
+    store.get.return_value = {
+        "ids": ["a", "b", "c"],
+        "metadatas": [{"episode_id": "ep-1"}, {"episode_id": "ep-1"}, {"episode_id": "ep-2"}],
+    }
+
+    assert episode_index.get_episode_chunk_counts(store) == {"ep-1": 2, "ep-2": 1}
+    store.get.assert_called_once_with(include=["metadatas"])
+
+
+def test_lru_cache_entries_expire_after_ttl(monkeypatch):
+    import cache as cache_module
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = LRUCache(maxsize=4, ttl_seconds=10)
+
+    cache.put("q", ["c1"])
+    now[0] += 5
+    assert cache.get("q") == ["c1"]
+    now[0] += 6
+    assert cache.get("q") is None
+
+
+def _store_with_embeddings(docs, embeddings):
+    store = MagicMock()
+
+    def get(ids=None, where=None, include=None):
+        if include == ["embeddings"]:
+            by_id = dict(zip([d.id for d in docs], embeddings))
+            return {"ids": list(ids), "embeddings": [by_id[i] for i in ids]}
+        return {
+            "ids": [doc.id for doc in docs],
+            "documents": [doc.page_content for doc in docs],
+            "metadatas": [doc.metadata for doc in docs],
+        }
+
+    store.get.side_effect = get
+    return store
+
+
+def test_vector_index_top_k_matches_brute_force():
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(200, 16))
+    docs = [Document(id=f"c{i}", page_content=str(i), metadata={}) for i in range(200)]
+    query = rng.normal(size=16)
+
+    index = episode_index.VectorIndex("ep", 0, docs, matrix)
+    top = index.top_k(query, 10)
+
+    normalized = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:10]
+    assert [doc.id for doc, _ in top] == [f"c{i}" for i in expected]
+    assert [s for _, s in top] == sorted((s for _, s in top), reverse=True)
+
+
+def test_vector_index_loaded_once_per_ingest_version():
+    store = _store_with_embeddings(_docs(), [[1, 0], [0, 1], [1, 1]])
+
+    first = episode_index.get_vector_index(store, "ep-vec")
+    second = episode_index.get_vector_index(store, "ep-vec")
+
+    assert first is second
+    assert store.get.call_count == 2  # snapshot + embeddings
+    assert [doc.id for doc, _ in first.top_k([0, 1], 1)] == ["c1"]
+
+
+def test_large_episode_falls_back_to_chroma(monkeypatch):
+    monkeypatch.setattr(episode_index, "NUMPY_INDEX_MAX_CHUNKS", 2)
+    store = _store_with_embeddings(_docs(), [[1, 0], [0, 1], [1, 1]])
+
+    assert episode_index.get_vector_index(store, "ep-big") is None
+
+
+def test_snapshot_views_are_read_only_and_carry_citation(make_store):
+    docs = [Document(id="c0", page_content="Kandinsky 5.0 is a video model",
+                     metadata={"episode_id": "ep", "citation": "[Kandinsky 5.0] (source)\n"}),
+            Document(id="c1", page_content="Legacy chunk without header metadata",
+                     metadata={"episode_id": "ep", "paper_title": "None"})]
+    store = make_store(docs)
+
+    view, legacy = episode_index.get_episode_chunks(store, "ep-views").docs
+
+    assert view.page_content == "[Kandinsky 5.0] (source)\nKandinsky 5.0 is a video model"
+    assert view.text == "Kandinsky 5.0 is a video model"
+    assert legacy.page_content.startswith("[Episode Overview] (source)\n")
+    with pytest.raises(AttributeError):
+        view.page_content = "mutated"
+    with pytest.raises(TypeError):
+        view.metadata["paper_title"] = "mutated"
+
+
+def _audio_index(sections, per_section, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(sections, dim))
+    n = sections * per_section
+    matrix = topics[np.arange(n) // per_section] + rng.normal(size=(n, dim)) * 0.1
+    docs = [Document(id=f"a{i}", page_content=str(i),
+                     metadata={"source_type": "audio", "section": "audio_transcript", "chunk_index": i})
+            for i in range(n)]
+    return episode_index.VectorIndex("ep", 0, docs, matrix), topics
+
+
+def test_section_index_groups_audio_windows_and_papers():
+    docs = [Document(id=f"a{i}", page_content="", metadata={"source_type": "audio", "chunk_index": i})
+            for i in range(episode_index.SECTION_WINDOW + 1)]
+    docs += [Document(id=f"p{i}", page_content="",
+                      metadata={"source_type": "paper_section", "paper_title": "JiT", "chunk_index": i})
+             for i in range(3)]
+    index = episode_index.VectorIndex("ep", 0, docs, np.eye(len(docs)))
+
+    assert len(index.sections) == 3  # two audio windows + one paper
+    assert [len(rows) for rows in index.sections.rows_by_section] == [episode_index.SECTION_WINDOW, 1, 3]
+
+
+def test_section_index_searches_only_the_best_sections():
+    index, topics = _audio_index(sections=10, per_section=episode_index.SECTION_WINDOW)
+
+    top = index.sections.top_k(topics[3], 5, top_sections=1)
+
+    window = episode_index.SECTION_WINDOW
+    assert len(top) == 5
+    assert all(3 * window <= int(doc.id[1:]) < 4 * window for doc, _ in top)
+
+
+def test_section_index_widens_when_sections_are_too_small():
+    index, topics = _audio_index(sections=10, per_section=episode_index.SECTION_WINDOW)
+
+    top = index.sections.top_k(topics[3], episode_index.SECTION_WINDOW * 2, top_sections=1)
+
+    assert len(top) == episode_index.SECTION_WINDOW * 2
+
+
+def test_vector_search_is_coarse_to_fine_only_for_large_episodes(monkeypatch):
+    index, topics = _audio_index(sections=4, per_section=episode_index.SECTION_WINDOW)
+    monkeypatch.setattr(episode_index, "HIERARCHICAL_MIN_CHUNKS", len(index.docs) + 1)
+    assert index.search(topics[0], 3) == index.top_k(topics[0], 3)
+    assert "sections" not in vars(index)
+
+    monkeypatch.setattr(episode_index, "HIERARCHICAL_MIN_CHUNKS", len(index.docs))
+    index.search(topics[0], 3)
+    assert "sections" in vars(index)
+
+
+def test_warm_episode_loads_snapshot_and_indexes():
+    store = _store_with_embeddings(_docs(), [[1, 0], [0, 1], [1, 1]])
+
+    stats = episode_index.warm_episode(store, "ep-warm")
+
+    assert stats["chunks"] == 3 and stats["vector_index"]
+    calls = store.get.call_count
+    episode_index.get_lexical_index(store, "ep-warm")
+    episode_index.get_vector_index(store, "ep-warm")
+    episode_index.get_term_index(store, "ep-warm")
+    assert store.get.call_count == calls  # everything was already cached
+
+
+def test_schedule_warmup_joins_a_running_job(monkeypatch):
+    import threading
+
+    release = threading.Event()
+    calls = []
+
+    def slow_warm(vector_store, episode_id):
+        calls.append(episode_id)
+        release.wait(5)
+        return {"episode_id": episode_id}
+
+    monkeypatch.setattr(episode_index, "warm_episode", slow_warm)
+    first = episode_index.schedule_warmup(MagicMock(), "ep-join")
+    second = episode_index.schedule_warmup(MagicMock(), "ep-join")
+    release.set()
+
+    assert first is second
+    assert first.result(5) == {"episode_id": "ep-join"}
+    assert calls == ["ep-join"]
+
+
+def test_schedule_warmup_swallows_errors():
+    store = MagicMock()
+    store.get.side_effect = RuntimeError("chroma down")
+
+    assert episode_index.schedule_warmup(store, "ep-broken").result(5) is None
+
+
+def test_chunk_views_are_compact_and_share_metadata_strings(make_store):
+    docs = [Document(id=f"c{i}", page_content=f"chunk {i}",
+                     metadata={"episode_id": "ep-" + "compact", "paper_title": "".join(["Kandinsky", " 5.0"]),
+                               "source_type": "paper_section"})
+            for i in range(2)]
+    store = make_store(docs)
+
+    first, second = episode_index.get_episode_chunks(store, "ep-compact").docs
+
+    assert not hasattr(first, "__dict__")
+    assert first.metadata["paper_title"] is second.metadata["paper_title"]
+    assert first.citation is second.citation
+    assert first.page_content == "[Kandinsky 5.0] (source)\nchunk 0"
+    assert first.to_document().page_content == first.page_content
@@ -0,0 +1,38 @@
+from followup import content_terms, query_delta, retrieves_delta_only
+
+
+def test_content_terms_drop_stopwords_and_duplicates():
+    assert content_terms("What is the Kandinsky 5.0 model, and what is the model for?") == [
+        "kandinsky", "5.0", "model"
+    ]
+
+
+def test_delta_keeps_only_new_terms():
+    delta, follow_up = query_delta("Kandinsky 5.0 video model", "How is the Kandinsky video model trained?")
+
+    assert delta == ["trained"]
+    assert follow_up
+
+
+def test_back_reference_or_bare_question_is_a_follow_up():
+    assert query_delta("Kandinsky 5.0 video model", "What are its limitations?") == (["limitations"], True)
+    assert query_delta("Kandinsky 5.0 video model", "Why?") == ([], True)
+
+
+def test_single_generic_pronoun_does_not_skip_full_retrieval():
+    previous = "Kandinsky 5.0 video model"
+
+    assert query_delta(previous, "Who funded it?")[1]
+    assert not retrieves_delta_only(previous, "Who funded it?")
+    assert not retrieves_delta_only(previous, "What is this weight-sparse circuits paper?")
+    assert retrieves_delta_only(previous, "What are its limitations?")
+    assert retrieves_delta_only(previous, "Is this better than that?")
+    assert retrieves_delta_only(previous, "How is the Kandinsky model trained?")
+    assert retrieves_delta_only(previous, "Why?")
+
+
+def test_unrelated_question_starts_a_new_topic():
+    delta, follow_up = query_delta("Kandinsky 5.0 video model", "Explain weight-sparse transformers circuits")
+
+    assert not follow_up
+    assert delta == ["explain", "weight-sparse", "transformers", "circuits"]
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import fts_index
+
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+def _index(engine, episode_id="ai-research-daily-2025-11-18"):
+    fts_index.index_episode_chunks(
+        episode_id,
+        ["c0", "c1", "c2"],
+        ["Kandinsky 5.0 is a family of video generation models",
+         "ARC is a vision problem according to this paper",
+         "Today's episode covers video models and visual reasoning"],
+        [{"paper_title": "Kandinsky 5.0"}, {"paper_title": "ARC Is a Vision Problem!"}, {"paper_title": "None"}],
+        engine=engine,
+    )
+
+
+def test_search_ranks_episode_chunks_with_bm25(engine):
+    _index(engine)
+
+    ids = fts_index.search_chunk_ids("Which Kandinsky video models?", "ai-research-daily-2025-11-18", 5, engine=engine)
+
+    assert ids[0] == "c0"
+    assert set(ids) == {"c0", "c2"}
+
+
+def test_search_is_scoped_to_episode_and_paper(engine):
+    _index(engine, "ai-research-daily-2025-11-18")
+    _index(engine, "daily-2025-11-18")  # a phrase match on the longer ID
+
+    ids = fts_index.search_chunk_ids("video", "daily-2025-11-18", 10, engine=engine)
+    assert len(ids) == 2
+    assert fts_index.search_chunk_ids("video", "daily-2025-11-18", 10, "Kandinsky 5.0", engine=engine) == ["c0"]
+
+
+def test_unindexed_episode_returns_none_for_fallback(engine):
+    _index(engine)
+
+    assert fts_index.search_chunk_ids("video", "ep-never-ingested", 5, engine=engine) is None
+    assert fts_index.search_chunk_ids("what is it?", "ai-research-daily-2025-11-18", 5, engine=engine) == []
+
+
+def test_reindex_replaces_episode_rows(engine):
+    _index(engine)
+    fts_index.index_episode_chunks("ai-research-daily-2025-11-18", ["c9"], ["Physics olympiad benchmark"],
+                                   [{}], engine=engine)
+
+    assert fts_index.search_chunk_ids("video", "ai-research-daily-2025-11-18", 5, engine=engine) == []
+    assert fts_index.search_chunk_ids("physics", "ai-research-daily-2025-11-18", 5, engine=engine) == ["c9"]
+
+
+def test_query_quotes_fts_syntax():
+    match = fts_index.match_expression('gpt-4o "NEAR" OR', "ep")
+
+    assert match == 'episode_id:"ep" AND text:("gpt-4o" OR "near")'
@@ -1,11 +1,12 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from ingest import ingest_episode
+from ingest import ingest_episode, make_chunk_id
 
+@patch("ingest._index_fts")
 @patch("ingest.Chroma")
 @patch("ingest.GoogleGenerativeAIEmbeddings")
 @patch("ingest.RecursiveCharacterTextSplitter")
-def test_ingest_episode(mock_splitter, mock_embeddings, mock_chroma):
+def test_ingest_episode(mock_splitter, mock_embeddings, mock_chroma, mock_index_fts):
     # Mock splitter
     mock_splitter_instance = MagicMock()
     mock_splitter.return_value = mock_splitter_instance
@@ -23,8 +24,110 @@ def test_ingest_episode(mock_splitter, mock_embeddings, mock_chroma):
     
     assert result["episode_id"] == "test_ep"
     assert result["chunks_count"] == 2
-    assert result["ids"] == ["id1", "id2"]
+    assert result["ids"] == [make_chunk_id("test_ep", "text", "None", text) for text in ("chunk1", "chunk2")]
     
     # Verify calls
     mock_splitter_instance.create_documents.assert_called_once()
     mock_vector_store.add_documents.assert_called_once()
+
+
+def test_citation_header_defaults_to_episode_overview():
+    from ingest import citation_header
+
+    assert citation_header("Kandinsky 5.0") == "[Kandinsky 5.0] (source)\n"
+    assert citation_header("None") == "[Episode Overview] (source)\n"
+    assert citation_header(None) == "[Episode Overview] (source)\n"
+
+
+class FakeStore:
+    """Minimal Chroma stand-in that records embeddings calls."""
+
+    def __init__(self):
+        self.rows = {}
+        self.embedded = []
+        self._collection = MagicMock()
+        self._collection.update.side_effect = self._update
+
+    def get(self, where=None, include=None):
+        ids = [i for i, (_, md) in self.rows.items() if md["episode_id"] == where["episode_id"]]
+        return {"ids": ids, "metadatas": [self.rows[i][1] for i in ids]}
+
+    def add_texts(self, texts, metadatas=None, ids=None):
+        self.embedded.extend(texts)
+        for chunk_id, text, md in zip(ids, texts, metadatas):
+            self.rows[chunk_id] = (text, dict(md))
+        return ids
+
+    def add_documents(self, documents, ids=None):
+        return self.add_texts([d.page_content for d in documents], [d.metadata for d in documents], ids)
+
+    def delete(self, ids=None):
+        for chunk_id in ids:
+            del self.rows[chunk_id]
+
+    def _update(self, ids, metadatas):
+        for chunk_id, md in zip(ids, metadatas):
+            self.rows[chunk_id][1].update(md)
+
+
+def _bundle(paper_texts):
+    from ingest import EpisodeBundleGpk, PaperEntryGpk
+
+    return EpisodeBundleGpk(
+        episode_id="ep-incremental", date_str="2025-11-19", hook="", listen_url="",
+        full_report="Daily report intro.",
+        audio_transcript=None,
+        papers=[PaperEntryGpk(title=title, text_content=text) for title, text in paper_texts],
+    )
+
+
+def test_reingest_embeds_only_changed_chunks(monkeypatch):
+    import ingest
+
+    store = FakeStore()
+    monkeypatch.setattr(ingest, "get_vector_store", lambda: store)
+    monkeypatch.setattr(ingest, "_index_fts", lambda *args: None)
+    papers = [("Kandinsky 5.0", "Kandinsky is a video model."), ("JiT", "JiT predicts clean images.")]
+
+    first = ingest.ingest_bundle_gpk(_bundle(papers))
+    again = ingest.ingest_bundle_gpk(_bundle(papers))
+    fixed = ingest.ingest_bundle_gpk(_bundle([papers[0], ("JiT", "JiT predicts clean images directly.")]))
+
+    assert first["chunks_added"] == 3
+    assert again["chunks_added"] == 0 and again["chunks_deleted"] == 0
+    assert fixed["chunks_added"] == 1 and fixed["chunks_deleted"] == 1
+    assert store.embedded[3:] == ["JiT predicts clean images directly."]
+    assert sorted(text for text, _ in store.rows.values()) == [
+        "Daily report intro.", "JiT predicts clean images directly.", "Kandinsky is a video model."]
+
+
+def test_reingest_relabels_moved_chunks_without_embedding(monkeypatch):
+    import ingest
+
+    store = FakeStore()
+    monkeypatch.setattr(ingest, "get_vector_store", lambda: store)
+    monkeypatch.setattr(ingest, "_index_fts", lambda *args: None)
+    ingest.ingest_bundle_gpk(_bundle([("JiT", "JiT predicts clean images.")]))
+
+    bundle = _bundle([("JiT", "JiT predicts clean images.")])
+    bundle.papers[0].timestamp_start, bundle.papers[0].timestamp_end = 60, 120
+    result = ingest.ingest_bundle_gpk(bundle)
+
+    assert result["chunks_added"] == 0
+    jit = next(md for text, md in store.rows.values() if text.startswith("JiT"))
+    assert (jit["timestamp_start"], jit["timestamp_end"]) == (60, 120)
+    store._collection.update.assert_called_once()
+
+
+def test_reingesting_unchanged_text_still_returns_its_chunk_ids(monkeypatch):
+    import ingest
+
+    store = FakeStore()
+    monkeypatch.setattr(ingest, "get_vector_store", lambda: store)
+    monkeypatch.setattr(ingest, "_index_fts", lambda *args: None)
+
+    first = ingest.ingest_episode("ep-plain", "Plain notes about JiT and Kandinsky.")
+    again = ingest.ingest_episode("ep-plain", "Plain notes about JiT and Kandinsky.")
+
+    assert first["ids"] == again["ids"] == list(store.rows)
+    assert (first["chunks_added"], again["chunks_added"]) == (1, 0)
@@ -0,0 +1,41 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+import ingest_versions
+
+
+def test_bump_increments_episode_and_archive_versions():
+    assert ingest_versions.get_ingest_version("ep-a") == 0
+    assert ingest_versions.get_archive_version() == 0
+
+    assert ingest_versions.bump_ingest_version("ep-a") == 1
+    assert ingest_versions.bump_ingest_version("ep-a") == 2
+    assert ingest_versions.bump_ingest_version("ep-b") == 1
+
+    assert ingest_versions.get_ingest_version("ep-a") == 2
+    assert ingest_versions.get_archive_version() == 3
+
+
+def test_bump_by_another_process_is_seen_after_ttl(ingest_versions_engine, monkeypatch):
+    assert ingest_versions.get_ingest_version("ep-shared") == 0
+
+    # Another process bumps the row directly in the shared database
+    with ingest_versions_engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {ingest_versions.VERSIONS_TABLE} (episode_id, version) "
+                          "VALUES ('ep-shared', 1)"))
+    assert ingest_versions.get_ingest_version("ep-shared") == 0  # cached read
+
+    ingest_versions._read_cache.clear()  # the TTL expires
+    assert ingest_versions.get_ingest_version("ep-shared") == 1
+    assert ingest_versions.get_archive_version() == 1
+
+
+def test_unreachable_database_falls_back_to_local_counter():
+    broken = create_engine("sqlite:////nonexistent-dir/versions.db", poolclass=StaticPool)
+    ingest_versions.use_engine(broken)
+
+    assert ingest_versions.bump_ingest_version("ep-local") == 1
+    assert ingest_versions.bump_ingest_version("ep-local") == 2
+    ingest_versions._read_cache.clear()
+    assert ingest_versions.get_ingest_version("ep-local") == 2
+    assert ingest_versions.get_archive_version() == 2
@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import patch
+from langchain_core.documents import Document
+
+import agent as agent_module
+import episode_index
+from agent import INSUFFICIENT_MSG
+from ingest_versions import bump_ingest_version
+from negative_cache import REASON_GROUNDING, REASON_GUARDRAIL, NegativeCache, negative_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    episode_index.clear_episode_indexes()
+    negative_cache.clear()
+    yield
+    episode_index.clear_episode_indexes()
+    negative_cache.clear()
+
+
+@pytest.fixture
+def agent(make_store, make_agent):
+    docs = [Document(id="c0", page_content="Kandinsky 5.0 is a family of video generation models",
+                     metadata={"episode_id": "ep", "paper_title": "Kandinsky 5.0", "chunk_index": 0})]
+    return make_agent(make_store(docs))
+
+
+def test_entries_are_keyed_by_normalized_query_and_invalidated_on_reingest():
+    cache = NegativeCache()
+    cache.put("ep-neg", "What is SDXL?", REASON_GROUNDING, {"grounded": False})
+
+    assert cache.get("ep-neg", "  what is sdxl ")["reason"] == REASON_GROUNDING
+    assert cache.get("ep-other", "What is SDXL?") is None
+    bump_ingest_version("ep-neg")
+    assert cache.get("ep-neg", "What is SDXL?") is None
+
+
+def test_grounding_failures_are_per_mode_and_guardrail_refusals_are_not():
+    cache = NegativeCache()
+    cache.put("ep-neg-mode", "Who funded this?", REASON_GROUNDING, {"grounded": False}, mode="plain_english")
+    cache.put("ep-neg-mode", "What is SDXL?", REASON_GUARDRAIL, {"grounded": False}, mode="plain_english")
+
+    assert cache.get("ep-neg-mode", "Who funded this?", "plain_english")["reason"] == REASON_GROUNDING
+    assert cache.get("ep-neg-mode", "Who funded this?", "founder_takeaway") is None
+    assert cache.get("ep-neg-mode", "What is SDXL?", "founder_takeaway")["reason"] == REASON_GUARDRAIL
+
+
+def test_repeated_guardrail_refusal_skips_the_term_index(agent):
+    first = agent.get_answer("ep-neg-guard", "plain_english", "How do I implement SDXL from this episode?")
+
+    with patch.object(agent_module, "get_term_index") as get_term_index:
+        second = agent.get_answer("ep-neg-guard", "founder_takeaway", "how do I implement SDXL from this episode")
+
+    get_term_index.assert_not_called()
+    assert first["answer"] == second["answer"] == INSUFFICIENT_MSG
+    assert second["metadata"]["quality_checks"]["negative_cache_hit"]
+    assert second["metadata"]["source_papers"] == first["metadata"]["source_papers"]
+
+
+def test_cached_grounding_failure_is_returned_without_retrieval(agent):
+    negative_cache.put("ep-neg-ground", "Who funded this?", REASON_GROUNDING,
+                       {"grounded": False, "grounding_failed": True})
+
+    with patch.object(agent, "_retrieve_routed") as retrieve:
+        resp = agent.get_answer("ep-neg-ground", "plain_english", "Who funded this?")
+
+    retrieve.assert_not_called()
+    assert resp["answer"] == INSUFFICIENT_MSG
+    assert resp["metadata"]["quality_checks"]["grounding_failed"]
+    assert resp["metadata"]["stage_latency"]["negative_cache_hit"] == 1.0
+
+
+def test_follow_ups_bypass_the_negative_cache(agent):
+    negative_cache.put("ep-neg-follow", "Who funded it?", REASON_GROUNDING, {"grounded": False})
+    previous = {"chunk_ids": ["c0"], "query": "Who built Kandinsky 5.0?"}
+
+    with patch.object(agent, "_retrieve_follow_up", side_effect=RuntimeError("stop")) as follow_up:
+        with pytest.raises(RuntimeError):
+            agent.get_answer("ep-neg-follow", "plain_english", "Who funded it?", previous_retrieval=previous)
+
+    follow_up.assert_called_once()
@@ -57,3 +57,26 @@ def test_mode_classification(orchestrator):
     assert orchestrator._classify_mode("What is the business value?") == "founder_takeaway"
     assert orchestrator._classify_mode("Show me the code") == "engineer_angle"
     assert orchestrator._classify_mode("Explain simply") == "plain_english"
+
+def test_resumed_episode_is_warmed_up(orchestrator):
+    from unittest.mock import patch
+
+    with patch("orchestrator.ConversationManager") as manager_cls:
+        manager = manager_cls.return_value
+        manager.get_last_episode_id.return_value = "episode_789"
+        manager.get_last_retrieval.return_value = None
+        orchestrator.route_request("user5", "What is the main idea?", mode="plain_english", db=MagicMock())
+
+    orchestrator.episode_agent.warm_up.assert_called_once_with("episode_789")
+    assert orchestrator.episode_agent.get_answer.call_args.kwargs["episode_id"] == "episode_789"
+
+
+def test_explicit_episode_is_not_warmed_up(orchestrator):
+    from unittest.mock import patch
+
+    with patch("orchestrator.ConversationManager") as manager_cls:
+        manager_cls.return_value.get_last_retrieval.return_value = None
+        orchestrator.route_request("user6", "What is the main idea?", episode_id="episode_1",
+                                   mode="plain_english", db=MagicMock())
+
+    orchestrator.episode_agent.warm_up.assert_not_called()
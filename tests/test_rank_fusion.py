@@ -0,0 +1,62 @@
+import pytest
+from langchain_core.documents import Document
+
+from rank_fusion import chunk_key, fuse_with_scores, reciprocal_rank_fusion
+
+
+def _doc(chunk_id, chunk_index=0, priority=1, text=None):
+    return Document(
+        page_content=text or f"text of {chunk_id}",
+        metadata={"chunk_id": chunk_id, "chunk_index": chunk_index, "priority": priority},
+    )
+
+
+def test_colliding_chunk_index_values_are_kept_apart():
+    # chunk_index 0 exists in the report, the audio transcript and every paper
+    report = _doc("report-0", chunk_index=0)
+    audio = _doc("audio-0", chunk_index=0)
+    paper = _doc("paper-0", chunk_index=0)
+
+    fused = reciprocal_rank_fusion([[report, audio], [paper]])
+
+    assert {chunk_key(d) for d in fused} == {"report-0", "audio-0", "paper-0"}
+
+
+def test_same_chunk_from_several_retrievers_is_deduped_and_boosted():
+    shared = _doc("shared")
+    only_vector = _doc("vector-only")
+    only_bm25 = _doc("bm25-only")
+
+    fused = reciprocal_rank_fusion([[only_vector, shared], [only_bm25, shared]], boost=None)
+
+    assert len(fused) == 3
+    assert chunk_key(fused[0]) == "shared"
+
+
+def test_weights_shift_the_ranking():
+    a, b = _doc("a"), _doc("b")
+
+    assert chunk_key(reciprocal_rank_fusion([[a], [b]], weights=[1.0, 2.0], boost=None)[0]) == "b"
+    assert chunk_key(reciprocal_rank_fusion([[a], [b]], weights=[2.0, 1.0], boost=None)[0]) == "a"
+
+
+def test_n_way_scores_follow_rrf_formula():
+    a, b = _doc("a"), _doc("b")
+
+    scored = dict((chunk_key(d), s) for d, s in fuse_with_scores([[a, b], [b], [a]], k=60, boost=None))
+
+    assert scored["a"] == pytest.approx(1 / 60 + 1 / 60)
+    assert scored["b"] == pytest.approx(1 / 61 + 1 / 60)
+
+
+def test_mismatched_weights_raise():
+    with pytest.raises(ValueError):
+        reciprocal_rank_fusion([[_doc("a")]], weights=[1.0, 1.0])
+
+
+def test_chunk_key_falls_back_to_store_id_then_content_hash():
+    with_store_id = Document(page_content="x", metadata={}, id="chroma-uuid")
+    legacy = Document(page_content="same text", metadata={})
+
+    assert chunk_key(with_store_id) == "chroma-uuid"
+    assert chunk_key(legacy) == chunk_key(Document(page_content="same text", metadata={}))
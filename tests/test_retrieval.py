@@ -0,0 +1,326 @@
+import time
+from concurrent.futures import wait
+import pytest
+from unittest.mock import patch
+from langchain_core.documents import Document
+
+import agent as agent_module
+import episode_index
+from ingest_versions import bump_ingest_version
+from negative_cache import negative_cache
+from retrieval_cache import retrieval_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_indexes():
+    episode_index.clear_episode_indexes()
+    yield
+    episode_index.clear_episode_indexes()
+
+
+def _docs():
+    return [
+        Document(id="c0", page_content="Kandinsky 5.0 is a family of video generation models",
+                 metadata={"episode_id": "ep", "paper_title": "Kandinsky 5.0", "chunk_index": 0, "priority": 4}),
+        Document(id="c1", page_content="ARC is a vision problem according to this paper",
+                 metadata={"episode_id": "ep", "paper_title": "ARC Is a Vision Problem!", "chunk_index": 0, "priority": 4}),
+        Document(id="c2", page_content="Today's episode covers video models and visual reasoning",
+                 metadata={"episode_id": "ep", "paper_title": "None", "chunk_index": 1, "priority": 1}),
+    ]
+
+
+def test_retrieve_fuses_vector_and_lexical_results(make_store, make_agent):
+    store = make_store(_docs())
+
+    docs = make_agent(store)._retrieve_gpk("ep", "Kandinsky video generation", k=2)
+
+    assert len(docs) == 2
+    assert docs[0].page_content.startswith("[Kandinsky 5.0] (source)\n")
+    store.similarity_search.assert_called_once()
+
+
+def test_slow_vector_search_does_not_block_lexical_results(make_store, make_agent):
+    store = make_store(_docs())
+
+    def slow_search(*args, **kwargs):
+        time.sleep(1.0)
+        return _docs()
+
+    store.similarity_search.side_effect = slow_search
+    submitted = []
+    submit = agent_module._retrieval_pool.submit
+
+    def track(*args, **kwargs):
+        submitted.append(submit(*args, **kwargs))
+        return submitted[-1]
+
+    with patch.object(agent_module, "VECTOR_SEARCH_TIMEOUT_S", 0.1), \
+            patch.object(agent_module._retrieval_pool, "submit", side_effect=track):
+        try:
+            started = time.monotonic()
+            docs = make_agent(store)._retrieve_gpk("ep", "Kandinsky video generation", k=2)
+            elapsed = time.monotonic() - started
+        finally:
+            # The abandoned vector search must not outlive the test's database fixture
+            wait(submitted)
+
+    assert elapsed < 0.8
+    assert docs, "lexical results should still be returned"
+    assert "Kandinsky" in docs[0].page_content
+
+
+def test_failing_vector_search_falls_back_to_lexical(make_store, make_agent):
+    store = make_store(_docs())
+    store.similarity_search.side_effect = RuntimeError("embedding API down")
+
+    docs = make_agent(store)._retrieve_gpk("ep", "ARC vision problem", k=1)
+
+    assert docs[0].metadata["paper_title"] == "ARC Is a Vision Problem!"
+
+
+def test_repeated_question_is_served_from_retrieval_cache(make_store, make_agent):
+    retrieval_cache.clear()
+    store = make_store(_docs())
+    agent = make_agent(store)
+
+    first, first_hit = agent._retrieve_candidates("ep-cache", "Kandinsky video generation", depth=2)
+    second, second_hit = agent._retrieve_candidates("ep-cache", "  kandinsky VIDEO generation? ", depth=2)
+
+    assert (first_hit, second_hit) == (False, True)
+    assert [d.id for d in first] == [d.id for d in second]
+    store.similarity_search.assert_called_once()
+
+
+def test_retrieval_cache_invalidated_on_reingest(make_store, make_agent):
+    retrieval_cache.clear()
+    store = make_store(_docs())
+    agent = make_agent(store)
+
+    agent._retrieve_candidates("ep-stale", "ARC vision", depth=2)
+    bump_ingest_version("ep-stale")
+    _docs_after, hit = agent._retrieve_candidates("ep-stale", "ARC vision", depth=2)
+
+    assert hit is False
+    assert store.similarity_search.call_count == 2
+
+
+def test_critic_retry_reuses_first_ranking(make_store, make_agent):
+    from langchain_core.runnables import RunnableLambda
+    from response_formatter import ResponseFormatter
+
+    retrieval_cache.clear()
+    store = make_store(_docs())
+    agent = make_agent(store)
+    # Never returns critic JSON, so the answer is judged ungrounded and retried
+    agent.llm = RunnableLambda(lambda _inputs: "An answer that the critic cannot parse.")
+    agent.formatter = ResponseFormatter()
+
+    negative_cache.clear()
+    resp = agent.get_answer("ep-retry", "plain_english", "Compare Kandinsky versus ARC")
+
+    assert resp["metadata"]["question_type"] == "compare"
+    store.similarity_search.assert_called_once()
+    # A critic that never parsed is not a grounding verdict, so nothing is cached
+    assert negative_cache.get("ep-retry", "Compare Kandinsky versus ARC", "plain_english") is None
+
+
+def test_parsed_grounding_failure_is_cached_for_its_mode_only(make_store, make_agent):
+    from langchain_core.runnables import RunnableLambda
+    from response_formatter import ResponseFormatter
+
+    retrieval_cache.clear()
+    negative_cache.clear()
+    agent = make_agent(make_store(_docs()))
+    agent.llm = RunnableLambda(lambda _inputs: '{"grounded": false, "issues": ["unsupported claim"]}')
+    agent.formatter = ResponseFormatter()
+
+    agent.get_answer("ep-verdict", "plain_english", "Compare Kandinsky versus ARC")
+
+    assert negative_cache.get("ep-verdict", "Compare Kandinsky versus ARC", "plain_english") is not None
+    assert negative_cache.get("ep-verdict", "Compare Kandinsky versus ARC", "founder_takeaway") is None
+
+
+def test_small_episode_uses_in_process_vector_index(make_store, make_agent):
+    docs = _docs()
+    store = make_store(docs)
+    embeddings = {"c0": [1.0, 0.0], "c1": [0.0, 1.0], "c2": [0.7, 0.7]}
+    snapshot_result = store.get.return_value
+
+    def get(ids=None, where=None, include=None):
+        if include == ["embeddings"]:
+            return {"ids": list(ids), "embeddings": [embeddings[i] for i in ids]}
+        return snapshot_result
+
+    store.get.side_effect = get
+    store.embeddings.embed_query.return_value = [0.0, 1.0]
+
+    hits = make_agent(store)._vector_search("ep-numpy", "ARC", n=2)
+
+    assert [doc.id for doc, _ in hits] == ["c1", "c2"]
+    store.similarity_search.assert_not_called()
+
+
+def test_store_read_failure_skips_guardrail_and_falls_back_to_hybrid(make_store, make_agent):
+    from langchain_core.runnables import RunnableLambda
+    from response_formatter import ResponseFormatter
+
+    retrieval_cache.clear()
+    store = make_store(_docs())
+    store.get.side_effect = RuntimeError("chroma unavailable")
+    agent = make_agent(store)
+    agent.llm = RunnableLambda(lambda _inputs: "Kandinsky 5.0 is a family of video models [Kandinsky 5.0].")
+    agent.formatter = ResponseFormatter()
+
+    resp = agent.get_answer("ep-store-down", "plain_english", "Give me a TL;DR of this episode")
+
+    assert resp["metadata"]["retrieval_strategy"] == "hybrid"
+    store.similarity_search.assert_called_once()
+
+
+def test_guardrail_answers_off_topic_question_before_retrieval(make_store, make_agent):
+    from agent import INSUFFICIENT_MSG
+
+    store = make_store(_docs())
+    agent = make_agent(store)
+
+    resp = agent.get_answer("ep-guard", "plain_english", "How do I implement SDXL from this episode?")
+
+    assert resp["answer"] == INSUFFICIENT_MSG
+    assert resp["metadata"]["quality_checks"]["reason"] == "'sdxl' not in episode content"
+    store.similarity_search.assert_not_called()
+
+
+def test_guardrail_allows_terms_the_episode_mentions(make_store):
+    store = make_store(_docs())
+
+    index = episode_index.get_term_index(store, "ep-guard-ok")
+
+    assert index.missing_guarded_terms("How does Kandinsky 5.0 work?") == []
+
+
+def test_episode_summary_is_served_from_overview_chunks(make_store, make_agent):
+    from retrieval_router import RetrievalRoute
+
+    store = make_store(_docs())
+
+    candidates, _hit, strategy = make_agent(store)._retrieve_routed(RetrievalRoute("overview"), "ep-overview", "x")
+
+    assert strategy == "overview"
+    assert {d.id for d in candidates} == {"c0", "c1", "c2"}
+    store.similarity_search.assert_not_called()
+
+
+def test_named_paper_question_uses_only_that_papers_chunks(make_store, make_agent):
+    from retrieval_router import RetrievalRoute
+
+    docs = _docs()
+    for doc in docs[:2]:
+        doc.metadata["source_type"] = "paper_section"
+    store = make_store(docs)
+
+    candidates, _hit, strategy = make_agent(store)._retrieve_routed(
+        RetrievalRoute("paper", "Kandinsky 5.0"), "ep-paper", "How does Kandinsky 5.0 work?"
+    )
+
+    assert strategy == "paper"
+    assert [d.id for d in candidates] == ["c0"]
+    store.similarity_search.assert_not_called()
+
+
+def test_time_anchored_question_uses_overlapping_chunks(make_store, make_agent):
+    from retrieval_router import RetrievalRoute
+
+    docs = _docs()
+    docs[0].metadata.update(timestamp_start=150, timestamp_end=240)
+    docs[1].metadata.update(timestamp_start=260, timestamp_end=320)
+    store = make_store(docs)
+
+    candidates, _hit, strategy = make_agent(store)._retrieve_routed(
+        RetrievalRoute("time", timestamp=200), "ep-time", "what did they say around 3:20?"
+    )
+
+    assert strategy == "time"
+    assert [d.id for d in candidates] == ["c0"]
+    store.similarity_search.assert_not_called()
+
+
+def test_long_paper_is_searched_with_paper_scoped_vector_and_lexical_search(make_store, make_agent):
+    from retrieval_router import RetrievalRoute
+
+    paper = [
+        Document(id=f"k{i}", page_content=f"Kandinsky section {i} about {'video' if i == 4 else 'images'}",
+                 metadata={"episode_id": "ep", "paper_title": "Kandinsky 5.0", "source_type": "paper_section",
+                           "chunk_index": i, "priority": 4})
+        for i in range(8)
+    ]
+    other = Document(id="o0", page_content="video video video from another paper",
+                     metadata={"episode_id": "ep", "paper_title": "Other", "source_type": "paper_section",
+                               "chunk_index": 0, "priority": 4})
+    store = make_store(paper + [other])
+    store.similarity_search.return_value = []
+
+    candidates, _hit, strategy = make_agent(store)._retrieve_routed(
+        RetrievalRoute("paper", "Kandinsky 5.0"), "ep-long-paper", "Kandinsky video", depth=3
+    )
+
+    assert strategy == "paper"
+    assert candidates[0].id == "k4"
+    assert all(d.metadata["paper_title"] == "Kandinsky 5.0" for d in candidates)
+    assert store.similarity_search.call_args.kwargs["filter"] == {
+        "$and": [{"episode_id": "ep-long-paper"}, {"paper_title": "Kandinsky 5.0"}]
+    }
+
+
+def test_follow_up_reuses_previous_chunks_without_retrieval(make_store, make_agent):
+    store = make_store(_docs())
+
+    candidates, hit, query = make_agent(store)._retrieve_follow_up(
+        "ep-follow", "Why?", {"chunk_ids": ["c1", "c0", "gone-after-reingest"], "query": "ARC vision problem"}
+    )
+
+    assert [d.id for d in candidates] == ["c1", "c0"]
+    assert (hit, query) == (False, "ARC vision problem")
+    store.similarity_search.assert_not_called()
+
+
+def test_follow_up_retrieves_only_the_new_terms(make_store, make_agent):
+    retrieval_cache.clear()
+    store = make_store(_docs())
+
+    candidates, _hit, query = make_agent(store)._retrieve_follow_up(
+        "ep-delta", "How does ARC compare on video generation?", {"chunk_ids": ["c1"], "query": "ARC vision problem"}
+    )
+
+    assert store.similarity_search.call_args.args[0] == "compare video generation"
+    assert {"c0", "c1"} <= {d.id for d in candidates}
+    assert query == "How does ARC compare on video generation?"
+
+
+def test_new_topic_does_not_use_warm_pool(make_store, make_agent):
+    store = make_store(_docs())
+
+    assert make_agent(store)._retrieve_follow_up(
+        "ep-new", "Kandinsky video generation", {"chunk_ids": ["c1"], "query": "ARC vision problem"}
+    ) is None
+    assert make_agent(store)._retrieve_follow_up(
+        "ep-new", "Who funded it?", {"chunk_ids": ["c1"], "query": "ARC vision problem"}
+    ) is None
+
+
+def test_lexical_search_uses_shared_fts_index_when_episode_is_indexed(monkeypatch, make_store, make_agent):
+    store = make_store(_docs())
+    monkeypatch.setattr(agent_module, "search_chunk_ids", lambda *args: ["c1", "missing"])
+
+    results = make_agent(store)._lexical_search("ep-fts", "vision problem", 5)
+
+    assert [d.id for d in results] == ["c1"]
+    assert episode_index._lexical_indexes.get(("ep-fts", 0, None)) is None
+
+
+def test_lexical_search_falls_back_to_bm25_for_unindexed_episode(monkeypatch, make_store, make_agent):
+    store = make_store(_docs())
+    monkeypatch.setattr(agent_module, "search_chunk_ids", lambda *args: None)
+
+    results = make_agent(store)._lexical_search("ep-nofts", "ARC vision problem", 1)
+
+    assert [d.id for d in results] == ["c1"]
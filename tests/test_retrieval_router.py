@@ -0,0 +1,54 @@
+from retrieval_router import (STRATEGY_HYBRID, STRATEGY_OVERVIEW, STRATEGY_PAPER, STRATEGY_TIME,
+                              find_named_paper, route_question)
+
+TITLES = [
+    "Back to Basics: Let Denoising Generative Models Denoise",
+    "Kandinsky 5.0",
+    "ARC Is a Vision Problem!",
+]
+
+
+def test_tldr_and_episode_summaries_use_overview():
+    assert route_question("tldr", "Give me a 3-bullet TL;DR", TITLES).strategy == STRATEGY_OVERVIEW
+    assert route_question("summary", "Summarize this episode", TITLES).strategy == STRATEGY_OVERVIEW
+    assert route_question("why_how", "Explain this episode like I'm new", TITLES).strategy == STRATEGY_OVERVIEW
+
+
+def test_summary_of_a_specific_thing_stays_hybrid():
+    assert route_question("summary", "What is JiT?", TITLES).strategy == STRATEGY_HYBRID
+    assert route_question("why_how", "How does diffusion work?", TITLES).strategy == STRATEGY_HYBRID
+
+
+def test_named_paper_routes_to_paper_search():
+    route = route_question("why_how", "Why does Back to Basics predict clean data?", TITLES)
+
+    assert route.strategy == STRATEGY_PAPER
+    assert route.paper_title == TITLES[0]
+    assert route_question("summary", "Summarize Kandinsky 5.0", TITLES).paper_title == "Kandinsky 5.0"
+
+
+def test_papers_are_detected_by_distinctive_title_terms():
+    titles = TITLES + ["Just image Transformers (JiT) for pixels"]
+
+    assert find_named_paper("explain ARC for me", titles) == "ARC Is a Vision Problem!"
+    assert find_named_paper("How is jit trained?", titles) == titles[-1]
+    assert find_named_paper("What does the episode say about transformers?", titles) is None
+
+
+def test_questions_naming_several_papers_or_comparing_do_not_route_to_one_paper():
+    assert find_named_paper("Kandinsky 5.0 or ARC, which is better?", TITLES) is None
+    assert route_question("compare", "Compare Kandinsky versus ARC", TITLES).strategy == STRATEGY_HYBRID
+
+
+def test_time_anchored_questions_route_to_time_index():
+    route = route_question("general", "What did they say around 3:20?", TITLES)
+
+    assert route.strategy == STRATEGY_TIME
+    assert route.timestamp == 200
+
+
+def test_named_paper_takes_precedence_over_time_anchor():
+    route = route_question("general", "What did they say about Kandinsky 5.0 at 3:20?", TITLES)
+
+    assert route.strategy == STRATEGY_PAPER
+    assert route_question("general", "Can Kandinsky 5.0 make a 10 minutes video?", TITLES).strategy == STRATEGY_PAPER
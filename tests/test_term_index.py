@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+
+import episode_index
+from term_index import GuardedTermMatcher, build_term_index, extract_terms
+
+REPORT = """1. Back to Basics: Let Denoising Generative Models Denoise
+Authors: Tianhong Li, Kaiming He
+Key Innovation: "Just image Transformers" (JiT) uses large-patch Transformers.
+Kandinsky 5.0 and Qwen3-VL are compared with GPT-4o on SenseNova-SI-8M."""
+
+
+def test_extract_terms_finds_models_acronyms_and_authors():
+    terms = extract_terms(REPORT)
+
+    assert {"jit", "qwen3-vl", "gpt-4o", "kandinsky 5.0", "sensenova-si-8m"} <= terms
+    assert {"tianhong li", "kaiming he"} <= terms
+
+
+def test_matcher_prefers_longest_term_and_respects_word_edges():
+    matcher = GuardedTermMatcher(["garbage collector", "python's garbage collector", "jvm"])
+
+    assert matcher.find("How does Python's garbage collector work?") == ["python's garbage collector"]
+    assert matcher.find("Tell me about jvms and jvm tuning") == ["jvm"]
+
+
+def test_missing_guarded_terms_is_a_lookup_against_episode_text():
+    index = build_term_index("ep", 1, [REPORT], ["Back to Basics"],
+                             guarded_terms=["kandinsky 5.0", "sdxl"])
+
+    assert index.missing_guarded_terms("Compare Kandinsky 5.0 and SDXL") == ["sdxl"]
+    assert "back to basics" in index
+
+
+def test_get_term_index_built_from_snapshot_once():
+    store = MagicMock()
+    store.get.return_value = {
+        "ids": ["c0"],
+        "documents": [REPORT],
+        "metadatas": [{"episode_id": "ep", "paper_title": "Back to Basics"}],
+    }
+    episode_index.clear_episode_indexes()
+
+    first = episode_index.get_term_index(store, "ep-terms")
+    second = episode_index.get_term_index(store, "ep-terms")
+
+    assert first is second
+    assert "kaiming he" in first
+    assert first.titles == {"Back to Basics"}
+    episode_index.clear_episode_indexes()
+
+
+def test_get_term_index_handles_chunks_without_paper_title():
+    store = MagicMock()
+    store.get.return_value = {
+        "ids": ["c0", "c1"],
+        "documents": [REPORT, "Plain transcript text about JiT"],
+        "metadatas": [{"episode_id": "ep", "paper_title": "Back to Basics"}, {"episode_id": "ep"}],
+    }
+    episode_index.clear_episode_indexes()
+
+    index = episode_index.get_term_index(store, "ep-plain")
+
+    assert index.titles == {"Back to Basics"}
+    assert "jit" in index
+    assert build_term_index("ep", 1, ["text"], [None]).titles == frozenset()
+    episode_index.clear_episode_indexes()
@@ -0,0 +1,63 @@
+from langchain_core.documents import Document
+
+from time_index import TimeIndex, parse_timestamp
+
+
+def _doc(chunk_id, start=None, end=None):
+    metadata = {}
+    if start is not None:
+        metadata = {"timestamp_start": start, "timestamp_end": end}
+    return Document(id=chunk_id, page_content=chunk_id, metadata=metadata)
+
+
+def _index():
+    return TimeIndex([
+        _doc("intro", 0, 30),
+        _doc("long", 20, 400),  # a paper discussed for most of the episode
+        _doc("jit", 150, 240),
+        _doc("arc", 260, 320),
+        _doc("outro", 340, 400),
+        _doc("untimed"),
+    ])
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("what did they say around 3:20?") == 200
+    assert parse_timestamp("at 1:02:03") == 3723
+    assert parse_timestamp("what happens at minute 5") == 300
+    assert parse_timestamp("what did they cover around the 12:05 mark?") == 725
+    assert parse_timestamp("Kandinsky 5.0 uses a 16:9 ratio") is None
+
+
+def test_durations_and_ranges_are_not_anchors():
+    assert parse_timestamp("Can Kandinsky 5.0 make a 10 minutes video?") is None
+    assert parse_timestamp("what was shown in the 5 min demo?") is None
+    assert parse_timestamp("in the first 2 minutes") is None
+    assert parse_timestamp("the release notes from 3:20") is None
+
+
+def test_overlapping_finds_chunks_around_the_anchor():
+    index = _index()
+
+    assert [d.id for d in index.overlapping(200, slack=0)] == ["long", "jit"]
+    assert [d.id for d in index.overlapping(250, slack=15)] == ["long", "jit", "arc"]
+    assert index.overlapping(1000, slack=30) == []
+    assert len(index) == 5
+
+
+def test_overlapping_matches_a_linear_scan():
+    index = _index()
+    for at in range(0, 450, 7):
+        expected = {d.id for d in index.docs if d.metadata["timestamp_start"] <= at + 10
+                    and d.metadata["timestamp_end"] >= at - 10}
+        assert {d.id for d in index.overlapping(at, slack=10)} == expected
+
+
+def test_window_covers_the_overlapping_chunks():
+    index = _index()
+
+    assert index.window(200, slack=0) == {
+        "start_seconds": 20, "end_seconds": 400, "start_human": "0:20", "end_human": "6:40",
+    }
+    assert index.window(10, slack=0)["end_seconds"] == 30
+    assert index.window(1000, slack=0) is None
@@ -0,0 +1,112 @@
+"""
+Timestamp interval index for time-anchored questions.
+
+Chunks of papers discussed in the audio carry `timestamp_start` and
+`timestamp_end` (seconds into the episode). A question like "what did they
+say around 3:20" is answered from the chunks whose interval overlaps the
+anchor, without a vector search.
+
+The intervals are sorted by start, with a running maximum of the ends:
+
+- chunks starting after the window's end are cut off with bisect on `starts`
+- chunks ending before the window's start are cut off with bisect on
+  `max_end` (non-decreasing, so bisectable); the first position it returns is
+  itself an overlapping chunk
+- the time hint of an anchored window (earliest start, latest end among the
+  overlapping chunks) is read from those two positions in O(log n)
+"""
+
+import os
+import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import List, Optional, Sequence
+
+# "around 3:20" matches chunks within this many seconds of the anchor
+TIME_ANCHOR_SLACK_SECONDS = int(os.getenv("TIME_ANCHOR_SLACK_SECONDS", "30"))
+
+# Only explicit anchors count: "at 3:20", "around 1:03:20" (h:mm:ss), "at
+# minute 3". Bare durations ("a 10 minutes video", "the 5 min demo") and ranges
+# ("in the first 2 minutes") are not points in the audio.
+_ANCHOR = r"\b(?:at|around|near)\s+(?:the\s+)?"
+_CLOCK = re.compile(_ANCHOR + r"(?:(\d{1,2}):)?(\d{1,3}):([0-5]\d)(?![\d:])", re.I)
+_MINUTE = re.compile(_ANCHOR + r"(?:minute|min)\s+(\d{1,3})\b", re.I)
+
+
+def parse_timestamp(text: str) -> Optional[int]:
+    """The first time anchor in `text`, in seconds, or None."""
+    text = text or ""
+    match = _CLOCK.search(text)
+    if match:
+        hours, minutes, seconds = match.groups()
+        return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    match = _MINUTE.search(text)
+    if match:
+        return int(match.group(1)) * 60
+    return None
+
+
+def format_timestamp(seconds: int) -> str:
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def time_hint(start: float, end: float) -> dict:
+    """The episode_time_hint metadata for a [start, end] window."""
+    start_s, end_s = int(start), int(end)
+    return {
+        "start_seconds": start_s,
+        "end_seconds": end_s,
+        "start_human": format_timestamp(start_s),
+        "end_human": format_timestamp(end_s),
+    }
+
+
+def chunk_interval(doc) -> Optional[tuple]:
+    """(start, end) seconds of a chunk, or None if it has no usable timestamps."""
+    md = doc.metadata or {}
+    try:
+        start, end = float(md["timestamp_start"]), float(md["timestamp_end"])
+    except (KeyError, ValueError, TypeError):
+        return None
+    return (start, end) if end >= start else None
+
+
+class TimeIndex:
+    """Intervals of an episode's timestamped chunks, sorted by start."""
+
+    def __init__(self, docs: Sequence):
+        intervals = [(interval, doc) for doc in docs if (interval := chunk_interval(doc)) is not None]
+        intervals.sort(key=lambda item: item[0])
+        self.docs = [doc for _, doc in intervals]
+        self.starts = [start for (start, _), _ in intervals]
+        self.ends = [end for (_, end), _ in intervals]
+        self.max_end = list(accumulate(self.ends, max))
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _bounds(self, at: float, slack: float) -> tuple[int, int]:
+        """Positions [lo, hi) that can overlap [at - slack, at + slack]."""
+        hi = bisect_right(self.starts, at + slack)
+        lo = bisect_left(self.max_end, at - slack, 0, hi)
+        return lo, hi
+
+    def overlapping(self, at: float, slack: float = TIME_ANCHOR_SLACK_SECONDS) -> List:
+        """Chunks overlapping the window around `at`, closest to the anchor first."""
+        lo, hi = self._bounds(at, slack)
+        hits = [i for i in range(lo, hi) if self.ends[i] >= at - slack]
+
+        def distance(i):
+            if self.starts[i] <= at <= self.ends[i]:
+                return 0.0
+            return min(abs(self.starts[i] - at), abs(self.ends[i] - at))
+
+        hits.sort(key=lambda i: (distance(i), self.starts[i]))
+        return [self.docs[i] for i in hits]
+
+    def window(self, at: float, slack: float = TIME_ANCHOR_SLACK_SECONDS) -> Optional[dict]:
+        """Time hint covering every chunk that overlaps the window around `at`."""
+        lo, hi = self._bounds(at, slack)
+        if lo >= hi:
+            return None
+        return time_hint(self.starts[lo], self.max_end[hi - 1])